@@ -0,0 +1,41 @@
+"""Project task counters
+
+Revision ID: 3f1c2a9d7b45
+Revises: 78eb301a6786
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d7b45'
+down_revision: Union[str, Sequence[str], None] = '78eb301a6786'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = ('task_count', 'todo_count', 'doing_count', 'done_count')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name in COUNTERS:
+        op.add_column('projects', sa.Column(name, sa.Integer(), nullable=False, server_default='0'))
+
+    # پر کردن شمارنده‌ها از ردیف‌های موجود؛ بعد از این eventهای TaskModel آن‌ها را نگه می‌دارند
+    op.execute("""
+        UPDATE projects SET
+            task_count = (SELECT COUNT(*) FROM tasks WHERE tasks.project_id = projects.id),
+            todo_count = (SELECT COUNT(*) FROM tasks WHERE tasks.project_id = projects.id AND tasks.status = 'TODO'),
+            doing_count = (SELECT COUNT(*) FROM tasks WHERE tasks.project_id = projects.id AND tasks.status = 'DOING'),
+            done_count = (SELECT COUNT(*) FROM tasks WHERE tasks.project_id = projects.id AND tasks.status = 'DONE')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in reversed(COUNTERS):
+        op.drop_column('projects', name)
@@ -0,0 +1,40 @@
+"""Keyset pagination indexes
+
+Revision ID: 9a4e6c1d2b80
+Revises: 3f1c2a9d7b45
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4e6c1d2b80'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a9d7b45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # cursor از created_at ردیف آخر ساخته می‌شود و مقایسه tuple ردیف‌های NULL را
+    # رد می‌کند؛ پس ردیف‌های قدیمی بدون created_at پر و ستون NOT NULL می‌شود
+    op.execute("UPDATE projects SET created_at = now() WHERE created_at IS NULL")
+    op.execute("UPDATE tasks SET created_at = now() AT TIME ZONE 'utc' WHERE created_at IS NULL")
+    op.alter_column('projects', 'created_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+    op.alter_column('tasks', 'created_at', existing_type=sa.DateTime(), nullable=False)
+
+    # صفحه بعد با یک index range scan از کلید (created_at, id) آخرین ردیف شروع می‌شود
+    op.create_index('ix_projects_created_at_id', 'projects', ['created_at', 'id'])
+    op.create_index('ix_tasks_project_id_created_at_id', 'tasks', ['project_id', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_project_id_created_at_id', table_name='tasks')
+    op.drop_index('ix_projects_created_at_id', table_name='projects')
+    op.alter_column('tasks', 'created_at', existing_type=sa.DateTime(), nullable=True)
+    op.alter_column('projects', 'created_at', existing_type=sa.DateTime(timezone=True), nullable=True)
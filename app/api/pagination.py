@@ -0,0 +1,49 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """توکن مبهم برای ادامه صفحه‌بندی بعد از ردیف (created_at, id)"""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """کلید (created_at, id) توکن؛ توکن نامعتبر ValueError می‌دهد"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("cursor نامعتبر است") from e
+
+def page_after(cursor: Optional[str], skip: int) -> Optional[Tuple[datetime, int]]:
+    """کلید (created_at, id) برای صفحه‌بندی cursor، یا None در حالت offset"""
+    if cursor is None:
+        return None
+    if skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="skip و cursor را نمی‌توان با هم ارسال کرد"
+        )
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+def next_cursor(rows: Sequence, limit: int) -> Optional[str]:
+    """
+    توکن صفحه بعد، یا None اگر این صفحه آخر باشد
+
+    صفحه کامل همیشه توکن دارد؛ اگر دقیقاً limit ردیف باقی مانده باشد،
+    صفحه بعدی خالی برمی‌گردد.
+    """
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.created_at, last.id)
@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
-from app.services.task_service import TaskService
-from app.services.project_service import ProjectService
+from app.db.async_session import get_async_db
+from app.api.pagination import next_cursor, page_after
+from app.services.async_task_service import AsyncTaskService
+from app.services.async_project_service import AsyncProjectService
 from app.api.schemas.requests.task_requests import TaskCreateRequest, TaskUpdateRequest
 from app.api.schemas.responses.task_responses import TaskResponse, TaskListResponse
 
@@ -15,32 +16,37 @@ async def list_project_tasks(
     project_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    دریافت لیست تمام تسک‌های یک پروژه
+    دریافت لیست تمام تسک‌های یک پروژه به ترتیب زمان ایجاد
     
     - **project_id**: شناسه پروژه
-    - **skip**: تعداد رکوردهایی که باید رد شوند
+    - **skip**: تعداد رکوردهایی که باید رد شوند (صفحه‌بندی offset)
     - **limit**: حداکثر تعداد رکوردهای بازگشتی
+    - **cursor**: مقدار next_cursor پاسخ قبلی (صفحه‌بندی cursor با زمان ثابت برای هر عمقی)
     """
     try:
+        after = page_after(cursor, skip)
+
         # بررسی وجود پروژه
-        project_service = ProjectService(db)
-        project = project_service.get_project_by_id(project_id)
+        project_service = AsyncProjectService(db)
+        project = await project_service.get_project_by_id(project_id)
         if not project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="پروژه مورد نظر یافت نشد"
             )
         
-        task_service = TaskService(db)
-        tasks = task_service.get_tasks_by_project(project_id, skip=skip, limit=limit)
-        total = task_service.get_tasks_count_by_project(project_id)
+        task_service = AsyncTaskService(db)
+        tasks = await task_service.get_tasks_by_project(project_id, skip=skip, limit=limit, after=after)
+        total = await task_service.get_tasks_count_by_project(project_id)
         
         return TaskListResponse(
             data=tasks,
-            total=total
+            total=total,
+            next_cursor=next_cursor(tasks, limit)
         )
     except HTTPException:
         raise
@@ -54,7 +60,7 @@ async def list_project_tasks(
 async def create_task(
     project_id: int,
     task_data: TaskCreateRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     ایجاد تسک جدید در یک پروژه
@@ -67,16 +73,16 @@ async def create_task(
     """
     try:
         # بررسی وجود پروژه
-        project_service = ProjectService(db)
-        project = project_service.get_project_by_id(project_id)
+        project_service = AsyncProjectService(db)
+        project = await project_service.get_project_by_id(project_id)
         if not project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="پروژه مورد نظر یافت نشد"
             )
         
-        task_service = TaskService(db)
-        task = task_service.create_task(
+        task_service = AsyncTaskService(db)
+        task = await task_service.create_task(
             project_id=project_id,
             title=task_data.title,
             description=task_data.description,
@@ -101,7 +107,7 @@ async def create_task(
 @router.get("/tasks/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     دریافت اطلاعات یک تسک بر اساس شناسه
@@ -109,8 +115,8 @@ async def get_task(
     - **task_id**: شناسه تسک
     """
     try:
-        task_service = TaskService(db)
-        task = task_service.get_task_by_id(task_id)
+        task_service = AsyncTaskService(db)
+        task = await task_service.get_task_by_id(task_id)
         
         if not task:
             raise HTTPException(
@@ -131,7 +137,7 @@ async def get_task(
 async def update_task(
     task_id: int,
     task_data: TaskUpdateRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     ویرایش کامل اطلاعات تسک
@@ -143,17 +149,17 @@ async def update_task(
     - **status**: وضعیت جدید تسک
     """
     try:
-        task_service = TaskService(db)
+        task_service = AsyncTaskService(db)
         
         # بررسی وجود تسک
-        existing_task = task_service.get_task_by_id(task_id)
+        existing_task = await task_service.get_task_by_id(task_id)
         if not existing_task:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="تسک مورد نظر یافت نشد"
             )
         
-        updated_task = task_service.update_task(
+        updated_task = await task_service.update_task(
             task_id=task_id,
             title=task_data.title,
             description=task_data.description,
@@ -179,7 +185,7 @@ async def update_task(
 async def partial_update_task(
     task_id: int,
     task_data: TaskUpdateRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     ویرایش جزئی اطلاعات تسک
@@ -191,10 +197,10 @@ async def partial_update_task(
     - **status**: وضعیت جدید تسک (اختیاری)
     """
     try:
-        task_service = TaskService(db)
+        task_service = AsyncTaskService(db)
         
         # بررسی وجود تسک
-        existing_task = task_service.get_task_by_id(task_id)
+        existing_task = await task_service.get_task_by_id(task_id)
         if not existing_task:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -218,7 +224,7 @@ async def partial_update_task(
                 detail="هیچ داده‌ای برای ویرایش ارسال نشده است"
             )
         
-        updated_task = task_service.update_task(
+        updated_task = await task_service.update_task(
             task_id=task_id,
             **update_data
         )
@@ -241,7 +247,7 @@ async def partial_update_task(
 async def update_task_status(
     task_id: int,
     status_data: TaskUpdateRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     تغییر وضعیت تسک
@@ -250,10 +256,10 @@ async def update_task_status(
     - **status**: وضعیت جدید تسک
     """
     try:
-        task_service = TaskService(db)
+        task_service = AsyncTaskService(db)
         
         # بررسی وجود تسک
-        existing_task = task_service.get_task_by_id(task_id)
+        existing_task = await task_service.get_task_by_id(task_id)
         if not existing_task:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -266,7 +272,7 @@ async def update_task_status(
                 detail="وضعیت جدید ارسال نشده است"
             )
         
-        updated_task = task_service.update_task_status(
+        updated_task = await task_service.update_task_status(
             task_id=task_id,
             status=status_data.status
         )
@@ -288,7 +294,7 @@ async def update_task_status(
 @router.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     حذف تسک
@@ -296,17 +302,17 @@ async def delete_task(
     - **task_id**: شناسه تسک
     """
     try:
-        task_service = TaskService(db)
+        task_service = AsyncTaskService(db)
         
         # بررسی وجود تسک
-        existing_task = task_service.get_task_by_id(task_id)
+        existing_task = await task_service.get_task_by_id(task_id)
         if not existing_task:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="تسک مورد نظر یافت نشد"
             )
         
-        task_service.delete_task(task_id)
+        await task_service.delete_task(task_id)
         
         return None
     except HTTPException:
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
-from app.services.project_service import ProjectService
+from app.db.async_session import get_async_db
+from app.api.pagination import next_cursor, page_after
+from app.services.async_project_service import AsyncProjectService
 from app.api.schemas.requests.project_requests import ProjectCreateRequest, ProjectUpdateRequest
 from app.api.schemas.responses.project_responses import ProjectResponse, ProjectDetailResponse, ProjectListResponse
 
@@ -13,23 +14,29 @@ router = APIRouter(prefix="/api/v1/projects", tags=["Projects"])
 async def list_projects(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    دریافت لیست تمام پروژه‌ها
+    دریافت لیست تمام پروژه‌ها به ترتیب زمان ایجاد
     
-    - **skip**: تعداد رکوردهایی که باید رد شوند (برای صفحه‌بندی)
+    - **skip**: تعداد رکوردهایی که باید رد شوند (صفحه‌بندی offset)
     - **limit**: حداکثر تعداد رکوردهای بازگشتی
+    - **cursor**: مقدار next_cursor پاسخ قبلی (صفحه‌بندی cursor با زمان ثابت برای هر عمقی)
     """
     try:
-        project_service = ProjectService(db)
-        projects = project_service.get_all_projects(skip=skip, limit=limit)
-        total = project_service.get_projects_count()
+        after = page_after(cursor, skip)
+        project_service = AsyncProjectService(db)
+        projects = await project_service.get_all_projects(skip=skip, limit=limit, after=after)
+        total = await project_service.get_projects_count()
         
         return ProjectListResponse(
             data=projects,
-            total=total
+            total=total,
+            next_cursor=next_cursor(projects, limit)
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -39,7 +46,7 @@ async def list_projects(
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project(
     project_data: ProjectCreateRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     ایجاد پروژه جدید
@@ -48,8 +55,8 @@ async def create_project(
     - **description**: توضیحات پروژه (حداکثر 150 کاراکتر)
     """
     try:
-        project_service = ProjectService(db)
-        project = project_service.create_project(
+        project_service = AsyncProjectService(db)
+        project = await project_service.create_project(
             name=project_data.name,
             description=project_data.description
         )
@@ -68,7 +75,7 @@ async def create_project(
 @router.get("/{project_id}", response_model=ProjectDetailResponse)
 async def get_project(
     project_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     دریافت اطلاعات یک پروژه بر اساس شناسه
@@ -76,8 +83,8 @@ async def get_project(
     - **project_id**: شناسه پروژه
     """
     try:
-        project_service = ProjectService(db)
-        project = project_service.get_project_by_id(project_id)
+        project_service = AsyncProjectService(db)
+        project = await project_service.get_project_by_id(project_id, with_tasks=True)
         
         if not project:
             raise HTTPException(
@@ -98,7 +105,7 @@ async def get_project(
 async def update_project(
     project_id: int,
     project_data: ProjectUpdateRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     ویرایش کامل اطلاعات پروژه
@@ -108,17 +115,17 @@ async def update_project(
     - **description**: توضیحات جدید پروژه
     """
     try:
-        project_service = ProjectService(db)
+        project_service = AsyncProjectService(db)
         
         # بررسی وجود پروژه
-        existing_project = project_service.get_project_by_id(project_id)
+        existing_project = await project_service.get_project_by_id(project_id)
         if not existing_project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="پروژه مورد نظر یافت نشد"
             )
         
-        updated_project = project_service.update_project(
+        updated_project = await project_service.update_project(
             project_id=project_id,
             name=project_data.name,
             description=project_data.description
@@ -142,7 +149,7 @@ async def update_project(
 async def partial_update_project(
     project_id: int,
     project_data: ProjectUpdateRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     ویرایش جزئی اطلاعات پروژه
@@ -152,10 +159,10 @@ async def partial_update_project(
     - **description**: توضیحات جدید پروژه (اختیاری)
     """
     try:
-        project_service = ProjectService(db)
+        project_service = AsyncProjectService(db)
         
         # بررسی وجود پروژه
-        existing_project = project_service.get_project_by_id(project_id)
+        existing_project = await project_service.get_project_by_id(project_id)
         if not existing_project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -175,7 +182,7 @@ async def partial_update_project(
                 detail="هیچ داده‌ای برای ویرایش ارسال نشده است"
             )
         
-        updated_project = project_service.update_project(
+        updated_project = await project_service.update_project(
             project_id=project_id,
             **update_data
         )
@@ -197,7 +204,7 @@ async def partial_update_project(
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     حذف پروژه
@@ -205,17 +212,17 @@ async def delete_project(
     - **project_id**: شناسه پروژه
     """
     try:
-        project_service = ProjectService(db)
+        project_service = AsyncProjectService(db)
         
         # بررسی وجود پروژه
-        existing_project = project_service.get_project_by_id(project_id)
+        existing_project = await project_service.get_project_by_id(project_id)
         if not existing_project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="پروژه مورد نظر یافت نشد"
             )
         
-        project_service.delete_project(project_id)
+        await project_service.delete_project(project_id)
         
         return None
     except HTTPException:
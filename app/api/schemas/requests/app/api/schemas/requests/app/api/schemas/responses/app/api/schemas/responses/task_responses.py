@@ -21,6 +21,7 @@ class TaskListResponse(BaseModel):
     status: str = "success"
     data: list[TaskResponse]
     total: int
+    next_cursor: Optional[str] = None
 
     class Config:
         json_schema_extra = {
@@ -37,6 +38,7 @@ class TaskListResponse(BaseModel):
                         "project_id": 1
                     }
                 ],
-                "total": 1
+                "total": 1,
+                "next_cursor": None
             }
         }
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from .task_responses import TaskResponse
 
 class ProjectResponse(BaseModel):
@@ -23,6 +23,7 @@ class ProjectListResponse(BaseModel):
     status: str = "success"
     data: List[ProjectResponse]
     total: int
+    next_cursor: Optional[str] = None
 
     class Config:
         json_schema_extra = {
@@ -37,6 +38,7 @@ class ProjectListResponse(BaseModel):
                         "tasks_count": 5
                     }
                 ],
-                "total": 1
+                "total": 1,
+                "next_cursor": None
             }
         }
\ No newline at end of file
@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from src.todo_list.infrastructure.database.models.project import Project as ProjectModel
+
+class AsyncProjectRepository:
+    """دسترسی به جدول projects با AsyncSession"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, project: ProjectModel) -> ProjectModel:
+        self.session.add(project)
+        await self.session.flush()
+        return project
+
+    async def get_by_id(self, project_id: int, with_tasks: bool = False) -> Optional[ProjectModel]:
+        query = select(ProjectModel).where(ProjectModel.id == project_id)
+        if with_tasks:
+            # رابطه tasks در AsyncSession نباید lazy بارگذاری شود
+            query = query.options(selectinload(ProjectModel.tasks))
+        return (await self.session.execute(query)).scalar_one_or_none()
+
+    async def get_by_name(self, name: str) -> Optional[ProjectModel]:
+        query = select(ProjectModel).where(ProjectModel.name == name)
+        return (await self.session.execute(query)).scalar_one_or_none()
+
+    async def get_all(self, skip: int = 0, limit: int = 100,
+                      after: Optional[Tuple[datetime, int]] = None) -> List[ProjectModel]:
+        """
+        یک صفحه از پروژه‌ها به ترتیب (created_at, id)
+
+        با after (کلید آخرین ردیف صفحه قبل) صفحه‌بندی keyset است و Postgres از
+        ایندکس ix_projects_created_at_id مستقیماً به ابتدای صفحه می‌رود؛ در غیر
+        این صورت skip ردیف اول رد می‌شوند.
+        """
+        query = select(ProjectModel).order_by(ProjectModel.created_at, ProjectModel.id).limit(limit)
+        if after is not None:
+            query = query.where(tuple_(ProjectModel.created_at, ProjectModel.id) > tuple_(*after))
+        else:
+            query = query.offset(skip)
+        return list((await self.session.execute(query)).scalars())
+
+    async def count(self) -> int:
+        return (await self.session.execute(select(func.count()).select_from(ProjectModel))).scalar_one()
+
+    async def update(self, project: ProjectModel) -> ProjectModel:
+        await self.session.flush()
+        return project
+
+    async def delete(self, project: ProjectModel) -> bool:
+        await self.session.delete(project)
+        await self.session.flush()
+        return True
@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.todo_list.infrastructure.database.models.project import Project as ProjectModel
+from src.todo_list.infrastructure.database.models.task import TaskModel
+
+class AsyncTaskRepository:
+    """دسترسی به جدول tasks با AsyncSession"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, task: TaskModel) -> TaskModel:
+        self.session.add(task)
+        await self.session.flush()
+        return task
+
+    async def get_by_id(self, task_id: int) -> Optional[TaskModel]:
+        return await self.session.get(TaskModel, task_id)
+
+    async def get_by_project_id(self, project_id: int, skip: int = 0, limit: int = 100,
+                                after: Optional[Tuple[datetime, int]] = None) -> List[TaskModel]:
+        """یک صفحه از تسک‌های پروژه به ترتیب (created_at, id)؛ after مثل AsyncProjectRepository.get_all"""
+        query = (
+            select(TaskModel)
+            .where(TaskModel.project_id == project_id)
+            .order_by(TaskModel.created_at, TaskModel.id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(tuple_(TaskModel.created_at, TaskModel.id) > tuple_(*after))
+        else:
+            query = query.offset(skip)
+        return list((await self.session.execute(query)).scalars())
+
+    async def count_by_project_id(self, project_id: int) -> int:
+        # شمارنده زنده projects.task_count؛ ردیف‌های tasks شمرده نمی‌شوند
+        query = select(ProjectModel.task_count).where(ProjectModel.id == project_id)
+        return (await self.session.execute(query)).scalar_one_or_none() or 0
+
+    async def update(self, task: TaskModel) -> TaskModel:
+        await self.session.flush()
+        return task
+
+    async def delete(self, task: TaskModel) -> bool:
+        await self.session.delete(task)
+        await self.session.flush()
+        return True
@@ -0,0 +1,66 @@
+import os
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.async_project_repository import AsyncProjectRepository
+from src.todo_list.infrastructure.database.models.project import Project as ProjectModel
+
+MAX_NUMBER_OF_PROJECTS = int(os.getenv("MAX_NUMBER_OF_PROJECTS", "10"))
+
+class AsyncProjectService:
+    """
+    نسخه غیرهمزمان ProjectService برای کنترلرهای FastAPI
+
+    همان متدها و خطاها (ValueError برای داده نامعتبر)، ولی هر رفت‌وبرگشت
+    دیتابیس await می‌شود. هر عملیات نوشتن تراکنش خودش را commit می‌کند.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.project_repo = AsyncProjectRepository(db)
+
+    async def get_all_projects(self, skip: int = 0, limit: int = 100,
+                               after: Optional[Tuple[datetime, int]] = None) -> List[ProjectModel]:
+        return await self.project_repo.get_all(skip=skip, limit=limit, after=after)
+
+    async def get_projects_count(self) -> int:
+        return await self.project_repo.count()
+
+    async def get_project_by_id(self, project_id: int, with_tasks: bool = False) -> Optional[ProjectModel]:
+        return await self.project_repo.get_by_id(project_id, with_tasks=with_tasks)
+
+    async def create_project(self, name: str, description: str) -> ProjectModel:
+        if await self.project_repo.get_by_name(name):
+            raise ValueError(f"پروژه‌ای با نام '{name}' از قبل وجود دارد")
+        if await self.project_repo.count() >= MAX_NUMBER_OF_PROJECTS:
+            raise ValueError(f"تعداد پروژه‌ها نمی‌تواند بیشتر از {MAX_NUMBER_OF_PROJECTS} باشد")
+
+        project = await self.project_repo.create(ProjectModel(name=name, description=description))
+        await self.db.commit()
+        return project
+
+    async def update_project(self, project_id: int, name: str = None, description: str = None) -> ProjectModel:
+        project = await self.project_repo.get_by_id(project_id)
+        if project is None:
+            raise ValueError("پروژه مورد نظر یافت نشد")
+        if name is not None and name != project.name:
+            if await self.project_repo.get_by_name(name):
+                raise ValueError(f"پروژه‌ای با نام '{name}' از قبل وجود دارد")
+            project.name = name
+        if description is not None:
+            project.description = description
+
+        await self.project_repo.update(project)
+        await self.db.commit()
+        return project
+
+    async def delete_project(self, project_id: int) -> bool:
+        # تسک‌ها با cascade رابطه و ON DELETE CASCADE کلید خارجی حذف می‌شوند
+        project = await self.project_repo.get_by_id(project_id, with_tasks=True)
+        if project is None:
+            return False
+        await self.project_repo.delete(project)
+        await self.db.commit()
+        return True
@@ -0,0 +1,93 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.async_task_repository import AsyncTaskRepository
+from src.todo_list.infrastructure.database.models.task import TaskLimitExceededError, TaskModel, TaskStatus
+
+def _status(value) -> TaskStatus:
+    # وضعیت درخواست (enum رشته‌ای pydantic) یا رشته خام به enum مدل تبدیل می‌شود
+    try:
+        return TaskStatus(getattr(value, "value", value))
+    except ValueError:
+        raise ValueError(f"وضعیت باید یکی از موارد باشد: {', '.join(s.value for s in TaskStatus)}")
+
+def _validate_deadline(deadline: Optional[datetime]):
+    if deadline is not None and deadline.replace(tzinfo=None) < datetime.now():
+        raise ValueError("ددلاین نمی‌تواند در گذشته باشد")
+
+class AsyncTaskService:
+    """
+    نسخه غیرهمزمان TaskService برای کنترلرهای FastAPI
+
+    سقف تسک‌های هر پروژه را eventهای TaskModel در همان تراکنش بررسی می‌کنند
+    و TaskLimitExceededError به ValueError (پاسخ 400) تبدیل می‌شود.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.task_repo = AsyncTaskRepository(db)
+
+    async def get_tasks_by_project(self, project_id: int, skip: int = 0, limit: int = 100,
+                                   after: Optional[Tuple[datetime, int]] = None) -> List[TaskModel]:
+        return await self.task_repo.get_by_project_id(project_id, skip=skip, limit=limit, after=after)
+
+    async def get_tasks_count_by_project(self, project_id: int) -> int:
+        return await self.task_repo.count_by_project_id(project_id)
+
+    async def get_task_by_id(self, task_id: int) -> Optional[TaskModel]:
+        return await self.task_repo.get_by_id(task_id)
+
+    async def create_task(self, project_id: int, title: str, description: str,
+                          deadline: datetime = None, status=TaskStatus.TODO) -> TaskModel:
+        _validate_deadline(deadline)
+        task = TaskModel(project_id=project_id, title=title, description=description,
+                         deadline=deadline, status=_status(status))
+        if task.status == TaskStatus.DONE:
+            task.closed_at = datetime.utcnow()
+        try:
+            await self.task_repo.create(task)
+        except TaskLimitExceededError as e:
+            await self.db.rollback()
+            raise ValueError(str(e))
+        await self.db.commit()
+        return task
+
+    async def update_task(self, task_id: int, title: str = None, description: str = None,
+                          deadline: datetime = None, status=None) -> TaskModel:
+        task = await self.task_repo.get_by_id(task_id)
+        if task is None:
+            raise ValueError("تسک مورد نظر یافت نشد")
+        if title is not None:
+            task.title = title
+        if description is not None:
+            task.description = description
+        if deadline is not None:
+            _validate_deadline(deadline)
+            task.deadline = deadline
+        if status is not None:
+            self._set_status(task, _status(status))
+
+        await self.task_repo.update(task)
+        await self.db.commit()
+        return task
+
+    async def update_task_status(self, task_id: int, status) -> TaskModel:
+        return await self.update_task(task_id, status=status)
+
+    async def delete_task(self, task_id: int) -> bool:
+        task = await self.task_repo.get_by_id(task_id)
+        if task is None:
+            return False
+        await self.task_repo.delete(task)
+        await self.db.commit()
+        return True
+
+    @staticmethod
+    def _set_status(task: TaskModel, status: TaskStatus):
+        if status == TaskStatus.DONE and task.status != TaskStatus.DONE:
+            task.closed_at = datetime.utcnow()
+        elif status != TaskStatus.DONE:
+            task.closed_at = None
+        task.status = status
@@ -0,0 +1,50 @@
+"""
+بنچمارک حالت batch خط فرمان
+
+یک اسکریپت دستور (JSON یا متن ساده) شامل ساخت پروژه، ساخت تسک، تغییر
+وضعیت و خواندن تسک تولید و با run_batch روی MemoryStorage اجرا می‌شود.
+خروجی در حافظه نوشته می‌شود تا فقط هزینه تجزیه، اجرا و سریال‌سازی اندازه گرفته شود.
+اجرا: python benchmarks/bench_batch.py [--operations N] [--format json|plain]
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'todolist'))
+
+from batch import run_batch
+from config.settings import settings
+from storage.memory_storage import MemoryStorage
+
+def script(operations: int, fmt: str):
+    yield 'create_project Bench "Batch benchmark"'
+    for i in range(1, operations // 3 + 1):
+        if fmt == 'json':
+            yield json.dumps({"op": "create_task", "project_id": 1, "title": f"task {i}", "description": "description"})
+            yield json.dumps({"op": "change_status", "task_id": i, "status": "doing"})
+            yield json.dumps({"op": "get_task", "task_id": i})
+        else:
+            yield f'create_task 1 "task {i}" description'
+            yield f'change_status {i} doing'
+            yield f'get_task {i}'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=90_000)
+    parser.add_argument("--format", choices=["json", "plain"], default="json")
+    args = parser.parse_args()
+
+    settings.MAX_NUMBER_OF_TASKS_PER_PROJECT = args.operations
+    lines = list(script(args.operations, args.format))
+    output = io.BytesIO()
+    start = time.perf_counter()
+    failures = run_batch(MemoryStorage(), lines, output)
+    elapsed = time.perf_counter() - start
+    assert failures == 0
+    print(f"{len(lines):,} {args.format} commands in {elapsed:.2f}s: {len(lines) / elapsed:,.0f} ops/s")
+
+if __name__ == "__main__":
+    main()
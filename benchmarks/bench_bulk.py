@@ -0,0 +1,69 @@
+"""
+بنچمارک عملیات دسته‌ای در برابر عملیات تکی MemoryStorage
+
+برای create، تغییر وضعیت و delete توان عملیاتی (تسک در ثانیه) را مقایسه می‌کند.
+اجرا: python benchmarks/bench_bulk.py [--tasks N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'todolist'))
+
+from config.settings import settings
+from core.project import Project
+from core.task import Task
+from storage.memory_storage import MemoryStorage
+
+def run_single(storage, project_id, tasks):
+    timings = {}
+    start = time.perf_counter()
+    created = [storage.create_task(task, project_id) for task in tasks]
+    timings['create'] = time.perf_counter() - start
+    start = time.perf_counter()
+    for task in created:
+        storage.change_task_status(task.id, "done")
+    timings['status'] = time.perf_counter() - start
+    start = time.perf_counter()
+    for task in created:
+        storage.delete_task(task.id)
+    timings['delete'] = time.perf_counter() - start
+    return timings
+
+def run_bulk(storage, project_id, tasks):
+    timings = {}
+    start = time.perf_counter()
+    created = storage.create_tasks(project_id, tasks)
+    timings['create'] = time.perf_counter() - start
+    task_ids = [task.id for task in created]
+    start = time.perf_counter()
+    storage.change_status_many(task_ids, "done")
+    timings['status'] = time.perf_counter() - start
+    start = time.perf_counter()
+    storage.delete_tasks(task_ids)
+    timings['delete'] = time.perf_counter() - start
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--thread-safe", action="store_true")
+    args = parser.parse_args()
+
+    settings.MAX_NUMBER_OF_TASKS_PER_PROJECT = args.tasks
+
+    results = {}
+    for name, run in (("single", run_single), ("bulk", run_bulk)):
+        storage = MemoryStorage(thread_safe=args.thread_safe)
+        project = storage.create_project(Project("project", "description"))
+        tasks = [Task(f"task {i}", "description") for i in range(args.tasks)]
+        results[name] = run(storage, project.id, tasks)
+
+    for operation in ('create', 'status', 'delete'):
+        single, bulk = results['single'][operation], results['bulk'][operation]
+        print(f"{operation}: single {args.tasks / single:,.0f}/s, bulk {args.tasks / bulk:,.0f}/s "
+              f"({single / bulk:.1f}x)")
+
+if __name__ == "__main__":
+    main()
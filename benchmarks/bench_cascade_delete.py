@@ -0,0 +1,54 @@
+"""
+بنچمارک حذف آبشاری پروژه در MemoryStorage
+
+یک پروژه با ۱۰۰ هزار تسک از مخزنی با ۱ میلیون تسک حذف می‌شود.
+اجرا: python benchmarks/bench_cascade_delete.py [--total N] [--victim K]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'todolist'))
+
+from config.settings import settings
+from core.project import Project
+from core.task import Task
+from storage.memory_storage import MemoryStorage
+
+def build_storage(total_tasks: int, victim_tasks: int, projects: int) -> MemoryStorage:
+    settings.MAX_NUMBER_OF_PROJECTS = projects
+    settings.MAX_NUMBER_OF_TASKS_PER_PROJECT = max(total_tasks, victim_tasks)
+
+    storage = MemoryStorage()
+    victim = storage.create_project(Project("victim", "project to delete"))
+    for i in range(victim_tasks):
+        storage.create_task(Task(f"task {i}", "description"), victim.id)
+
+    others = [storage.create_project(Project(f"project {i}", "description")) for i in range(projects - 1)]
+    for i in range(total_tasks - victim_tasks):
+        storage.create_task(Task(f"task {i}", "description"), others[i % len(others)].id)
+    return storage
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--total", type=int, default=1_000_000)
+    parser.add_argument("--victim", type=int, default=100_000)
+    parser.add_argument("--projects", type=int, default=10)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    storage = build_storage(args.total, args.victim, args.projects)
+    print(f"build: {args.total} tasks in {time.perf_counter() - start:.2f}s")
+
+    victim = storage.get_project_by_name("victim")
+    start = time.perf_counter()
+    storage.delete_project(victim.id)
+    elapsed = time.perf_counter() - start
+
+    print(f"delete_project: {args.victim} tasks in {elapsed * 1000:.1f}ms "
+          f"({elapsed / args.victim * 1e9:.0f}ns per task)")
+    print(f"remaining tasks: {storage.get_statistics()['total_tasks']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+بنچمارک حافظه و اسکن ColumnarMemoryStorage در برابر MemoryStorage
+
+حافظه مصرفی به ازای هر تسک (tracemalloc) و زمان شمارش/فیلتر بر اساس وضعیت
+را برای هر دو موتور گزارش می‌کند. برای موتور ستونی حافظه ایندکس متنی که
+با اولین search_tasks ساخته می‌شود جداگانه گزارش می‌شود.
+اجرا: python benchmarks/bench_columnar.py [--tasks N]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'todolist'))
+
+from config.settings import settings
+from core.project import Project
+from core.task import Task
+from storage.columnar_storage import ColumnarMemoryStorage
+from storage.memory_storage import MemoryStorage
+
+def measure(storage_class, tasks: int, projects: int):
+    gc.collect()
+    tracemalloc.start()
+    storage = storage_class()
+    created = [storage.create_project(Project(f"project {i}", "description")) for i in range(projects)]
+    for i in range(tasks):
+        task = storage.create_task(Task(f"task {i % 1000}", "description"), created[i % projects].id)
+        if i % 3 == 0:
+            storage.change_task_status(task.id, "done")
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return storage, size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--projects", type=int, default=10)
+    args = parser.parse_args()
+
+    settings.MAX_NUMBER_OF_PROJECTS = args.projects
+    settings.MAX_NUMBER_OF_TASKS_PER_PROJECT = args.tasks
+
+    for storage_class in (MemoryStorage, ColumnarMemoryStorage):
+        storage, size = measure(storage_class, args.tasks, args.projects)
+
+        start = time.perf_counter()
+        if isinstance(storage, ColumnarMemoryStorage):
+            done = storage.count_tasks("done")
+        else:
+            done = sum(1 for task in storage.tasks if task.status.value == "done")
+        count_time = time.perf_counter() - start
+
+        print(f"{storage_class.__name__}: {size / args.tasks:.0f} bytes per task, "
+              f"count done={done} in {count_time * 1000:.1f}ms")
+        if isinstance(storage, ColumnarMemoryStorage):
+            tracemalloc.start()
+            storage.search_tasks("task", limit=10)
+            gc.collect()
+            text_size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            print(f"{storage_class.__name__} text index (built on first search): "
+                  f"+{text_size / args.tasks:.0f} bytes per task")
+        del storage
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+بنچمارک حافظه هر شیء Task و Project
+
+چیدمان فعلی (slot، زمان‌های int و کد وضعیت) با چیدمان قبلی (__dict__ با دو
+شیء datetime و لیست tasks پروژه) مقایسه می‌شود. رشته‌ها بین اشیا مشترک‌اند
+تا فقط سربار خود موجودیت اندازه‌گیری شود. حافظه هر تسک همراه با ایندکس‌های
+ذخیره‌ساز در bench_columnar.py گزارش می‌شود.
+اجرا: python benchmarks/bench_memory.py [--tasks N]
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'todolist'))
+
+from core.project import Project
+from core.task import Task, TaskStatus
+
+class LegacyTask:
+    """چیدمان Task پیش از slotها"""
+
+    def __init__(self, title: str, description: str, project_id: int = None):
+        self.id = None
+        self.title = title
+        self.description = description
+        self.status = TaskStatus.TODO
+        self.deadline = None
+        self.project_id = project_id
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+
+class LegacyProject:
+    """چیدمان Project پیش از slotها"""
+
+    def __init__(self, name: str, description: str):
+        self.id = None
+        self.name = name
+        self.description = description
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+        self.tasks = []
+
+def bytes_per_item(factory, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    items = [None] * count
+    baseline = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        items[i] = factory()
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return used / count
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for name, legacy, current in (
+            ("task", lambda: LegacyTask("task", "description", 1), lambda: Task("task", "description", 1)),
+            ("project", lambda: LegacyProject("project", "description"), lambda: Project("project", "description"))):
+        before = bytes_per_item(legacy, args.tasks)
+        after = bytes_per_item(current, args.tasks)
+        print(f"{name}: before {before:.0f} bytes, after {after:.0f} bytes ({before / after:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+بنچمارک تأخیر صفحه در عمق‌های مختلف: offset در برابر cursor (keyset)
+
+یک پروژه با N تسک در Postgres ساخته و صفحه limit تایی در چند عمق یک بار با
+skip و یک بار با after=(created_at, id) ردیف قبل از آن خوانده می‌شود.
+تسک‌ها مستقیماً با INSERT ... SELECT درج می‌شوند و شمارنده‌های پروژه هم یکجا
+تنظیم می‌شوند.
+
+پیش‌نیاز: docker compose up -d postgres و alembic upgrade head
+اجرا: python benchmarks/bench_pagination.py [--tasks 200000] [--limit 100]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import select, text
+
+from app.db.async_session import dispose_async_engine, get_async_sessionmaker
+from app.repositories.async_task_repository import AsyncTaskRepository
+from src.todo_list.infrastructure.database.models.task import TaskModel
+
+PROJECT_NAME = "bench_pagination"
+
+async def seed(db, tasks: int) -> int:
+    await db.execute(text("DELETE FROM projects WHERE name = :name"), {"name": PROJECT_NAME})
+    project_id = (await db.execute(
+        text("INSERT INTO projects (name, description, task_count, todo_count) "
+             "VALUES (:name, 'pagination benchmark', :n, :n) RETURNING id"),
+        {"name": PROJECT_NAME, "n": tasks},
+    )).scalar_one()
+    await db.execute(text(
+        "INSERT INTO tasks (title, description, status, created_at, project_id) "
+        "SELECT 'task ' || i, 'description', 'TODO', now() - make_interval(secs => :n - i), :project_id "
+        "FROM generate_series(1, :n) AS i"
+    ), {"n": tasks, "project_id": project_id})
+    await db.commit()
+    await db.execute(text("ANALYZE tasks"))
+    return project_id
+
+async def timed(coro_factory, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await coro_factory()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    try:
+        async with get_async_sessionmaker()() as db:
+            project_id = await seed(db, args.tasks)
+            repo = AsyncTaskRepository(db)
+            print(f"{'depth':>10} {'offset ms':>10} {'cursor ms':>10}")
+            for depth in (0, 1_000, 10_000, 100_000, args.tasks - args.limit):
+                if depth > args.tasks - args.limit:
+                    continue
+                after = None
+                if depth:
+                    row = (await db.execute(
+                        select(TaskModel.created_at, TaskModel.id)
+                        .where(TaskModel.project_id == project_id)
+                        .order_by(TaskModel.created_at, TaskModel.id)
+                        .offset(depth - 1).limit(1)
+                    )).one()
+                    after = (row.created_at, row.id)
+                offset_ms = await timed(lambda: repo.get_by_project_id(project_id, skip=depth, limit=args.limit))
+                cursor_ms = await timed(lambda: repo.get_by_project_id(project_id, limit=args.limit, after=after))
+                print(f"{depth:>10,} {offset_ms:>10.2f} {cursor_ms:>10.2f}")
+    finally:
+        await dispose_async_engine()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+"""
+بنچمارک جستجوی متنی MemoryStorage
+
+تسک‌هایی با عنوان و توضیحات فارسی تصادفی می‌سازد و زمان search_tasks
+(کامل و پیشوندی، با limit) را اندازه می‌گیرد.
+اجرا: python benchmarks/bench_search.py [--tasks N] [--queries N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'todolist'))
+
+from config.settings import settings
+from core.project import Project
+from core.task import Task
+from storage.memory_storage import MemoryStorage
+
+WORDS = ["گزارش", "جلسه", "طراحی", "پایگاه", "داده", "کاربر", "مستندات", "تست", "استقرار", "سرور",
+         "رابط", "فاکتور", "مشتری", "بودجه", "برنامه‌ریزی", "بازبینی", "کد", "امنیت", "پشتیبان", "ارسال"]
+
+def random_text(rng, words, length):
+    return " ".join(rng.choice(words) for _ in range(length))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=1_000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    settings.MAX_NUMBER_OF_TASKS_PER_PROJECT = args.tasks
+    rng = random.Random(42)
+    # واژگان بزرگ‌تر تا لیست هر کلمه شبیه متن واقعی کوتاه باشد
+    vocabulary = [f"{word}{i}" for word in WORDS for i in range(500)]
+
+    storage = MemoryStorage()
+    project = storage.create_project(Project("project", "description"))
+    start = time.perf_counter()
+    storage.create_tasks(project.id, (Task(random_text(rng, vocabulary, 2), random_text(rng, vocabulary, 8))
+                                      for _ in range(args.tasks)))
+    print(f"index {args.tasks:,} tasks: {time.perf_counter() - start:.2f}s")
+
+    for label, prefix, make_query in (
+        ("word", False, lambda: rng.choice(vocabulary)),
+        ("two words", False, lambda: f"{rng.choice(vocabulary)} {rng.choice(vocabulary)}"),
+        ("prefix", True, lambda: rng.choice(vocabulary)[:-1]),
+    ):
+        queries = [make_query() for _ in range(args.queries)]
+        start = time.perf_counter()
+        for query in queries:
+            storage.search_tasks(query, prefix=prefix, limit=args.limit)
+        elapsed = time.perf_counter() - start
+        print(f"{label}: {elapsed / args.queries * 1000:.3f} ms/query")
+
+if __name__ == "__main__":
+    main()
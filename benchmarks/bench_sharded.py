@@ -0,0 +1,61 @@
+"""
+بنچمارک مقیاس‌پذیری ShardedMemoryStorage با تعداد هسته‌ها
+
+هر نخ کلاینت روی پروژه خودش تسک‌های دسته‌ای می‌سازد، وضعیت‌شان را
+عوض می‌کند و query می‌گیرد. توان عملیاتی (تسک در ثانیه) برای MemoryStorage
+تک‌پروسه‌ای thread-safe و برای تعداد مختلف shard مقایسه می‌شود.
+اجرا: python benchmarks/bench_sharded.py [--clients N] [--tasks N] [--shards 1 2 4]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'todolist'))
+
+from config.settings import settings
+from core.project import Project
+from core.task import Task
+from storage.memory_storage import MemoryStorage
+from storage.sharded_storage import ShardedMemoryStorage
+
+def client(storage, project_id, tasks, batch):
+    for start in range(0, tasks, batch):
+        created = storage.create_tasks(project_id, [Task(f"task {i}", "description")
+                                                    for i in range(start, min(start + batch, tasks))])
+        storage.change_status_many([task.id for task in created[::2]], "done")
+        storage.query(project_id=project_id, status="todo", limit=10)
+
+def run(storage, clients, tasks, batch) -> float:
+    projects = [storage.create_project(Project(f"project {i}", "description")) for i in range(clients)]
+    threads = [threading.Thread(target=client, args=(storage, project.id, tasks, batch)) for project in projects]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    assert storage.get_statistics()['total_tasks'] == clients * tasks
+    return clients * tasks / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--tasks", type=int, default=50_000, help="تسک برای هر کلاینت")
+    parser.add_argument("--batch", type=int, default=1_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 4])
+    args = parser.parse_args()
+
+    settings.MAX_NUMBER_OF_PROJECTS = args.clients
+    settings.MAX_NUMBER_OF_TASKS_PER_PROJECT = args.tasks
+
+    baseline = run(MemoryStorage(thread_safe=True), args.clients, args.tasks, args.batch)
+    print(f"single process: {baseline:,.0f} tasks/s")
+    for shards in sorted(set(args.shards)):
+        with ShardedMemoryStorage(shards=shards) as storage:
+            throughput = run(storage, args.clients, args.tasks, args.batch)
+        print(f"{shards} shards: {throughput:,.0f} tasks/s ({throughput / baseline:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+بنچمارک حافظه مقیم TieredMemoryStorage
+
+N تسک done ساخته و سپس به لایه سرد منتقل می‌شوند. حافظه مقیم (tracemalloc)
+قبل و بعد از spill و زمان get_task برای تسک گرم و سرد گزارش می‌شود. سپس در
+چند دور تسک سرد بیشتری اضافه می‌شود و بررسی می‌شود که حافظه مقیم ثابت بماند.
+اجرا: python benchmarks/bench_tiered.py [--tasks N] [--budget N]
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'todolist'))
+
+from config.settings import settings
+from core.project import Project
+from core.task import Task
+from storage.tiered_storage import TieredMemoryStorage
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--budget", type=int, default=1_000, help="تسک‌های done مقیم")
+    parser.add_argument("--rounds", type=int, default=3, help="دورهای افزودن تسک سرد")
+    args = parser.parse_args()
+
+    settings.MAX_NUMBER_OF_TASKS_PER_PROJECT = args.tasks * (args.rounds + 1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        storage = TieredMemoryStorage(os.path.join(directory, "cold.sqlite3"), cold_after=0,
+                                      resident_budget=args.tasks)
+        gc.collect()
+        tracemalloc.start()
+        project = storage.create_project(Project("project", "description"))
+        tasks = storage.create_tasks(project.id, [Task(f"task {i}", "description") for i in range(args.tasks)])
+        storage.change_status_many([task.id for task in tasks], "done")
+        ids = [task.id for task in tasks]
+        del tasks
+        gc.collect()
+        hot = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        storage.resident_budget = args.budget
+        spilled = storage.spill(datetime.now() + timedelta(seconds=1))
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        cold = tracemalloc.get_traced_memory()[0]
+        print(f"spilled {spilled:,} tasks in {elapsed:.2f}s")
+        print(f"resident: {hot / args.tasks:.0f} -> {cold / args.tasks:.0f} bytes per task")
+
+        # هر دور به اندازه --tasks تسک سرد اضافه می‌کند؛ حافظه مقیم نباید رشد کند
+        resident = [cold]
+        for _ in range(args.rounds):
+            added = storage.create_tasks(project.id, [Task(f"task {i}", "description") for i in range(args.tasks)])
+            storage.change_status_many([task.id for task in added], "done")
+            del added
+            storage.spill(datetime.now() + timedelta(seconds=1))
+            gc.collect()
+            resident.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+        print("resident after each round: " + ", ".join(f"{size / 1024:.0f} KiB" for size in resident)
+              + f" ({storage.cold_count:,} cold tasks)")
+        # ids نگه‌داشته‌شده در بنچمارک و شمارنده‌ها ثابت‌اند؛ ۵٪ برای نوسان allocator
+        assert resident[-1] <= resident[0] * 1.05, "resident memory grows with cold tasks"
+
+        start = time.perf_counter()
+        for task_id in ids[:1_000]:
+            storage.get_task(task_id)
+        faulted = time.perf_counter() - start
+        start = time.perf_counter()
+        for task_id in ids[:1_000]:
+            storage.get_task(task_id)
+        resident = time.perf_counter() - start
+        print(f"get_task: cold {faulted * 1e3:.1f}us, resident {resident * 1e3:.1f}us per call")
+        assert storage.get_statistics()['done_tasks'] == args.tasks * (args.rounds + 1)
+        storage.close()
+
+if __name__ == "__main__":
+    main()
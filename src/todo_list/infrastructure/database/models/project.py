@@ -1,19 +1,31 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
 
 class Project(Base):
     __tablename__ = "projects"
+    # صفحه‌بندی keyset لیست پروژه‌ها روی (created_at, id)
+    __table_args__ = (Index("ix_projects_created_at_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(30), nullable=False, unique=True)
     description = Column(String(150), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # شمارنده‌ها با eventهای TaskModel در همان تراکنش به‌روز می‌شوند
+    task_count = Column(Integer, nullable=False, default=0, server_default="0")
+    todo_count = Column(Integer, nullable=False, default=0, server_default="0")
+    doing_count = Column(Integer, nullable=False, default=0, server_default="0")
+    done_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     # رابطه با تسک‌ها
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
 
+    @property
+    def tasks_count(self) -> int:
+        """نام فیلد پاسخ API (ProjectResponse) برای task_count"""
+        return self.task_count or 0
+
     def __repr__(self):
         return f"<Project(id={self.id}, name='{self.name}')>"
     
@@ -24,5 +36,8 @@ class Project(Base):
             "name": self.name,
             "description": self.description,
             "created_at": self.created_at.isoformat() if self.created_at else None,
-            "tasks_count": len(self.tasks) if self.tasks else 0
+            "tasks_count": self.task_count or 0,
+            "todo_count": self.todo_count or 0,
+            "doing_count": self.doing_count or 0,
+            "done_count": self.done_count or 0
         }
\ No newline at end of file
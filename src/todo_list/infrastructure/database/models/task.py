@@ -1,22 +1,119 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Index, column, event, inspect, select, table, update
 from datetime import datetime
 import enum
+import os
 from src.todo_list.infrastructure.database.base import Base
 
+MAX_NUMBER_OF_TASKS_PER_PROJECT = int(os.getenv("MAX_NUMBER_OF_TASKS_PER_PROJECT", "50"))
+
 class TaskStatus(enum.Enum):
     TODO = "todo"
     DOING = "doing"
     DONE = "done"
 
+class TaskLimitExceededError(Exception):
+    """Raised when a project already has MAX_NUMBER_OF_TASKS_PER_PROJECT tasks"""
+    pass
+
 class TaskModel(Base):
     __tablename__ = "tasks"
+    # صفحه‌بندی keyset تسک‌های هر پروژه روی (created_at, id)
+    __table_args__ = (Index("ix_tasks_project_id_created_at_id", "project_id", "created_at", "id"),)
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(30), nullable=False)
     description = Column(String(150), nullable=False)
     status = Column(Enum(TaskStatus), default=TaskStatus.TODO)
     deadline = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     closed_at = Column(DateTime, nullable=True)
     
-    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"))
\ No newline at end of file
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"))
+
+# شمارنده‌های تسک هر پروژه (projects.task_count و شمارنده هر وضعیت) در همان
+# تراکنشی که تسک درج، حذف یا جابه‌جا می‌شود به‌روز می‌شوند تا شمارش و بررسی سقف
+# تسک‌ها بدون بارگذاری ردیف‌های tasks انجام شود. عملیات دسته‌ای Query.update/delete
+# از این eventها عبور نمی‌کنند و باید شمارنده‌ها را خودشان به‌روز کنند. نمونه‌های Project
+# داخل session مقدار جدید را پس از commit (expire_on_commit) یا refresh می‌بینند.
+_projects = table(
+    "projects",
+    column("id"), column("task_count"), column("todo_count"), column("doing_count"), column("done_count"),
+)
+_STATUS_COUNTERS = {
+    TaskStatus.TODO: "todo_count",
+    TaskStatus.DOING: "doing_count",
+    TaskStatus.DONE: "done_count",
+}
+
+def _normalize_status(status) -> TaskStatus:
+    """
+    وضعیت پیش از flush ممکن است هنوز None (پیش‌فرض ستون) یا رشته باشد
+
+    Enum(TaskStatus) نام عضو ("TODO") را ذخیره و به‌عنوان ورودی قبول می‌کند؛
+    مقدار ("todo") هم پذیرفته می‌شود.
+    """
+    if status is None:
+        return TaskStatus.TODO
+    if isinstance(status, TaskStatus):
+        return status
+    try:
+        return TaskStatus[status]
+    except KeyError:
+        return TaskStatus(status)
+
+def _status_counter(status) -> str:
+    return _STATUS_COUNTERS[_normalize_status(status)]
+
+def _committed_value(target, key: str):
+    history = inspect(target).attrs[key].history
+    return history.deleted[0] if history.deleted else getattr(target, key)
+
+def _reserve(connection, project_id: int, status):
+    """یک جای تسک در پروژه؛ شرط سقف در خود UPDATE است تا درج‌های هم‌زمان از آن عبور نکنند"""
+    if project_id is None:
+        return
+    counter = _status_counter(status)
+    result = connection.execute(
+        update(_projects)
+        .where(_projects.c.id == project_id)
+        .where(_projects.c.task_count < MAX_NUMBER_OF_TASKS_PER_PROJECT)
+        .values({"task_count": _projects.c.task_count + 1, counter: _projects.c[counter] + 1})
+    )
+    if result.rowcount == 0:
+        exists = connection.execute(select(_projects.c.id).where(_projects.c.id == project_id)).first()
+        if exists is not None:
+            raise TaskLimitExceededError(
+                f"تعداد تسک‌های هر پروژه نمی‌تواند بیشتر از {MAX_NUMBER_OF_TASKS_PER_PROJECT} باشد")
+
+def _release(connection, project_id: int, status):
+    if project_id is None:
+        return
+    counter = _status_counter(status)
+    connection.execute(
+        update(_projects)
+        .where(_projects.c.id == project_id)
+        .values({"task_count": _projects.c.task_count - 1, counter: _projects.c[counter] - 1})
+    )
+
+@event.listens_for(TaskModel, "before_insert")
+def _count_inserted_task(mapper, connection, target):
+    _reserve(connection, target.project_id, target.status)
+
+@event.listens_for(TaskModel, "after_delete")
+def _count_deleted_task(mapper, connection, target):
+    _release(connection, _committed_value(target, "project_id"), _committed_value(target, "status"))
+
+@event.listens_for(TaskModel, "before_update")
+def _count_updated_task(mapper, connection, target):
+    old_project_id = _committed_value(target, "project_id")
+    old_status = _committed_value(target, "status")
+    if old_project_id != target.project_id:
+        _reserve(connection, target.project_id, target.status)
+        _release(connection, old_project_id, old_status)
+    elif _normalize_status(old_status) != _normalize_status(target.status) and target.project_id is not None:
+        old_counter, new_counter = _status_counter(old_status), _status_counter(target.status)
+        connection.execute(
+            update(_projects)
+            .where(_projects.c.id == target.project_id)
+            .values({old_counter: _projects.c[old_counter] - 1, new_counter: _projects.c[new_counter] + 1})
+        )
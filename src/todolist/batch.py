@@ -0,0 +1,288 @@
+"""
+اجرای غیرتعاملی دستورها روی ذخیره‌ساز
+
+هر خط ورودی یک دستور است؛ یا JSON مثل
+    {"op": "create_task", "project_id": 1, "title": "...", "description": "..."}
+یا متن ساده با آرگومان‌های ترتیبی و key=value یا --key value (نقل‌قول به سبک shell)
+    create_task 1 "Write docs" "API reference" deadline=2030-01-01
+    list_tasks 1 done --limit 50 --offset 100
+کلمه‌ای که = یا -- ابتدایش داخل نقل‌قول باشد ترتیبی است و بعد از -- همه
+کلمه‌ها ترتیبی‌اند:
+    create_task 1 "a=b" -- "--draft--"
+خط خالی و خطی که با # شروع شود نادیده گرفته می‌شود.
+
+برای هر دستور دقیقاً یک خط JSON در خروجی نوشته می‌شود:
+    {"ok":true,"result":...}
+    {"ok":false,"line":3,"error":"ValidationError","message":"..."}
+اگر دستور JSON فیلد id داشته باشد، همان مقدار در پاسخ تکرار می‌شود.
+"""
+import json
+from datetime import datetime
+from typing import IO, Callable, Dict, Iterable, List, Tuple
+from core.exceptions import ToDoListException
+from core.project import Project
+from core.serialization import encode_json, encode_json_list
+from core.task import Task
+
+class BatchCommandError(ToDoListException):
+    """Raised when a batch line cannot be parsed, names an unknown command or passes bad arguments"""
+    pass
+
+# json.loads برای هر خط آرگومان‌هایش را بررسی و decoder را پیدا می‌کند؛ یک decoder ثابت کافی است
+_decode_json = json.JSONDecoder().decode
+
+def _to_int(value) -> int:
+    return value if isinstance(value, int) else int(value)
+
+def _to_bool(value) -> bool:
+    return value if isinstance(value, bool) else value.lower() in ('1', 'true', 'yes')
+
+def _to_datetime(value) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+# نوع آرگومان‌هایی که در متن ساده رشته‌اند یا در JSON ممکن است رشته باشند
+_CONVERTERS: Dict[str, Callable] = {
+    'project_id': _to_int,
+    'task_id': _to_int,
+    'limit': _to_int,
+    'offset': _to_int,
+    'prefix': _to_bool,
+    'deadline': _to_datetime,
+    'due_before': _to_datetime,
+}
+
+# نوع مورد انتظار هر آرگومان پس از تبدیل؛ قبل از اجرای دستور بررسی می‌شود
+_TYPES: Dict[str, type] = {
+    'project_id': int,
+    'task_id': int,
+    'limit': int,
+    'offset': int,
+    'prefix': bool,
+    'deadline': datetime,
+    'due_before': datetime,
+    'name': str,
+    'title': str,
+    'description': str,
+    'status': str,
+    'text': str,
+    'order_by': str,
+}
+
+# Commands: (تابع، نام آرگومان‌های ترتیبی در متن ساده)
+def _create_project(storage, name: str, description: str):
+    return storage.create_project(Project(name, description))
+
+def _create_task(storage, project_id: int, title: str, description: str, deadline: datetime = None):
+    task = Task(title, description)
+    if deadline is not None:
+        task.set_deadline(deadline)
+    return storage.create_task(task, project_id)
+
+def _update_project(storage, project_id: int, name: str = None, description: str = None):
+    return storage.update_project(project_id, name=name, description=description)
+
+def _update_task(storage, task_id: int, title: str = None, description: str = None,
+                 status: str = None, deadline: datetime = None):
+    return storage.update_task(task_id, title=title, description=description, status=status, deadline=deadline)
+
+def _list_tasks(storage, project_id: int, status: str = None, limit: int = None, offset: int = 0):
+    # بدون وضعیت، query روی تسک‌های پروژه به ترتیب ایجاد است و بعد از صفحه متوقف می‌شود
+    return storage.query(project_id=project_id, status=status, limit=limit, offset=offset)
+
+def _query(storage, status: str = None, project_id: int = None, due_before: datetime = None,
+           order_by: str = 'created_at', limit: int = None, offset: int = 0):
+    return storage.query(status=status, project_id=project_id, due_before=due_before,
+                         order_by=order_by, limit=limit, offset=offset)
+
+def _search(storage, text: str, prefix: bool = False, limit: int = None):
+    return storage.search_tasks(text, prefix=prefix, limit=limit)
+
+def _stats(storage, project_id: int = None):
+    if project_id is None:
+        return storage.get_statistics()
+    return storage.get_project_statistics(project_id)
+
+COMMANDS: Dict[str, Tuple[Callable, Tuple[str, ...]]] = {
+    'create_project': (_create_project, ('name', 'description')),
+    'get_project': (lambda storage, project_id: storage.get_project(project_id), ('project_id',)),
+    'list_projects': (lambda storage: storage.get_all_projects(), ()),
+    'update_project': (_update_project, ('project_id', 'name', 'description')),
+    'delete_project': (lambda storage, project_id: storage.delete_project(project_id), ('project_id',)),
+    'create_task': (_create_task, ('project_id', 'title', 'description', 'deadline')),
+    'get_task': (lambda storage, task_id: storage.get_task(task_id), ('task_id',)),
+    'list_tasks': (_list_tasks, ('project_id', 'status')),
+    'update_task': (_update_task, ('task_id',)),
+    'change_status': (lambda storage, task_id, status: storage.change_task_status(task_id, status),
+                      ('task_id', 'status')),
+    'delete_task': (lambda storage, task_id: storage.delete_task(task_id), ('task_id',)),
+    'query': (_query, ()),
+    'search': (_search, ('text',)),
+    'stats': (_stats, ('project_id',)),
+    'tick': (lambda storage: storage.tick(), ()),
+}
+
+def _split_words(line: str) -> List[Tuple[str, int]]:
+    """
+    خط را مثل shlex.split (حالت posix) به کلمه‌ها می‌شکند
+
+    برای هر کلمه طول بخش ابتدایی بدون نقل‌قول و escape هم برگردانده
+    می‌شود تا parse_line قاعده‌های key=value و --key را فقط روی آن اعمال کند.
+    """
+    words = []
+    word, literal, quote, in_word = [], None, None, False
+    chars = iter(line)
+    for char in chars:
+        if quote is None:
+            if char.isspace():
+                if in_word:
+                    words.append((''.join(word), len(word) if literal is None else literal))
+                    word, literal, in_word = [], None, False
+                continue
+            in_word = True
+            if char in '"\'\\' and literal is None:
+                literal = len(word)
+            if char in '"\'':
+                quote = char
+            elif char == '\\':
+                escaped = next(chars, None)
+                if escaped is None:
+                    raise ValueError("No escaped character")
+                word.append(escaped)
+            else:
+                word.append(char)
+        elif char == quote:
+            quote = None
+        elif char == '\\' and quote == '"':
+            # داخل "" فقط \" و \\ escape هستند
+            escaped = next(chars, None)
+            if escaped is None:
+                break
+            word.append(escaped if escaped in '"\\' else char + escaped)
+        else:
+            word.append(char)
+    if quote is not None:
+        raise ValueError("No closing quotation")
+    if in_word:
+        words.append((''.join(word), len(word) if literal is None else literal))
+    return words
+
+def parse_line(line: str) -> Tuple[str, dict, object]:
+    """(نام دستور، آرگومان‌ها، شناسه درخواست) برای یک خط JSON یا متن ساده"""
+    if line.startswith('{'):
+        try:
+            args = _decode_json(line)
+        except ValueError as e:
+            raise BatchCommandError(f"JSON نامعتبر: {e}")
+        if not isinstance(args, dict) or 'op' not in args:
+            raise BatchCommandError("دستور JSON باید فیلد op داشته باشد")
+        op = args.pop('op')
+        request_id = args.pop('id', None)
+    else:
+        try:
+            # بدون نقل‌قول و escape، split معمولی کافی است و همه کلمه‌ها بدون نقل‌قول‌اند
+            if '"' in line or "'" in line or '\\' in line:
+                words = _split_words(line)
+            else:
+                words = [(word, len(word)) for word in line.split()]
+        except ValueError as e:
+            raise BatchCommandError(f"خط نامعتبر: {e}")
+        op, args, positional, request_id = words[0][0], {}, [], None
+        options = True
+        words = iter(words[1:])
+        for word, literal in words:
+            # فقط = بدون نقل‌قول کلید را از مقدار جدا می‌کند
+            equals = word.find('=', 0, literal)
+            if not options:
+                positional.append(word)
+            elif word == '--' and literal == 2:
+                options = False
+            elif word.startswith('--') and literal >= 2:
+                if equals == -1:
+                    key, value = word[2:], next(words, (None,))[0]
+                    if value is None:
+                        raise BatchCommandError(f"مقدار {word} داده نشده است")
+                else:
+                    key, value = word[2:equals], word[equals + 1:]
+                args[key.replace('-', '_')] = value
+            elif equals > 0 and word[:equals].isidentifier():
+                args[word[:equals]] = word[equals + 1:]
+            else:
+                positional.append(word)
+        names = COMMANDS[op][1] if op in COMMANDS else ()
+        if len(positional) > len(names):
+            raise BatchCommandError(f"آرگومان اضافی برای {op}")
+        args.update(zip(names, positional))
+    for key, value in args.items():
+        convert = _CONVERTERS.get(key)
+        if convert is not None and value is not None:
+            try:
+                args[key] = convert(value)
+            except (AttributeError, TypeError, ValueError):
+                raise BatchCommandError(f"مقدار نامعتبر برای {key}: {value!r}")
+    return op, args, request_id
+
+def _check_arguments(op: str, command: Callable, args: dict):
+    """
+    مثل inspect.signature(command).bind(storage, **args)، بدون import سنگین inspect
+
+    دستورها آرگومان *args یا **kwargs ندارند، پس نام پارامترها از code object کافی است.
+    """
+    code = command.__code__
+    names = code.co_varnames[1:code.co_argcount]
+    unknown = [key for key in args if key not in names]
+    if unknown:
+        raise BatchCommandError(f"آرگومان ناشناخته برای {op}: {', '.join(unknown)}")
+    missing = [name for name in names[:len(names) - len(command.__defaults__ or ())] if name not in args]
+    if missing:
+        raise BatchCommandError(f"آرگومان لازم برای {op} داده نشده است: {', '.join(missing)}")
+
+def execute(storage, op: str, args: dict):
+    try:
+        command = COMMANDS[op][0]
+    except (KeyError, TypeError):
+        raise BatchCommandError(f"دستور ناشناخته: {op}")
+    # آرگومان کم یا ناشناخته، یا از نوع اشتباه (مثلاً عدد به‌جای متن در JSON) قبل از
+    # اجرا رد می‌شود؛ خطای خود دستور بسته‌بندی نمی‌شود تا باگ‌ها پنهان نمانند
+    _check_arguments(op, command, args)
+    for key, value in args.items():
+        expected = _TYPES.get(key)
+        if value is not None and expected is not None and (
+                not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool)):
+            raise BatchCommandError(f"آرگومان {key} برای {op} باید از نوع {expected.__name__} باشد: {value!r}")
+    return command(storage, **args)
+
+def encode_result(result) -> bytes:
+    """JSON نتیجه؛ موجودیت‌ها بایت‌های کش‌شده to_json خود را برمی‌گردانند"""
+    if hasattr(result, 'to_json'):
+        return result.to_json()
+    if isinstance(result, list) and all(hasattr(item, 'to_json') for item in result):
+        return encode_json_list(result)
+    return encode_json(result)
+
+def run_batch(storage, lines: Iterable[str], output: IO[bytes], stop_on_error: bool = False) -> int:
+    """
+    دستورها را به ترتیب اجرا و برای هر کدام یک خط JSON در output (باینری) می‌نویسد
+
+    خطای یک دستور فقط در خروجی گزارش می‌شود و بقیه اجرا می‌شوند، مگر
+    stop_on_error داده شده باشد. تعداد دستورهای ناموفق برگردانده می‌شود.
+    """
+    write = output.write
+    failures = 0
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        request_id = None
+        try:
+            op, args, request_id = parse_line(line)
+            body = b'{"ok":true,"result":' + encode_result(execute(storage, op, args))
+        except ToDoListException as e:
+            failures += 1
+            body = encode_json({'ok': False, 'line': number, 'error': type(e).__name__, 'message': str(e)})[:-1]
+        if request_id is not None:
+            body += b',"id":' + encode_json(request_id)
+        write(body + b'}\n')
+        if failures and stop_on_error:
+            break
+    output.flush()
+    return failures
@@ -14,5 +14,20 @@ class Settings:
     MAX_PROJECT_DESCRIPTION_LENGTH = int(os.getenv("MAX_PROJECT_DESCRIPTION_LENGTH", "150"))
     MAX_TASK_TITLE_LENGTH = int(os.getenv("MAX_TASK_TITLE_LENGTH", "30"))
     MAX_TASK_DESCRIPTION_LENGTH = int(os.getenv("MAX_TASK_DESCRIPTION_LENGTH", "150"))
+    # اگر تنظیم شود، داده‌ها در این پوشه ژورنال و بازیابی می‌شوند
+    STORAGE_DATA_DIR = os.getenv("STORAGE_DATA_DIR", "")
+    STORAGE_SNAPSHOT_EVERY = int(os.getenv("STORAGE_SNAPSHOT_EVERY", "100000"))
+    # حداکثر زمانی (میلی‌ثانیه) که یک عملیات AsyncMemoryStorage بدون واگذاری event loop اجرا می‌شود
+    STORAGE_ASYNC_STALL_BUDGET_MS = float(os.getenv("STORAGE_ASYNC_STALL_BUDGET_MS", "5"))
+    # حالت لایه‌ای: تسک‌های done پس از این مدت (ثانیه) بدون تغییر به فایل SQLite منتقل می‌شوند
+    STORAGE_TIERED = os.getenv("STORAGE_TIERED", "0") == "1"
+    STORAGE_COLD_PATH = os.getenv("STORAGE_COLD_PATH", "")
+    STORAGE_COLD_AFTER_SECONDS = float(os.getenv("STORAGE_COLD_AFTER_SECONDS", "3600"))
+    # حداکثر تعداد تسک‌های done مقیم حافظه در حالت لایه‌ای
+    STORAGE_RESIDENT_DONE_TASKS = int(os.getenv("STORAGE_RESIDENT_DONE_TASKS", "10000"))
+    # تعداد تسک‌های هر صفحه در فهرست تسک‌های CLI
+    CLI_PAGE_SIZE = int(os.getenv("CLI_PAGE_SIZE", "20"))
+    # حداقل فاصله (ثانیه) بین دو بار بستن تسک‌های سررسیده در منوهای CLI
+    CLI_TICK_INTERVAL_SECONDS = float(os.getenv("CLI_TICK_INTERVAL_SECONDS", "60"))
 
 settings = Settings()
\ No newline at end of file
@@ -20,4 +20,8 @@ class TaskNotFoundError(ToDoListException):
 
 class LimitExceededError(ToDoListException):
     """Raised when maximum limits are exceeded"""
-    pass
\ No newline at end of file
+    pass
+
+class UnsupportedOperationError(ToDoListException):
+    """Raised when a storage backend does not support the requested operation"""
+    pass
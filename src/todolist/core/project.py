@@ -1,18 +1,52 @@
 from datetime import datetime
 from .exceptions import ValidationError
+from .serialization import CachedSerialization, CacheStats
+from .timestamps import datetime_to_micros, micros_to_datetime
 from config.settings import settings
 
-class Project:
+class Project(CachedSerialization):
+    __slots__ = ('id', 'name', 'description', 'task_count', '_created', '_updated')
+    _serialized_fields = frozenset({'id', 'name', 'description', 'task_count', 'created_at', 'updated_at'})
+    cache_stats = CacheStats()
+    
     def __init__(self, name: str, description: str):
         self._validate_name(name)
         self._validate_description(description)
         
-        self.id = None
-        self.name = name
-        self.description = description
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
-        self.tasks = []
+        self._assign(name, description, datetime_to_micros(datetime.now()))
+    
+    @classmethod
+    def from_validated(cls, name: str, description: str, created: int) -> 'Project':
+        """ساخت بدون اعتبارسنجی برای ردیف‌هایی که validate_project_columns پذیرفته است"""
+        project = cls.__new__(cls)
+        project._assign(name, description, created)
+        return project
+    
+    def _assign(self, name: str, description: str, created: int):
+        # شیء تازه کشی ندارد، پس slotها بدون گذر از __setattr__ ابطال کش پر می‌شوند
+        init = object.__setattr__
+        init(self, 'id', None)
+        init(self, 'name', name)
+        init(self, 'description', description)
+        init(self, 'task_count', 0)
+        init(self, '_created', created)
+        init(self, '_updated', created)
+    
+    @property
+    def created_at(self) -> datetime:
+        return micros_to_datetime(self._created)
+    
+    @created_at.setter
+    def created_at(self, created_at: datetime):
+        self._created = datetime_to_micros(created_at)
+    
+    @property
+    def updated_at(self) -> datetime:
+        return micros_to_datetime(self._updated)
+    
+    @updated_at.setter
+    def updated_at(self, updated_at: datetime):
+        self._updated = datetime_to_micros(updated_at)
     
     def _validate_name(self, name: str):
         if not name or not name.strip():
@@ -37,15 +71,15 @@ class Project:
         
         self.updated_at = datetime.now()
     
-    def to_dict(self):
+    def _serialize(self) -> dict:
         return {
             'id': self.id,
             'name': self.name,
             'description': self.description,
-            'task_count': len(self.tasks),
+            'task_count': self.task_count,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         }
     
     def __str__(self):
-        return f"📁 {self.name} ({len(self.tasks)} تسک)"
\ No newline at end of file
+        return f"📁 {self.name} ({self.task_count} تسک)"
\ No newline at end of file
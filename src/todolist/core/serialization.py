@@ -0,0 +1,78 @@
+import json
+from typing import Iterable
+
+# json.dumps با آرگومان‌های غیرپیش‌فرض برای هر فراخوانی encoder تازه می‌سازد
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+def encode_json(data) -> bytes:
+    return _encode(data).encode('utf-8')
+
+def encode_json_list(entities: Iterable) -> bytes:
+    """آرایه JSON از to_json اشیا؛ برای اشیای تغییرنکرده فقط کپی بایت‌های کش‌شده است"""
+    return b'[' + b','.join(entity.to_json() for entity in entities) + b']'
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+
+    def as_dict(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses}
+
+class CachedSerialization:
+    """
+    کش to_dict و to_json برای موجودیت‌ها
+
+    کلاس فرزند فیلدهای سریال‌شونده را در _serialized_fields و ساخت دیکشنری را
+    در _serialize تعریف می‌کند. مقداردهی هر کدام از این فیلدها (از update و
+    set_status و set_deadline یا مستقیم از ذخیره‌ساز) کش همان شیء را باطل می‌کند.
+    """
+    __slots__ = ('_dict_cache', '_json_cache')
+
+    _serialized_fields: frozenset = frozenset()
+    cache_stats: CacheStats
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in self._serialized_fields:
+            object.__setattr__(self, '_dict_cache', None)
+            object.__setattr__(self, '_json_cache', None)
+
+    def __getstate__(self):
+        # اشیا dict ندارند؛ فقط slotها (بدون کش) کپی یا pickle می‌شوند
+        state = {}
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if name not in ('_dict_cache', '_json_cache') and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return None, state
+
+    def _serialize(self) -> dict:
+        raise NotImplementedError
+
+    def _cached_dict(self) -> dict:
+        cached = getattr(self, '_dict_cache', None)
+        if cached is None:
+            self.cache_stats.misses += 1
+            cached = self._serialize()
+            object.__setattr__(self, '_dict_cache', cached)
+        else:
+            self.cache_stats.hits += 1
+        return cached
+
+    def to_dict(self) -> dict:
+        # کپی سطحی تا تغییر خروجی توسط فراخواننده کش را خراب نکند
+        return dict(self._cached_dict())
+
+    def to_json(self) -> bytes:
+        cached = getattr(self, '_json_cache', None)
+        if cached is None:
+            cached = encode_json(self._cached_dict())
+            object.__setattr__(self, '_json_cache', cached)
+        else:
+            self.cache_stats.hits += 1
+        return cached
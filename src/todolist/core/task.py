@@ -1,6 +1,8 @@
 from datetime import datetime
 from enum import Enum
 from .exceptions import ValidationError
+from .serialization import CachedSerialization, CacheStats
+from .timestamps import NO_TIMESTAMP, datetime_to_micros, micros_to_datetime
 from config.settings import settings
 
 class TaskStatus(Enum):
@@ -8,27 +10,83 @@ class TaskStatus(Enum):
     DOING = "doing"
     DONE = "done"
 
-class Task:
+# وضعیت در خود تسک به صورت کد کوچک (اندیس در این تاپل) نگه داشته می‌شود
+_STATUSES = tuple(TaskStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+
+class Task(CachedSerialization):
+    __slots__ = ('id', 'title', 'description', '_status', '_deadline', 'project_id', '_created', '_updated')
+    _serialized_fields = frozenset({
+        'id', 'title', 'description', 'status', 'deadline', 'project_id', 'created_at', 'updated_at'
+    })
+    cache_stats = CacheStats()
+    
     def __init__(self, title: str, description: str, project_id: int = None):
         self._validate_title(title)
         self._validate_description(description)
-        
-        self.id = None
-        self.title = title
-        self.description = description
-        self.status = TaskStatus.TODO
-        self.deadline = None
-        self.project_id = project_id
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        self._assign(title, description, project_id, datetime_to_micros(datetime.now()))
+    
+    @classmethod
+    def from_validated(cls, title: str, description: str, created: int, project_id: int = None) -> 'Task':
+        """ساخت بدون اعتبارسنجی برای ردیف‌هایی که validate_task_columns پذیرفته است"""
+        task = cls.__new__(cls)
+        task._assign(title, description, project_id, created)
+        return task
+    
+    def _assign(self, title: str, description: str, project_id: int, created: int):
+        # شیء تازه کشی ندارد، پس slotها بدون گذر از __setattr__ ابطال کش پر می‌شوند
+        init = object.__setattr__
+        init(self, 'id', None)
+        init(self, 'title', title)
+        init(self, 'description', description)
+        init(self, '_status', _STATUS_CODES[TaskStatus.TODO])
+        init(self, '_deadline', NO_TIMESTAMP)
+        init(self, 'project_id', project_id)
+        # هر دو زمان یک شیء int مشترک هستند تا اولین به‌روزرسانی
+        init(self, '_created', created)
+        init(self, '_updated', created)
+    
+    @property
+    def status(self) -> TaskStatus:
+        return _STATUSES[self._status]
+    
+    @status.setter
+    def status(self, status: TaskStatus):
+        self._status = _STATUS_CODES[status]
+    
+    @property
+    def deadline(self) -> datetime:
+        return micros_to_datetime(self._deadline)
+    
+    @deadline.setter
+    def deadline(self, deadline: datetime):
+        self._deadline = datetime_to_micros(deadline)
+    
+    @property
+    def created_at(self) -> datetime:
+        return micros_to_datetime(self._created)
+    
+    @created_at.setter
+    def created_at(self, created_at: datetime):
+        self._created = datetime_to_micros(created_at)
+    
+    @property
+    def updated_at(self) -> datetime:
+        return micros_to_datetime(self._updated)
+    
+    @updated_at.setter
+    def updated_at(self, updated_at: datetime):
+        self._updated = datetime_to_micros(updated_at)
     
-    def _validate_title(self, title: str):
+    @staticmethod
+    def _validate_title(title: str):
         if not title or not title.strip():
             raise ValidationError("عنوان تسک نمی‌تواند خالی باشد")
         if len(title) > settings.MAX_TASK_TITLE_LENGTH:
             raise ValidationError(f"عنوان تسک نمی‌تواند بیشتر از {settings.MAX_TASK_TITLE_LENGTH} کاراکتر باشد")
     
-    def _validate_description(self, description: str):
+    @staticmethod
+    def _validate_description(description: str):
         if not description or not description.strip():
             raise ValidationError("توضیحات تسک نمی‌تواند خالی باشد")
         if len(description) > settings.MAX_TASK_DESCRIPTION_LENGTH:
@@ -62,7 +120,7 @@ class Task:
             raise ValidationError("ددلاین نمی‌تواند در گذشته باشد")
         self.deadline = deadline
     
-    def to_dict(self):
+    def _serialize(self) -> dict:
         return {
             'id': self.id,
             'title': self.title,
@@ -0,0 +1,14 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+# زمان‌ها به صورت میکروثانیه از epoch نگه داشته می‌شوند؛ یک int به جای شیء datetime.
+# مقدار None با NO_TIMESTAMP نمایش داده می‌شود تا فیلدها همیشه int باشند.
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+NO_TIMESTAMP = -2 ** 63
+
+def datetime_to_micros(value: Optional[datetime]) -> int:
+    return (value - _EPOCH) // _MICROSECOND if value else NO_TIMESTAMP
+
+def micros_to_datetime(value: int) -> Optional[datetime]:
+    return _EPOCH + timedelta(microseconds=value) if value != NO_TIMESTAMP else None
@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Sequence, Tuple
+from .exceptions import ValidationError
+from .project import Project
+from .task import Task
+from .timestamps import datetime_to_micros
+from config.settings import settings
+
+class ValidationReport:
+    """
+    نتیجه اعتبارسنجی دسته‌ای
+
+    valid شماره ردیف‌های معتبر به ترتیب ورودی و errors نگاشت شماره ردیف
+    به پیام‌های خطای آن ردیف است.
+    """
+
+    def __init__(self, row_count: int, errors: Dict[int, List[str]]):
+        self.row_count = row_count
+        self.errors = errors
+        self.valid = [row for row in range(row_count) if row not in errors] if errors else list(range(row_count))
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def add_error(self, row: int, message: str):
+        if row not in self.errors:
+            self.valid.remove(row)
+        self.errors.setdefault(row, []).append(message)
+
+    def to_dict(self) -> dict:
+        return {
+            'rows': self.row_count,
+            'valid': len(self.valid),
+            'errors': [{'row': row, 'messages': messages} for row, messages in sorted(self.errors.items())]
+        }
+
+def _column_errors(values: Sequence[str], max_length: int, empty_message: str, long_message: str,
+                   errors: Dict[int, List[str]]):
+    # طول و خالی بودن کل ستون با map روی توابع داخلی حساب می‌شود و حلقه پایتونی
+    # فقط روی ردیف‌های نامعتبر اجرا می‌شود
+    try:
+        lengths = list(map(len, values))
+        spaces = list(map(str.isspace, values))
+    except TypeError:
+        # مقدار غیررشته‌ای (مثلاً None از ورودی JSON) خالی حساب می‌شود
+        lengths = [len(value) if isinstance(value, str) else 0 for value in values]
+        spaces = [isinstance(value, str) and value.isspace() for value in values]
+
+    if lengths and min(lengths) > 0 and max(lengths) <= max_length and not any(spaces):
+        return
+    for row, (length, space) in enumerate(zip(lengths, spaces)):
+        if not length or space:
+            errors.setdefault(row, []).append(empty_message)
+        elif length > max_length:
+            errors.setdefault(row, []).append(long_message)
+
+def _check_columns(first: Sequence[str], second: Sequence[str]):
+    if len(first) != len(second):
+        raise ValidationError("تعداد مقادیر ستون‌ها باید برابر باشد")
+
+def validate_task_columns(titles: Sequence[str], descriptions: Sequence[str]) -> ValidationReport:
+    """اعتبارسنجی ستونی عنوان و توضیحات تسک‌ها بدون raise برای ردیف‌های نامعتبر"""
+    _check_columns(titles, descriptions)
+    errors: Dict[int, List[str]] = {}
+    _column_errors(titles, settings.MAX_TASK_TITLE_LENGTH,
+                   "عنوان تسک نمی‌تواند خالی باشد",
+                   f"عنوان تسک نمی‌تواند بیشتر از {settings.MAX_TASK_TITLE_LENGTH} کاراکتر باشد", errors)
+    _column_errors(descriptions, settings.MAX_TASK_DESCRIPTION_LENGTH,
+                   "توضیحات تسک نمی‌تواند خالی باشد",
+                   f"توضیحات تسک نمی‌تواند بیشتر از {settings.MAX_TASK_DESCRIPTION_LENGTH} کاراکتر باشد", errors)
+    return ValidationReport(len(titles), errors)
+
+def validate_project_columns(names: Sequence[str], descriptions: Sequence[str]) -> ValidationReport:
+    """اعتبارسنجی ستونی نام و توضیحات پروژه‌ها بدون raise برای ردیف‌های نامعتبر"""
+    _check_columns(names, descriptions)
+    errors: Dict[int, List[str]] = {}
+    _column_errors(names, settings.MAX_PROJECT_NAME_LENGTH,
+                   "نام پروژه نمی‌تواند خالی باشد",
+                   f"نام پروژه نمی‌تواند بیشتر از {settings.MAX_PROJECT_NAME_LENGTH} کاراکتر باشد", errors)
+    _column_errors(descriptions, settings.MAX_PROJECT_DESCRIPTION_LENGTH,
+                   "توضیحات پروژه نمی‌تواند خالی باشد",
+                   f"توضیحات پروژه نمی‌تواند بیشتر از {settings.MAX_PROJECT_DESCRIPTION_LENGTH} کاراکتر باشد", errors)
+    return ValidationReport(len(names), errors)
+
+def prepare_tasks(titles: Iterable[str], descriptions: Iterable[str]) -> Tuple[List[Task], ValidationReport]:
+    """تسک‌های ردیف‌های معتبر (با یک زمان ایجاد مشترک) همراه گزارش، آماده مسیر دسته‌ای ذخیره‌ساز"""
+    titles, descriptions = list(titles), list(descriptions)
+    report = validate_task_columns(titles, descriptions)
+    created = datetime_to_micros(datetime.now())
+    return [Task.from_validated(titles[row], descriptions[row], created) for row in report.valid], report
+
+def prepare_projects(names: Iterable[str], descriptions: Iterable[str]) -> Tuple[List[Project], ValidationReport]:
+    names, descriptions = list(names), list(descriptions)
+    report = validate_project_columns(names, descriptions)
+    created = datetime_to_micros(datetime.now())
+    return [Project.from_validated(names[row], descriptions[row], created) for row in report.valid], report
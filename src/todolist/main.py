@@ -10,20 +10,23 @@ from dotenv import load_dotenv
 # بارگذاری متغیرهای محیطی
 load_dotenv()
 
-# تنظیمات لاگینگ
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("todolist.log"),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+def configure_logging():
+    """
+    تنظیمات لاگینگ؛ هنگام راه‌اندازی سرور اجرا می‌شود، نه هنگام import
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("todolist.log"),
+            logging.StreamHandler()
+        ]
+    )
+
 # ایمپورت کنترلرها
 from app.api.controllers import projects_controller, tasks_controller
-from app.db.session import engine, Base, SessionLocal
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -31,7 +34,10 @@ async def lifespan(app: FastAPI):
     مدیریت عمر برنامه - اجرا هنگام راه‌اندازی و خاموشی
     """
     # Startup
+    configure_logging()
     logger.info("🚀 Starting ToDoList API...")
+    # engine دیتابیس در اولین استفاده ساخته می‌شود، نه هنگام import ماژول
+    from app.db.session import engine, Base
     
     try:
         # ایجاد جداول دیتابیس (فقط برای توسعه)
@@ -46,8 +52,10 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🛑 Shutting down ToDoList API...")
     try:
-        # بستن اتصالات دیتابیس
+        # بستن اتصالات دیتابیس (engine همزمان و استخر اتصال asyncpg کنترلرها)
+        from app.db.async_session import dispose_async_engine
         engine.dispose()
+        await dispose_async_engine()
         logger.info("✅ Database connections closed successfully")
     except Exception as e:
         logger.error(f"❌ Error during shutdown: {str(e)}")
@@ -215,6 +223,7 @@ async def health_check():
     """
     بررسی سلامت سرویس
     """
+    from app.db.session import SessionLocal
     try:
         # بررسی اتصال به دیتابیس
         db = SessionLocal()
@@ -252,6 +261,7 @@ async def service_info():
     """
     import platform
     from sqlalchemy import text
+    from app.db.session import SessionLocal
     
     try:
         db = SessionLocal()
@@ -333,6 +343,7 @@ if __name__ == "__main__":
     port = int(os.getenv("API_PORT", "8000"))
     reload = os.getenv("API_RELOAD", "True").lower() == "true"
     
+    configure_logging()
     logger.info(f"🎯 Starting server on {host}:{port}")
     logger.info(f"📚 Documentation: http://{host}:{port}/docs")
     logger.info(f"🔍 Environment: {os.getenv('ENVIRONMENT', 'development')}")
@@ -348,6 +359,7 @@ if __name__ == "__main__":
 =======
 import sys
 import os
+import time
 from datetime import datetime
 
 # Add current directory to path for imports
@@ -359,12 +371,21 @@ from core.exceptions import (
     ValidationError, DuplicateProjectError, ProjectNotFoundError,
     TaskNotFoundError, LimitExceededError
 )
-from storage.memory_storage import MemoryStorage
+from storage.factory import create_storage
+from config.settings import settings
 
 class ToDoListApp:
     def __init__(self):
-        self.storage = MemoryStorage()
+        self.storage = create_storage()
         self.current_project_id = None
+        self._next_tick = 0.0
+    
+    def close_overdue_tasks(self):
+        # Close overdue tasks at most once per interval, not on every redraw
+        now = time.monotonic()
+        if now >= self._next_tick:
+            self.storage.tick()
+            self._next_tick = now + settings.CLI_TICK_INTERVAL_SECONDS
     
     def clear_screen(self):
         os.system('cls' if os.name == 'nt' else 'clear')
@@ -380,27 +401,12 @@ class ToDoListApp:
     
     def display_statistics(self):
         try:
-            total_projects = len(self.storage.projects)
-            total_tasks = len(self.storage.tasks)
-            
-            todo_count = 0
-            doing_count = 0
-            done_count = 0
-            
-            for task in self.storage.tasks:
-                if task.status.value == "todo":
-                    todo_count += 1
-                elif task.status.value == "doing":
-                    doing_count += 1
-                elif task.status.value == "done":
-                    done_count += 1
-            
-            completion_rate = (done_count / total_tasks * 100) if total_tasks > 0 else 0
+            stats = self.storage.get_statistics()
             
             print(f"\n📊 Statistics:")
-            print(f"   Projects: {total_projects} | Tasks: {total_tasks}")
-            print(f"   ⏳ Todo: {todo_count} | 🔄 Doing: {doing_count} | ✅ Done: {done_count}")
-            print(f"   📈 Completion Rate: {completion_rate:.1f}%")
+            print(f"   Projects: {stats['total_projects']} | Tasks: {stats['total_tasks']}")
+            print(f"   ⏳ Todo: {stats['todo_tasks']} | 🔄 Doing: {stats['doing_tasks']} | ✅ Done: {stats['done_tasks']}")
+            print(f"   📈 Completion Rate: {stats['completion_rate']:.1f}%")
             
         except:
             print(f"\n📊 Statistics:")
@@ -411,6 +417,7 @@ class ToDoListApp:
     # Main Menu
     def main_menu(self):
         while True:
+            self.close_overdue_tasks()
             self.display_header("ToDo List - Main Menu")
             self.display_statistics()
             
@@ -476,6 +483,15 @@ class ToDoListApp:
             self.wait_for_enter()
             return
         
+        # Prefix search: typing the start of a word narrows the list
+        search = input("🔎 Search projects (Enter to show all): ").strip()
+        if search:
+            projects = self.storage.search_projects(search, prefix=True)
+            if not projects:
+                print(f"📭 No projects match '{search}'")
+                self.wait_for_enter()
+                return
+        
         for i, project in enumerate(projects, 1):
             print(f"{i}. {project}")
         
@@ -494,13 +510,14 @@ class ToDoListApp:
     # Project Menu
     def project_menu(self):
         while self.current_project_id:
+            self.close_overdue_tasks()
             try:
                 project = self.storage.get_project(self.current_project_id)
                 self.display_header(f"Project: {project.name}")
                 print(f"📖 {project.description}")
                 
-                project_tasks = [t for t in self.storage.tasks if t.project_id == self.current_project_id]
-                print(f"\n📊 Project stats: {len(project_tasks)} tasks")
+                project_stats = self.storage.get_project_statistics(self.current_project_id)
+                print(f"\n📊 Project stats: {project_stats['total_tasks']} tasks")
                 
                 print("\n📋 Task Management:")
                 print("1. ➕ Create New Task")
@@ -569,43 +586,70 @@ class ToDoListApp:
         
         self.wait_for_enter()
     
+    def task_pages(self, project_id: int, page_size: int):
+        """
+        (وضعیت، تعداد کل آن وضعیت، تسک‌های صفحه) به ترتیب todo، doing، done
+
+        تعداد هر وضعیت از شمارنده‌های پروژه خوانده می‌شود. تسک‌های پروژه فقط
+        یک بار و به‌صورت lazy پیمایش می‌شوند: تسک‌های وضعیت فعلی به محض پر شدن
+        صفحه برگردانده می‌شوند و تسک‌های وضعیت‌های بعدی که در مسیر دیده می‌شوند
+        برای صفحه‌های بعد نگه داشته می‌شوند.
+        """
+        stats = self.storage.get_project_statistics(project_id)
+        pending = {status: [] for status in TaskStatus}
+        tasks = self.storage.iter_project_tasks(project_id)
+        for status in TaskStatus:
+            count = stats[f'{status.value}_tasks']
+            if not count:
+                continue
+            page = pending[status]
+            for task in tasks:
+                pending[task.status].append(task)
+                if len(page) == page_size:
+                    yield status, count, page
+                    page = pending[status] = []
+            # پیمایش تمام شده است؛ باقی تسک‌های این وضعیت از قبل جمع شده‌اند
+            del pending[status]
+            for start in range(0, len(page), page_size):
+                yield status, count, page[start:start + page_size]
+    
     def list_tasks(self):
         self.display_header("Tasks List")
         
+        headers = {
+            TaskStatus.TODO: "⏳ Todo",
+            TaskStatus.DOING: "🔄 Doing",
+            TaskStatus.DONE: "✅ Done"
+        }
+        
         try:
-            tasks = self.storage.get_project_tasks(self.current_project_id)
             project = self.storage.get_project(self.current_project_id)
             
             print(f"📁 Project: {project.name}\n")
             
-            if not tasks:
+            total = project.task_count
+            if not total:
                 print("📭 No tasks found in this project")
                 self.wait_for_enter()
                 return
             
-            todo_tasks = [t for t in tasks if t.status == TaskStatus.TODO]
-            doing_tasks = [t for t in tasks if t.status == TaskStatus.DOING]
-            done_tasks = [t for t in tasks if t.status == TaskStatus.DONE]
-            
-            if todo_tasks:
-                print("⏳ Todo:")
-                for task in todo_tasks:
-                    print(f"   {task}")
-                print()
-            
-            if doing_tasks:
-                print("🔄 Doing:")
-                for task in doing_tasks:
-                    print(f"   {task}")
-                print()
-            
-            if done_tasks:
-                print("✅ Done:")
-                for task in done_tasks:
+            shown = 0
+            current = None
+            for status, count, page in self.task_pages(project.id, max(1, settings.CLI_PAGE_SIZE)):
+                if status is not current:
+                    if current is not None:
+                        print()
+                    print(f"{headers[status]} ({count}):")
+                    current = status
+                for task in page:
                     print(f"   {task}")
-                print()
+                shown += len(page)
+                if shown < total:
+                    more = input(f"\n-- {shown}/{total} shown, Enter for more, q to stop: ").strip().lower()
+                    if more == "q":
+                        break
             
-            print(f"📊 Total: {len(tasks)} tasks")
+            print(f"\n📊 Total: {total} tasks")
             
         except ProjectNotFoundError as e:
             print(f"❌ {e}")
@@ -747,9 +791,9 @@ class ToDoListApp:
         
         try:
             project = self.storage.get_project(self.current_project_id)
-            project_tasks = [t for t in self.storage.tasks if t.project_id == self.current_project_id]
+            project_stats = self.storage.get_project_statistics(self.current_project_id)
             
-            confirm = input(f"⚠️ Are you sure you want to delete project '{project.name}' and all {len(project_tasks)} tasks? (y/n): ").strip().lower()
+            confirm = input(f"⚠️ Are you sure you want to delete project '{project.name}' and all {project_stats['total_tasks']} tasks? (y/n): ").strip().lower()
             
             if confirm == 'y':
                 self.storage.delete_project(self.current_project_id)
@@ -765,8 +809,33 @@ class ToDoListApp:
         self.wait_for_enter()
 
 def main():
-    app = ToDoListApp()
-    app.main_menu()
+    import argparse
+    parser = argparse.ArgumentParser(prog="todolist")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE",
+                        help="run commands from FILE (or stdin with -) and print JSON lines")
+    parser.add_argument("--stop-on-error", action="store_true",
+                        help="stop the batch at the first failed command")
+    args = parser.parse_args()
+
+    if args.batch is None:
+        app = ToDoListApp()
+        try:
+            app.main_menu()
+        finally:
+            app.storage.close()
+        return
+
+    from batch import run_batch
+    storage = create_storage()
+    source = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8")
+    try:
+        storage.tick()
+        failures = run_batch(storage, source, sys.stdout.buffer, stop_on_error=args.stop_on_error)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        storage.close()
+    sys.exit(1 if failures else 0)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,237 @@
+import asyncio
+import heapq
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, List, Tuple
+from core.project import Project
+from core.task import Task
+from core.validation import ValidationReport, prepare_tasks
+from core.exceptions import LimitExceededError, ProjectNotFoundError, TaskNotFoundError
+from config.settings import settings
+from storage.memory_storage import MemoryStorage
+
+class _StallBudget:
+    """زمان اجرای پیوسته را می‌شمارد و با تمام شدن بودجه event loop را واگذار می‌کند"""
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.yields = 0
+        self._started = time.perf_counter()
+
+    async def checkpoint(self):
+        if time.perf_counter() - self._started >= self.budget:
+            await asyncio.sleep(0)
+            self.yields += 1
+            self._started = time.perf_counter()
+
+class AsyncMemoryStorage:
+    """
+    رابط awaitable روی MemoryStorage برای استفاده در event loop
+
+    عملیات کوتاه مستقیماً اجرا می‌شوند. عملیات طولانی (حذف آبشاری، عملیات
+    دسته‌ای و اسکن‌های query) در دسته‌های batch_size تایی اجرا می‌شوند و هر
+    بار که stall_budget ثانیه بدون وقفه کار کرده باشند، event loop را واگذار
+    می‌کنند. نوشتن‌ها و اسکن‌ها با یک asyncio.Lock پشت سر هم اجرا می‌شوند و
+    خواندن‌های کوتاه منتظر آن‌ها نمی‌مانند؛ پروژه‌ای که در حال حذف است از
+    همان ابتدا برای خواندن‌ها وجود ندارد.
+
+    مخزن زیرین باید فقط از طریق همین رابط و روی همین event loop تغییر کند.
+    """
+
+    def __init__(self, storage: MemoryStorage = None, stall_budget: float = None, batch_size: int = 64):
+        self.storage = storage if storage is not None else MemoryStorage()
+        if stall_budget is None:
+            stall_budget = settings.STORAGE_ASYNC_STALL_BUDGET_MS / 1000
+        self.stall_budget = stall_budget
+        self.batch_size = batch_size
+        self._lock = asyncio.Lock()
+        # پروژه‌هایی که حذف آبشاری آن‌ها شروع شده ولی تمام نشده است
+        self._deleting: set = set()
+
+    def _budget(self) -> _StallBudget:
+        return _StallBudget(self.stall_budget)
+
+    def _batches(self, items: list) -> Iterable[list]:
+        for start in range(0, len(items), self.batch_size):
+            yield items[start:start + self.batch_size]
+
+    def _check_project(self, project_id: int):
+        if project_id in self._deleting:
+            raise ProjectNotFoundError(f"پروژه با شناسه {project_id} یافت نشد")
+
+    async def close(self):
+        async with self._lock:
+            self.storage.close()
+
+    # Project Methods
+    async def create_project(self, project: Project) -> Project:
+        async with self._lock:
+            return self.storage.create_project(project)
+
+    async def get_project(self, project_id: int) -> Project:
+        self._check_project(project_id)
+        return self.storage.get_project(project_id)
+
+    async def get_project_by_name(self, name: str) -> Project:
+        project = self.storage.get_project_by_name(name)
+        self._check_project(project.id)
+        return project
+
+    async def get_all_projects(self) -> List[Project]:
+        return [project for project in self.storage.get_all_projects() if project.id not in self._deleting]
+
+    async def update_project(self, project_id: int, name: str = None, description: str = None) -> Project:
+        async with self._lock:
+            return self.storage.update_project(project_id, name, description)
+
+    async def delete_project(self, project_id: int) -> bool:
+        """
+        حذف آبشاری پروژه بدون متوقف کردن event loop
+
+        تسک‌ها دسته‌دسته با delete_tasks حذف می‌شوند و در پایان خود پروژه
+        (که دیگر تسکی ندارد) حذف می‌شود.
+        """
+        async with self._lock:
+            self.storage.get_project(project_id)  # Validate project exists
+            self._deleting.add(project_id)
+            try:
+                budget = self._budget()
+                task_ids = [task.id for task in self.storage.iter_project_tasks(project_id)]
+                for batch in self._batches(task_ids):
+                    self.storage.delete_tasks(batch)
+                    await budget.checkpoint()
+                return self.storage.delete_project(project_id)
+            finally:
+                self._deleting.discard(project_id)
+
+    # Task Methods
+    async def create_task(self, task: Task, project_id: int) -> Task:
+        async with self._lock:
+            return self.storage.create_task(task, project_id)
+
+    async def get_task(self, task_id: int) -> Task:
+        task = self.storage.get_task(task_id)
+        if task.project_id in self._deleting:
+            raise TaskNotFoundError(f"تسک با شناسه {task_id} یافت نشد")
+        return task
+
+    async def get_project_tasks(self, project_id: int) -> List[Task]:
+        self._check_project(project_id)
+        return self.storage.get_project_tasks(project_id)
+
+    async def update_task(self, task_id: int, **kwargs) -> Task:
+        async with self._lock:
+            return self.storage.update_task(task_id, **kwargs)
+
+    async def delete_task(self, task_id: int) -> bool:
+        async with self._lock:
+            return self.storage.delete_task(task_id)
+
+    async def change_task_status(self, task_id: int, status: str) -> Task:
+        async with self._lock:
+            return self.storage.change_task_status(task_id, status)
+
+    # Bulk Task Methods
+    async def create_tasks(self, project_id: int, tasks: Iterable[Task]) -> List[Task]:
+        async with self._lock:
+            tasks = list(tasks)
+            # سقف تسک‌ها یک بار برای کل دسته بررسی می‌شود تا دسته‌های بعدی شکست نخورند
+            if self.storage.get_project(project_id).task_count + len(tasks) > settings.MAX_NUMBER_OF_TASKS_PER_PROJECT:
+                raise LimitExceededError(f"تعداد تسک‌های هر پروژه نمی‌تواند بیشتر از {settings.MAX_NUMBER_OF_TASKS_PER_PROJECT} باشد")
+
+            budget = self._budget()
+            created = []
+            for batch in self._batches(tasks):
+                created.extend(self.storage.create_tasks(project_id, batch))
+                await budget.checkpoint()
+            return created
+
+    async def import_tasks(self, project_id: int, titles: Iterable[str],
+                           descriptions: Iterable[str]) -> Tuple[List[Task], ValidationReport]:
+        tasks, report = prepare_tasks(titles, descriptions)
+        return await self.create_tasks(project_id, tasks), report
+
+    async def update_tasks(self, updates: Dict[int, dict]) -> List[Task]:
+        # بازگرداندن دسته در صورت خطا فقط در یک فراخوانی ممکن است
+        async with self._lock:
+            return self.storage.update_tasks(updates)
+
+    async def delete_tasks(self, task_ids: Iterable[int]) -> int:
+        async with self._lock:
+            task_ids = list(dict.fromkeys(task_ids))
+            for task_id in task_ids:
+                self.storage.get_task(task_id)  # همه یا هیچ: قبل از حذف بررسی می‌شود
+
+            budget = self._budget()
+            deleted = 0
+            for batch in self._batches(task_ids):
+                deleted += self.storage.delete_tasks(batch)
+                await budget.checkpoint()
+            return deleted
+
+    async def change_status_many(self, task_ids: Iterable[int], status: str) -> List[Task]:
+        async with self._lock:
+            task_ids = list(dict.fromkeys(task_ids))
+            self.storage._validate_status(status)
+            for task_id in task_ids:
+                self.storage.get_task(task_id)
+
+            budget = self._budget()
+            changed = []
+            for batch in self._batches(task_ids):
+                changed.extend(self.storage.change_status_many(batch, status))
+                await budget.checkpoint()
+            return changed
+
+    async def tick(self) -> List[Task]:
+        async with self._lock:
+            return self.storage.tick()
+
+    # Query
+    async def query(self, status: str = None, project_id: int = None, due_before: datetime = None,
+                    order_by: str = 'created_at', limit: int = None, offset: int = 0) -> List[Task]:
+        """همان MemoryStorage.query، با واگذاری event loop در طول اسکن"""
+        if project_id is not None:
+            self._check_project(project_id)
+        stop = self.storage._page_stop(limit, offset)
+        async with self._lock:
+            matches, key = self.storage._query_plan(status, project_id, due_before, order_by)
+            budget = self._budget()
+            results = []
+            while True:
+                batch = list(islice(matches, self.batch_size))
+                results.extend(batch)
+                if not batch or (key is None and stop is not None and len(results) >= stop):
+                    break
+                await budget.checkpoint()
+
+        if key is None:
+            return results[offset:stop]
+        if stop is not None:
+            return heapq.nsmallest(stop, results, key=key)[offset:]
+        return sorted(results, key=key)[offset:]
+
+    async def search_tasks(self, text: str, prefix: bool = False, limit: int = None) -> List[Task]:
+        return [task for task in self.storage.search_tasks(text, prefix, limit)
+                if task.project_id not in self._deleting]
+
+    async def search_projects(self, text: str, prefix: bool = True, limit: int = None) -> List[Project]:
+        return [project for project in self.storage.search_projects(text, prefix, limit)
+                if project.id not in self._deleting]
+
+    # Statistics
+    async def get_statistics(self) -> dict:
+        # تسک‌های باقی‌مانده پروژه‌های در حال حذف شمرده نمی‌شوند
+        counts = dict(self.storage._status_counts)
+        for project_id in self._deleting:
+            for status_value, count in self.storage._project_status_counts[project_id].items():
+                counts[status_value] -= count
+        return {
+            'total_projects': len(self.storage._projects) - len(self._deleting),
+            **self.storage._build_statistics(counts)
+        }
+
+    async def get_project_statistics(self, project_id: int) -> dict:
+        self._check_project(project_id)
+        return self.storage.get_project_statistics(project_id)
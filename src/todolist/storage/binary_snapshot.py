@@ -0,0 +1,187 @@
+import mmap
+import os
+import struct
+from array import array
+from itertools import compress
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from core.project import Project
+from core.task import Task, TaskStatus
+from core.timestamps import datetime_to_micros, micros_to_datetime
+
+# قالب فایل snapshot:
+#   header | رکوردهای پروژه | رکوردهای تسک (مرتب بر اساس id) | ایندکس تسک‌های هر پروژه | heap رشته‌ها
+# رکوردها طول ثابت دارند و رشته‌ها با (offset, length) به heap اشاره می‌کنند،
+# بنابراین فایل بدون parse کامل با mmap باز می‌شود و اشیا فقط هنگام دسترسی ساخته می‌شوند.
+MAGIC = b'TDLSNAP\x00'
+FORMAT_VERSION = 2
+
+# magic, version, generation, next_project_id, next_task_id, project_count, task_count,
+# projects_offset, tasks_offset, index_offset, heap_offset
+HEADER = struct.Struct('<8sIqqqqqqqqq')
+# id, created_at, updated_at, name_off, name_len, desc_off, desc_len, index_start, index_count, todo, doing, done
+PROJECT_RECORD = struct.Struct('<qqqQIQIqqqqq')
+# id, project_id, status, deadline, created_at, updated_at, title_off, title_len, desc_off, desc_len
+TASK_RECORD = struct.Struct('<qqB7xqqqQIQI')
+TASK_STATUS_OFFSET = 16
+TASK_DEADLINE_OFFSET = 24
+INDEX_ITEM = 'I'
+
+STATUSES: List[TaskStatus] = list(TaskStatus)
+STATUS_CODES: Dict[str, int] = {status.value: code for code, status in enumerate(STATUSES)}
+DONE_CODE = STATUS_CODES[TaskStatus.DONE.value]
+
+class _StringHeap:
+    def __init__(self):
+        self.data = bytearray()
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+
+    def add(self, value: str) -> Tuple[int, int]:
+        # رشته‌های تکراری (مثلاً توضیحات یکسان) فقط یک بار ذخیره می‌شوند
+        ref = self._offsets.get(value)
+        if ref is None:
+            encoded = value.encode('utf-8')
+            ref = self._offsets[value] = (len(self.data), len(encoded))
+            self.data += encoded
+        return ref
+
+def write_snapshot(path: str, generation: int, next_project_id: int, next_task_id: int,
+                   projects: Iterable[Project], project_tasks: Dict[int, Dict[int, Task]],
+                   project_status_counts: Dict[int, Dict[str, int]]):
+    """snapshot را در path می‌نویسد و fsync می‌کند؛ جایگزینی اتمیک با فراخواننده است"""
+    heap = _StringHeap()
+    projects = list(projects)
+    tasks = sorted((task for project in projects for task in project_tasks[project.id].values()),
+                   key=lambda task: task.id)
+    record_index = {task.id: i for i, task in enumerate(tasks)}
+
+    project_section = bytearray()
+    index = array(INDEX_ITEM)
+    for project in projects:
+        counts = project_status_counts[project.id]
+        task_ids = project_tasks[project.id]
+        project_section += PROJECT_RECORD.pack(
+            project.id, datetime_to_micros(project.created_at), datetime_to_micros(project.updated_at),
+            *heap.add(project.name), *heap.add(project.description),
+            len(index), len(task_ids), *(counts[status.value] for status in STATUSES))
+        index.extend(record_index[task_id] for task_id in task_ids)
+
+    task_section = bytearray(TASK_RECORD.size * len(tasks))
+    for i, task in enumerate(tasks):
+        TASK_RECORD.pack_into(
+            task_section, i * TASK_RECORD.size,
+            task.id, task.project_id, STATUS_CODES[task.status.value], datetime_to_micros(task.deadline),
+            datetime_to_micros(task.created_at), datetime_to_micros(task.updated_at),
+            *heap.add(task.title), *heap.add(task.description))
+
+    projects_offset = HEADER.size
+    tasks_offset = projects_offset + len(project_section)
+    index_offset = tasks_offset + len(task_section)
+    heap_offset = index_offset + len(index) * index.itemsize
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, generation, next_project_id, next_task_id,
+                         len(projects), len(tasks), projects_offset, tasks_offset, index_offset, heap_offset)
+
+    with open(path, 'wb') as f:
+        for section in (header, project_section, task_section, index.tobytes(), heap.data):
+            f.write(section)
+        f.flush()
+        os.fsync(f.fileno())
+
+class BinarySnapshot:
+    """نمای فقط-خواندنی و mmap‌شده روی یک فایل snapshot"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.generation, self.next_project_id, self.next_task_id,
+         self.project_count, self.task_count, self._projects_offset, self._tasks_offset,
+         self._index_offset, self._heap_offset) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"فایل snapshot نامعتبر است: {path}")
+
+    def close(self):
+        self._mm.close()
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._heap_offset + offset
+        return self._mm[start:start + length].decode('utf-8')
+
+    def iter_projects(self) -> Iterator[Tuple[Project, Dict[str, int], Tuple[int, int]]]:
+        """پروژه‌ها را همراه با شمارنده وضعیت و بازه ایندکس تسک‌هایشان برمی‌گرداند"""
+        for i in range(self.project_count):
+            (project_id, created_at, updated_at, name_off, name_len, desc_off, desc_len,
+             index_start, index_count, *counts) = PROJECT_RECORD.unpack_from(
+                self._mm, self._projects_offset + i * PROJECT_RECORD.size)
+            project = Project.__new__(Project)
+            project.id = project_id
+            project.name = self._string(name_off, name_len)
+            project.description = self._string(desc_off, desc_len)
+            # زمان‌ها با همان قالب میکروثانیه‌ای موجودیت ذخیره شده‌اند
+            project._created, project._updated = created_at, updated_at
+            project.task_count = index_count
+            status_counts = {status.value: count for status, count in zip(STATUSES, counts)}
+            yield project, status_counts, (index_start, index_count)
+
+    def project_task_records(self, index_range: Tuple[int, int]) -> array:
+        start, count = index_range
+        offset = self._index_offset + start * array(INDEX_ITEM).itemsize
+        records = array(INDEX_ITEM)
+        records.frombytes(self._mm[offset:offset + count * records.itemsize])
+        return records
+
+    def task_id_at(self, record: int) -> int:
+        return struct.unpack_from('<q', self._mm, self._tasks_offset + record * TASK_RECORD.size)[0]
+
+    def task_project_id_at(self, record: int) -> int:
+        return struct.unpack_from('<q', self._mm, self._tasks_offset + record * TASK_RECORD.size + 8)[0]
+
+    def find_task(self, task_id: int) -> Optional[int]:
+        """جستجوی دودویی روی ستون id؛ شماره رکورد یا None"""
+        low, high = 0, self.task_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.task_id_at(middle) < task_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.task_count and self.task_id_at(low) == task_id:
+            return low
+        return None
+
+    def load_task(self, record: int) -> Task:
+        (task_id, project_id, status, deadline, created_at, updated_at,
+         title_off, title_len, desc_off, desc_len) = TASK_RECORD.unpack_from(
+            self._mm, self._tasks_offset + record * TASK_RECORD.size)
+        task = Task.__new__(Task)
+        task.id = task_id
+        task.project_id = project_id
+        task.title = self._string(title_off, title_len)
+        task.description = self._string(desc_off, desc_len)
+        task.status = STATUSES[status]
+        task._deadline, task._created, task._updated = deadline, created_at, updated_at
+        return task
+
+    def status_counts(self) -> Dict[str, int]:
+        """شمارش وضعیت‌ها مستقیماً از ستون وضعیت، بدون ساختن هیچ شیئی"""
+        start = self._tasks_offset + TASK_STATUS_OFFSET
+        column = self._mm[start:self._index_offset:TASK_RECORD.size]
+        return {status.value: column.count(bytes([code])) for code, status in enumerate(STATUSES)}
+
+    def open_records_due(self, low: int, high: int) -> List[int]:
+        """
+        شماره رکورد تسک‌های بازی که ددلاینشان (میکروثانیه) در بازه [low, high) است
+
+        فقط ستون‌های ددلاین و وضعیت از mmap خوانده می‌شوند و مقایسه با
+        range.__contains__ در C انجام می‌شود؛ هیچ شیء Task ساخته نمی‌شود.
+        """
+        statuses = self._mm[self._tasks_offset + TASK_STATUS_OFFSET:self._index_offset:TASK_RECORD.size]
+        stride = TASK_RECORD.size // 8
+        with memoryview(self._mm) as view, view[self._tasks_offset:self._index_offset] as section, \
+                section.cast('q') as words:
+            deadlines = words[TASK_DEADLINE_OFFSET // 8::stride]
+            try:
+                due = list(compress(range(self.task_count), map(range(low, high).__contains__, deadlines)))
+            finally:
+                deadlines.release()
+        return [record for record in due if statuses[record] != DONE_CODE]
@@ -0,0 +1,428 @@
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from core.project import Project
+from core.task import Task, TaskStatus
+from core.serialization import encode_json
+from core.exceptions import LimitExceededError, TaskNotFoundError, UnsupportedOperationError, ValidationError
+from config.settings import settings
+from storage.binary_snapshot import STATUSES, STATUS_CODES, datetime_to_micros, micros_to_datetime
+from storage.locks import reads, writes
+from storage.memory_storage import MemoryStorage
+from storage.sorted_index import SortedIndex
+
+# کد وضعیت ردیف‌های حذف‌شده در ستون وضعیت
+DELETED = 0xFF
+DONE_CODE = STATUS_CODES[TaskStatus.DONE.value]
+NO_DEADLINE = datetime_to_micros(None)
+
+class _StringTable:
+    """جدول رشته‌های intern‌شده؛ ستون‌ها فقط شماره رشته را نگه می‌دارند"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+class TaskView:
+    """
+    نمای سبک و فقط-خواندنی روی یک ردیف از ColumnarMemoryStorage
+
+    همان ویژگی‌های Task را دارد ولی مقادیر را در هر دسترسی از ستون‌ها می‌خواند؛
+    تغییر فقط از طریق متدهای مخزن انجام می‌شود.
+    """
+    __slots__ = ('_storage', '_row')
+
+    def __init__(self, storage: 'ColumnarMemoryStorage', row: int):
+        self._storage = storage
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return self._storage._ids[self._row]
+
+    @property
+    def project_id(self) -> int:
+        return self._storage._project_ids[self._row]
+
+    @property
+    def title(self) -> str:
+        return self._storage._strings.strings[self._storage._titles[self._row]]
+
+    @property
+    def description(self) -> str:
+        return self._storage._strings.strings[self._storage._descriptions[self._row]]
+
+    @property
+    def status(self) -> TaskStatus:
+        return STATUSES[self._storage._statuses[self._row]]
+
+    @property
+    def deadline(self) -> Optional[datetime]:
+        return micros_to_datetime(self._storage._deadlines[self._row])
+
+    @property
+    def created_at(self) -> datetime:
+        return micros_to_datetime(self._storage._created[self._row])
+
+    @property
+    def updated_at(self) -> datetime:
+        return micros_to_datetime(self._storage._updated[self._row])
+
+    # ردیف‌ها درجا در ستون‌ها تغییر می‌کنند، پس خروجی کش نمی‌شود
+    to_dict = Task._serialize
+    __str__ = Task.__str__
+
+    def to_json(self) -> bytes:
+        return encode_json(self.to_dict())
+
+    def __eq__(self, other):
+        return isinstance(other, TaskView) and other._storage is self._storage and other._row == self._row
+
+    def __hash__(self):
+        return hash(self._row)
+
+    def __repr__(self):
+        return f"TaskView(id={self.id})"
+
+class ColumnarMemoryStorage(MemoryStorage):
+    """
+    موتور ذخیره‌سازی ستونی (struct-of-arrays) برای تعداد بسیار زیاد تسک
+
+    هر ویژگی تسک یک آرایه تایپ‌دار است: id و project_id در int64، وضعیت در یک
+    bytearray، زمان‌ها به میکروثانیه در int64 و متن‌ها به‌صورت شماره در جدول
+    رشته‌های intern‌شده. ردیف‌ها به ترتیب ایجاد اضافه می‌شوند، پس ستون id مرتب
+    است و جستجو با bisect انجام می‌شود. حذف فقط ردیف را در ستون وضعیت علامت
+    می‌زند و compact() ردیف‌های حذف‌شده را پاک می‌کند.
+
+    رابط همان MemoryStorage است ولی متدهای خواندن TaskView برمی‌گردانند.
+    read_view پشتیبانی نمی‌شود و UnsupportedOperationError می‌دهد. ایندکس متنی
+    تسک‌ها چند برابر خود ستون‌ها حافظه می‌گیرد، پس فقط با اولین search_tasks
+    ساخته می‌شود و از آن به بعد همراه ردیف‌ها به‌روز می‌ماند.
+    """
+
+    def __init__(self, thread_safe: bool = False):
+        super().__init__(thread_safe)
+        self._strings = _StringTable()
+        self._ids = array('q')
+        self._project_ids = array('q')
+        self._statuses = bytearray()
+        self._deadlines = array('q')
+        self._created = array('q')
+        self._updated = array('q')
+        self._titles = array('I')
+        self._descriptions = array('I')
+        # project_id -> شماره ردیف‌های آن پروژه به ترتیب ایجاد
+        self._project_rows: Dict[int, array] = {}
+        # (ددلاین میکروثانیه، ردیف) برای ردیف‌های زنده و غیر done که ددلاین دارند
+        self._open_deadlines = SortedIndex()
+        # ایندکس متنی تسک‌ها تا اولین search_tasks ساخته نمی‌شود
+        self._task_text_ready = False
+
+    def _index_project(self, project: Project):
+        self._projects[project.id] = project
+        self._projects_by_name[project.name] = project
+        self._project_rows[project.id] = array('I')
+        self._project_status_counts[project.id] = self._empty_status_counts()
+        self._project_text.index(project.id, project.name, project.description)
+
+    def _unindex_project(self, project: Project):
+        statuses = self._statuses
+        for row in self._project_rows.pop(project.id):
+            self._unindex_text(row)
+            self._unindex_deadline(row)
+            statuses[row] = DELETED
+        for status_value, count in self._project_status_counts.pop(project.id).items():
+            self._status_counts[status_value] -= count
+        del self._projects[project.id]
+        del self._projects_by_name[project.name]
+        self._project_text.remove(project.id)
+
+    def _row_of(self, task_id: int) -> int:
+        row = bisect_left(self._ids, task_id)
+        if row == len(self._ids) or self._ids[row] != task_id or self._statuses[row] == DELETED:
+            raise TaskNotFoundError(f"تسک با شناسه {task_id} یافت نشد")
+        return row
+
+    def _live_rows(self, rows) -> Iterator[int]:
+        statuses = self._statuses
+        return (row for row in rows if statuses[row] != DELETED)
+
+    def read_view(self):
+        # ردیف‌ها درجا در ستون‌ها تغییر می‌کنند و نسخه قبلی‌شان نگه داشته نمی‌شود
+        raise UnsupportedOperationError("ColumnarMemoryStorage از نمای فقط‌خواندنی پشتیبانی نمی‌کند")
+
+    @property
+    @reads
+    def tasks(self) -> List[TaskView]:
+        return [TaskView(self, row) for row in self._live_rows(range(len(self._ids)))]
+
+    # Task Methods
+    @writes
+    def create_task(self, task: Task, project_id: int) -> TaskView:
+        return self.create_tasks(project_id, [task])[0]
+
+    def _check_task_limit(self, project_id: int, new_tasks: int):
+        if self._projects[project_id].task_count + new_tasks > settings.MAX_NUMBER_OF_TASKS_PER_PROJECT:
+            raise LimitExceededError(f"تعداد تسک‌های هر پروژه نمی‌تواند بیشتر از {settings.MAX_NUMBER_OF_TASKS_PER_PROJECT} باشد")
+
+    @writes
+    def create_tasks(self, project_id: int, tasks: Iterable[Task]) -> List[TaskView]:
+        self.get_project(project_id)
+        tasks = list(tasks)
+        self._check_task_limit(project_id, len(tasks))
+        views = [self._append_row(task, project_id) for task in tasks]
+        self._count_tasks(project_id, len(views))
+        return views
+
+    def _append_row(self, task: Task, project_id: int) -> TaskView:
+        task.id = self.next_task_id
+        task.project_id = project_id
+        self.next_task_id += 1
+
+        row = len(self._ids)
+        self._ids.append(task.id)
+        self._project_ids.append(project_id)
+        self._statuses.append(STATUS_CODES[task.status.value])
+        self._deadlines.append(datetime_to_micros(task.deadline))
+        self._created.append(datetime_to_micros(task.created_at))
+        self._updated.append(datetime_to_micros(task.updated_at))
+        self._titles.append(self._strings.intern(task.title))
+        self._descriptions.append(self._strings.intern(task.description))
+        self._project_rows[project_id].append(row)
+        self._count_status(project_id, task.status.value, 1)
+        self._index_text(row)
+        self._index_deadline(row)
+        return TaskView(self, row)
+
+    # ایندکس متنی: تا وقتی ساخته نشده، تغییر ردیف‌ها هزینه‌ای برایش ندارد
+    def _index_text(self, row: int):
+        if self._task_text_ready:
+            strings = self._strings.strings
+            self._task_text.index(self._ids[row], strings[self._titles[row]], strings[self._descriptions[row]])
+
+    def _unindex_text(self, row: int):
+        if self._task_text_ready:
+            self._task_text.remove(self._ids[row])
+
+    # ایندکس ددلاین‌های باز: هر تغییر وضعیت یا ددلاین ردیف از این دو متد می‌گذرد
+    def _index_deadline(self, row: int):
+        deadline = self._deadlines[row]
+        if deadline != NO_DEADLINE and self._statuses[row] not in (DONE_CODE, DELETED):
+            self._open_deadlines.add((deadline, row))
+
+    def _unindex_deadline(self, row: int):
+        deadline = self._deadlines[row]
+        if deadline != NO_DEADLINE and self._statuses[row] not in (DONE_CODE, DELETED):
+            self._open_deadlines.remove((deadline, row))
+
+    @reads
+    def get_task(self, task_id: int) -> TaskView:
+        return TaskView(self, self._row_of(task_id))
+
+    @reads
+    def get_project_tasks(self, project_id: int) -> List[TaskView]:
+        self.get_project(project_id)  # Validate project exists
+        return [TaskView(self, row) for row in self._live_rows(self._project_rows[project_id])]
+
+    @reads
+    def iter_project_tasks(self, project_id: int) -> Iterator[TaskView]:
+        return iter(self.get_project_tasks(project_id))
+
+    @writes
+    def update_task(self, task_id: int, **kwargs) -> TaskView:
+        return self.update_tasks({task_id: kwargs})[0]
+
+    @writes
+    def update_tasks(self, updates: Dict[int, dict]) -> List[TaskView]:
+        # برخلاف Task.update همه ورودی‌ها قبل از اعمال بررسی می‌شوند
+        changes = [(self._row_of(task_id), self._validate_update(**kwargs)) for task_id, kwargs in updates.items()]
+        return [self._apply_update(row, *values) for row, values in changes]
+
+    def _validate_update(self, title: str = None, description: str = None,
+                         status: str = None, deadline: datetime = None) -> tuple:
+        if title is not None:
+            Task._validate_title(title)
+        if description is not None:
+            Task._validate_description(description)
+        status_code = self._status_code(status) if status is not None else None
+        if deadline is not None and deadline < datetime.now():
+            raise ValidationError("ددلاین نمی‌تواند در گذشته باشد")
+        return title, description, status_code, deadline
+
+    def _apply_update(self, row: int, title: Optional[str], description: Optional[str],
+                      status_code: Optional[int], deadline: Optional[datetime]) -> TaskView:
+        if title is not None:
+            self._titles[row] = self._strings.intern(title)
+        if description is not None:
+            self._descriptions[row] = self._strings.intern(description)
+        if status_code is not None:
+            self._set_status(row, status_code)
+        if deadline is not None:
+            self._unindex_deadline(row)
+            self._deadlines[row] = datetime_to_micros(deadline)
+            self._index_deadline(row)
+        self._updated[row] = datetime_to_micros(datetime.now())
+        if title is not None or description is not None:
+            self._index_text(row)
+        return TaskView(self, row)
+
+    @writes
+    def delete_task(self, task_id: int) -> bool:
+        self.delete_tasks([task_id])
+        return True
+
+    @writes
+    def delete_tasks(self, task_ids: Iterable[int]) -> int:
+        rows = {self._row_of(task_id) for task_id in task_ids}
+        for row in rows:
+            self._count_status(self._project_ids[row], STATUSES[self._statuses[row]].value, -1)
+            self._count_tasks(self._project_ids[row], -1)
+            self._unindex_text(row)
+            self._unindex_deadline(row)
+            self._statuses[row] = DELETED
+        return len(rows)
+
+    @writes
+    def change_task_status(self, task_id: int, status: str) -> TaskView:
+        return self.change_status_many([task_id], status)[0]
+
+    @writes
+    def change_status_many(self, task_ids: Iterable[int], status: str) -> List[TaskView]:
+        rows = list(dict.fromkeys(self._row_of(task_id) for task_id in task_ids))
+        status_code = self._status_code(status)
+        now = datetime_to_micros(datetime.now())
+        for row in rows:
+            self._set_status(row, status_code)
+            self._updated[row] = now
+        return [TaskView(self, row) for row in rows]
+
+    @staticmethod
+    def _status_code(status: str) -> int:
+        try:
+            return STATUS_CODES[status]
+        except KeyError:
+            raise ValidationError(f"وضعیت باید یکی از موارد باشد: {', '.join([s.value for s in TaskStatus])}")
+
+    def _set_status(self, row: int, status_code: int):
+        old_code = self._statuses[row]
+        if old_code != status_code:
+            project_id = self._project_ids[row]
+            self._count_status(project_id, STATUSES[old_code].value, -1)
+            self._count_status(project_id, STATUSES[status_code].value, 1)
+            if DONE_CODE in (old_code, status_code):
+                self._unindex_deadline(row)
+                self._statuses[row] = status_code
+                self._index_deadline(row)
+            else:
+                self._statuses[row] = status_code
+
+    # Search
+    def search_tasks(self, text: str, prefix: bool = False, limit: int = None) -> List[TaskView]:
+        """مانند MemoryStorage.search_tasks؛ اولین فراخوانی ایندکس متنی را می‌سازد"""
+        if not self._task_text_ready:
+            self._build_task_text()
+        return super().search_tasks(text, prefix, limit)
+
+    @writes
+    def _build_task_text(self):
+        if not self._task_text_ready:
+            self._task_text_ready = True
+            for row in self._live_rows(range(len(self._ids))):
+                self._index_text(row)
+
+    # Vectorized scans
+    @reads
+    def count_tasks(self, status: str = None) -> int:
+        """شمارش با اسکن ستون وضعیت در C (bytearray.count)، بدون ساختن شیء"""
+        if status is None:
+            return len(self._statuses) - self._statuses.count(DELETED)
+        return self._statuses.count(self._status_code(status))
+
+    def _rows_with_status(self, code: int) -> Iterator[int]:
+        statuses = self._statuses
+        row = statuses.find(code)
+        while row != -1:
+            yield row
+            row = statuses.find(code, row + 1)
+
+    def _query_plan(self, status: Optional[str], project_id: Optional[int], due_before: Optional[datetime],
+                    order_by: str) -> Tuple[Iterator[TaskView], Optional[Callable]]:
+        """
+        همان برنامه query در MemoryStorage، با اسکن ستون‌ها به‌جای ایندکس‌های ثانویه
+
+        ردیف‌های هم‌وضعیت با bytearray.find پیدا می‌شوند و ددلاین مستقیماً
+        از ستون int64 مقایسه می‌شود.
+        """
+        if order_by not in ('created_at', 'deadline'):
+            raise ValidationError("مرتب‌سازی باید بر اساس created_at یا deadline باشد")
+        code = self._status_code(status) if status is not None else None
+
+        if project_id is not None:
+            self.get_project(project_id)  # Validate project exists
+            rows = self._live_rows(self._project_rows[project_id])
+            if code is not None:
+                statuses = self._statuses
+                rows = (row for row in rows if statuses[row] == code)
+        elif code is not None:
+            rows = self._rows_with_status(code)
+        else:
+            rows = self._live_rows(range(len(self._ids)))
+
+        deadlines = self._deadlines
+        no_deadline = datetime_to_micros(None)
+        if due_before is not None:
+            bound = datetime_to_micros(due_before)
+            rows = (row for row in rows if no_deadline != deadlines[row] < bound)
+
+        views = (TaskView(self, row) for row in rows)
+        # ردیف‌ها به ترتیب ایجاد پیمایش می‌شوند
+        if order_by == 'created_at':
+            return views, None
+        return views, lambda view: (deadlines[view._row] == no_deadline, deadlines[view._row], view._row)
+
+    def _open_rows_due(self, low: int, high: int) -> List[int]:
+        # ردیف‌های زنده و غیر done با low <= ددلاین < high، مرتب بر اساس ددلاین؛
+        # هزینه فقط به تعداد ردیف‌های منطبق بستگی دارد، نه به کل ستون
+        return [row for _, row in self._open_deadlines.irange((low,), (high,))]
+
+    @writes
+    def pop_overdue(self, now: datetime = None) -> List[TaskView]:
+        """مانند MemoryStorage.pop_overdue، با ایندکس مرتب (ددلاین، ردیف) ردیف‌های باز"""
+        now = now or datetime.now()
+        rows = self._open_rows_due(NO_DEADLINE + 1, datetime_to_micros(now))
+        updated_at = datetime_to_micros(now)
+        for row in rows:
+            self._set_status(row, DONE_CODE)
+            self._updated[row] = updated_at
+        return [TaskView(self, row) for row in rows]
+
+    @reads
+    def upcoming(self, window: timedelta, now: datetime = None) -> List[TaskView]:
+        now = now or datetime.now()
+        rows = self._open_rows_due(datetime_to_micros(now), datetime_to_micros(now + window))
+        return [TaskView(self, row) for row in rows]
+
+    @writes
+    def compact(self):
+        """ردیف‌های حذف‌شده را پاک می‌کند؛ TaskViewهای قبلی نامعتبر می‌شوند"""
+        keep = list(self._live_rows(range(len(self._ids))))
+        for name in ('_ids', '_project_ids', '_deadlines', '_created', '_updated', '_titles', '_descriptions'):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, [column[row] for row in keep]))
+        self._statuses = bytearray(self._statuses[row] for row in keep)
+
+        self._project_rows = {project_id: array('I') for project_id in self._projects}
+        for row, project_id in enumerate(self._project_ids):
+            self._project_rows[project_id].append(row)
+        # شماره ردیف‌ها عوض شده است
+        self._open_deadlines.clear()
+        for row in range(len(self._ids)):
+            self._index_deadline(row)
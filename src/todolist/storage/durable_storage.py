@@ -0,0 +1,444 @@
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from core.project import Project
+from core.task import Task, TaskStatus
+from core.timestamps import NO_TIMESTAMP, datetime_to_micros
+from config.settings import settings
+from storage.binary_snapshot import BinarySnapshot, write_snapshot
+from storage.journal import Journal
+from storage.locks import writes
+from storage.read_view import ReadView
+from storage.memory_storage import MemoryStorage
+
+SNAPSHOT_FILE = 'snapshot.bin'
+
+_STATUSES = {status.value: status for status in TaskStatus}
+
+# تبدیل موجودیت‌ها به ردیف‌های فشرده برای ژورنال و snapshot.
+# بازسازی از ردیف بدون اعتبارسنجی انجام می‌شود، چون داده قبلاً معتبر بوده
+# (مثلاً ددلاینی که حالا گذشته است نباید بازیابی را متوقف کند).
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+def _from_iso(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+def project_to_row(project: Project) -> list:
+    return [project.id, project.name, project.description,
+            _iso(project.created_at), _iso(project.updated_at)]
+
+def restore_project(project: Project, row: list) -> Project:
+    project.id, project.name, project.description = row[0], row[1], row[2]
+    project.created_at = _from_iso(row[3])
+    project.updated_at = _from_iso(row[4])
+    return project
+
+def project_from_row(row: list) -> Project:
+    project = Project.__new__(Project)
+    project.task_count = 0
+    return restore_project(project, row)
+
+def task_to_row(task: Task) -> list:
+    return [task.id, task.project_id, task.title, task.description, task.status.value,
+            _iso(task.deadline), _iso(task.created_at), _iso(task.updated_at)]
+
+def restore_task(task: Task, row: list) -> Task:
+    task.id, task.project_id, task.title, task.description = row[0], row[1], row[2], row[3]
+    task.status = _STATUSES[row[4]]
+    task.deadline = _from_iso(row[5])
+    task.created_at = _from_iso(row[6])
+    task.updated_at = _from_iso(row[7])
+    return task
+
+def task_from_row(row: list) -> Task:
+    return restore_task(Task.__new__(Task), row)
+
+class _LazyProjectTasks(dict):
+    """project_id -> تسک‌ها؛ تسک‌های پروژه‌ای که هنوز از snapshot خوانده نشده در اولین دسترسی ساخته می‌شوند"""
+
+    def __init__(self, storage: 'DurableMemoryStorage'):
+        super().__init__()
+        self._storage = storage
+
+    def __missing__(self, project_id: int) -> Dict[int, Task]:
+        return self._storage._fault_in_project(project_id)
+
+class _LazyTasks(dict):
+    """task_id -> تسک؛ جستجوی تسکی که هنوز ساخته نشده پروژه آن را از snapshot بار می‌کند"""
+
+    def __init__(self, storage: 'DurableMemoryStorage'):
+        super().__init__()
+        self._storage = storage
+
+    def get(self, task_id: int, default=None):
+        task = dict.get(self, task_id)
+        if task is None and self._storage._fault_in_task(task_id):
+            task = dict.get(self, task_id)
+        return default if task is None else task
+
+    def __missing__(self, task_id: int) -> Task:
+        if self._storage._fault_in_task(task_id):
+            return dict.__getitem__(self, task_id)
+        raise KeyError(task_id)
+
+class DurableMemoryStorage(MemoryStorage):
+    """
+    MemoryStorage با ژورنال فقط-افزودنی و snapshot دوره‌ای
+
+    هر تغییر پس از اعمال در حافظه در ژورنال نسل جاری نوشته می‌شود. پس از
+    snapshot_every رکورد، کل وضعیت در یک snapshot فشرده ذخیره و ژورنال نسل
+    بعد شروع می‌شود. هنگام راه‌اندازی snapshot و سپس دنباله ژورنال اجرا می‌شود.
+
+    snapshot با mmap باز می‌شود: پروژه‌ها و شمارنده‌ها فوراً خوانده می‌شوند ولی
+    تسک‌های هر پروژه تا اولین دسترسی به آن پروژه ساخته نمی‌شوند. ساختن تسک‌ها
+    ایندکس‌ها را تغییر می‌دهد، پس متدهای خواندن اول قفل نوشتن را برای ساختن
+    پروژه‌های لازم می‌گیرند و بعد زیر قفل خواندن اجرا می‌شوند.
+    """
+
+    def __init__(self, data_dir: str, thread_safe: bool = False, snapshot_every: int = None,
+                 group_size: int = 128, commit_interval: float = 0.01):
+        super().__init__(thread_safe)
+        self.data_dir = data_dir
+        self.snapshot_every = settings.STORAGE_SNAPSHOT_EVERY if snapshot_every is None else snapshot_every
+        self._group_size = group_size
+        self._commit_interval = commit_interval
+        self._generation = 0
+        self._journal_records = 0
+        self._snapshot: Optional[BinarySnapshot] = None
+        # پروژه‌هایی که تسک‌هایشان هنوز در snapshot مانده: project_id -> بازه ایندکس
+        self._unloaded_projects: Dict[int, Tuple[int, int]] = {}
+        os.makedirs(data_dir, exist_ok=True)
+        self._recover()
+        self._journal = Journal(self._journal_path(self._generation), group_size, commit_interval)
+
+    def _journal_path(self, generation: int) -> str:
+        return os.path.join(self.data_dir, f'journal.{generation:08d}.log')
+
+    # Recovery
+    def _recover(self):
+        snapshot_path = os.path.join(self.data_dir, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            self._open_snapshot(snapshot_path)
+
+        for op, row in Journal.replay(self._journal_path(self._generation)):
+            getattr(self, f'_replay_{op}')(row)
+            self._journal_records += 1
+
+        # ژورنال‌های نسل قبل که snapshot جایگزینشان شده ولی حذف نشده‌اند
+        for name in os.listdir(self.data_dir):
+            if name.startswith('journal.') and name != os.path.basename(self._journal_path(self._generation)):
+                os.remove(os.path.join(self.data_dir, name))
+
+    def _open_snapshot(self, path: str):
+        snapshot = self._snapshot = BinarySnapshot(path)
+        self._generation = snapshot.generation
+        self.next_project_id = snapshot.next_project_id
+        self.next_task_id = snapshot.next_task_id
+        self._tasks = _LazyTasks(self)
+        self._project_tasks = _LazyProjectTasks(self)
+
+        for project, counts, index_range in snapshot.iter_projects():
+            self._projects[project.id] = project
+            self._projects_by_name[project.name] = project
+            self._project_status_counts[project.id] = counts
+            self._project_text.index(project.id, project.name, project.description)
+            self._unloaded_projects[project.id] = index_range
+        self._status_counts.update(snapshot.status_counts())
+
+    # Lazy materialization
+    # ساختن پروژه ایندکس‌ها را تغییر می‌دهد و فقط زیر قفل نوشتن انجام می‌شود. متدهای
+    # خواندن قبل از گرفتن قفل خواندن، پروژه‌های لازم را با متدهای @writes زیر می‌سازند
+    # (مثل get_task در TieredMemoryStorage)؛ پروژه ساخته‌شده به snapshot برنمی‌گردد،
+    # پس تا اجرای خود متد خواندن ساخته‌شده می‌ماند.
+    def _fault_in_project(self, project_id: int) -> Dict[int, Task]:
+        if dict.__contains__(self._project_tasks, project_id):
+            return dict.__getitem__(self._project_tasks, project_id)
+        if project_id not in self._unloaded_projects:
+            raise KeyError(project_id)
+
+        project_tasks = {}
+        for record in self._snapshot.project_task_records(self._unloaded_projects[project_id]):
+            task = self._snapshot.load_task(record)
+            dict.__setitem__(self._tasks, task.id, task)
+            project_tasks[task.id] = task
+            self._index_secondary(task)
+        dict.__setitem__(self._project_tasks, project_id, project_tasks)
+        del self._unloaded_projects[project_id]
+        return project_tasks
+
+    def _fault_in_task(self, task_id: int) -> bool:
+        if not self._unloaded_projects:
+            return False
+        record = self._snapshot.find_task(task_id)
+        if record is None:
+            return False
+        project_id = self._snapshot.task_project_id_at(record)
+        if project_id not in self._unloaded_projects:
+            return False
+        self._fault_in_project(project_id)
+        return True
+
+    @writes
+    def _fault_in_tasks(self, task_ids: Iterable[int]):
+        for task_id in task_ids:
+            self._fault_in_task(task_id)
+
+    @writes
+    def _fault_in_projects(self, project_ids: Iterable[int]):
+        for project_id in project_ids:
+            if project_id in self._unloaded_projects:
+                self._fault_in_project(project_id)
+
+    @writes
+    def _fault_in_all(self):
+        for project_id in list(self._unloaded_projects):
+            self._fault_in_project(project_id)
+
+    @writes
+    def _fault_in_due(self, low: int, high: int):
+        """
+        فقط پروژه‌هایی که تسک باز با ددلاین در [low, high) در snapshot دارند ساخته می‌شوند
+
+        پس از آن ایندکس ددلاین‌های باز برای این بازه کامل است؛ بقیه پروژه‌ها
+        همچنان در snapshot می‌مانند.
+        """
+        if not self._unloaded_projects:
+            return
+        for record in self._snapshot.open_records_due(low, high):
+            project_id = self._snapshot.task_project_id_at(record)
+            if project_id in self._unloaded_projects:
+                self._fault_in_project(project_id)
+
+    def _unindex_project(self, project: Project):
+        if self._unloaded_projects.pop(project.id, None) is not None:
+            # تسک‌های پروژه هرگز ساخته نشده‌اند؛ حذف آبشاری بدون بارگذاری آن‌ها
+            dict.__setitem__(self._project_tasks, project.id, {})
+        super()._unindex_project(project)
+
+    def _materialize_all(self):
+        if self._unloaded_projects:
+            self._fault_in_all()
+
+    # Reads: پروژه‌های لازم قبل از قفل خواندن ساخته می‌شوند
+    def read_view(self) -> ReadView:
+        # تاریخچه نما فقط اشیای ساخته‌شده را نگه می‌دارد (مثلاً حذف پروژه ساخته‌نشده
+        # تاریخچه ندارد)، پس همه تسک‌ها پیش از ساخت نما ساخته می‌شوند
+        self._materialize_all()
+        return super().read_view()
+
+    @property
+    def tasks(self) -> List[Task]:
+        self._materialize_all()
+        return super().tasks
+
+    def get_task(self, task_id: int) -> Task:
+        if self._unloaded_projects and not dict.__contains__(self._tasks, task_id):
+            self._fault_in_tasks([task_id])
+        return super().get_task(task_id)
+
+    def get_project_tasks(self, project_id: int) -> List[Task]:
+        if project_id in self._unloaded_projects:
+            self._fault_in_projects([project_id])
+        return super().get_project_tasks(project_id)
+
+    def iter_project_tasks(self, project_id: int) -> Iterator[Task]:
+        if project_id in self._unloaded_projects:
+            self._fault_in_projects([project_id])
+        return super().iter_project_tasks(project_id)
+
+    def query(self, *args, **kwargs) -> List[Task]:
+        # ایندکس‌های وضعیت و ددلاین فقط تسک‌های ساخته‌شده را می‌شناسند
+        self._materialize_all()
+        return super().query(*args, **kwargs)
+
+    def search_tasks(self, *args, **kwargs) -> List[Task]:
+        self._materialize_all()
+        return super().search_tasks(*args, **kwargs)
+
+    def upcoming(self, window: timedelta, now: datetime = None) -> List[Task]:
+        now = now or datetime.now()
+        if self._unloaded_projects:
+            self._fault_in_due(datetime_to_micros(now), datetime_to_micros(now + window))
+        return super().upcoming(window, now)
+
+    def _replay_create_project(self, row: list):
+        self._index_project(project_from_row(row))
+        self.next_project_id = max(self.next_project_id, row[0] + 1)
+
+    def _replay_update_project(self, row: list):
+        project = self._projects[row[0]]
+        old_name = project.name
+        restore_project(project, row)
+        self._reindex_project(project, old_name)
+
+    def _replay_delete_project(self, project_id: int):
+        self._unindex_project(self._projects[project_id])
+
+    def _replay_create_task(self, row: list):
+        task = task_from_row(row)
+        self._index_task(task)
+        self._count_tasks(task.project_id, 1)
+        self.next_task_id = max(self.next_task_id, row[0] + 1)
+
+    def _replay_update_task(self, row: list):
+        task = self._tasks[row[0]]
+        old_status, old_deadline = task.status.value, task.deadline
+        restore_task(task, row)
+        self._reindex_task(task, old_status, old_deadline)
+
+    def _replay_delete_task(self, task_id: int):
+        self._unindex_task(self._tasks[task_id])
+
+    # عملیات دسته‌ای هر کدام یک رکورد ژورنال می‌شوند
+    def _replay_create_tasks(self, rows: list):
+        for row in rows:
+            self._replay_create_task(row)
+
+    def _replay_update_tasks(self, rows: list):
+        for row in rows:
+            self._replay_update_task(row)
+
+    def _replay_delete_tasks(self, task_ids: list):
+        for task_id in task_ids:
+            self._replay_delete_task(task_id)
+
+    # Journaling
+    def _log(self, op: str, row):
+        self._journal.append([op, row])
+        self._journal_records += 1
+        if self.snapshot_every and self._journal_records >= self.snapshot_every:
+            self.snapshot()
+
+    @writes
+    def create_project(self, project: Project) -> Project:
+        project = super().create_project(project)
+        self._log('create_project', project_to_row(project))
+        return project
+
+    @writes
+    def update_project(self, project_id: int, name: str = None, description: str = None) -> Project:
+        try:
+            return super().update_project(project_id, name, description)
+        finally:
+            # به‌روزرسانی نیمه‌کاره هم باید ثبت شود تا بازیابی با حافظه یکی باشد
+            if project_id in self._projects:
+                self._log('update_project', project_to_row(self._projects[project_id]))
+
+    @writes
+    def delete_project(self, project_id: int) -> bool:
+        super().delete_project(project_id)
+        self._log('delete_project', project_id)
+        return True
+
+    @writes
+    def create_task(self, task: Task, project_id: int) -> Task:
+        task = super().create_task(task, project_id)
+        self._log('create_task', task_to_row(task))
+        return task
+
+    @writes
+    def update_task(self, task_id: int, **kwargs) -> Task:
+        try:
+            return super().update_task(task_id, **kwargs)
+        finally:
+            if task_id in self._tasks:
+                self._log('update_task', task_to_row(self._tasks[task_id]))
+
+    @writes
+    def delete_task(self, task_id: int) -> bool:
+        super().delete_task(task_id)
+        self._log('delete_task', task_id)
+        return True
+
+    @writes
+    def change_task_status(self, task_id: int, status: str) -> Task:
+        task = super().change_task_status(task_id, status)
+        self._log('update_task', task_to_row(task))
+        return task
+
+    @writes
+    def create_tasks(self, project_id: int, tasks: Iterable[Task]) -> List[Task]:
+        tasks = super().create_tasks(project_id, tasks)
+        self._log('create_tasks', [task_to_row(task) for task in tasks])
+        return tasks
+
+    @writes
+    def update_tasks(self, updates: Dict[int, dict]) -> List[Task]:
+        tasks = super().update_tasks(updates)
+        self._log('update_tasks', [task_to_row(task) for task in tasks])
+        return tasks
+
+    @writes
+    def delete_tasks(self, task_ids: Iterable[int]) -> int:
+        task_ids = list(dict.fromkeys(task_ids))
+        deleted = super().delete_tasks(task_ids)
+        self._log('delete_tasks', task_ids)
+        return deleted
+
+    @writes
+    def change_status_many(self, task_ids: Iterable[int], status: str) -> List[Task]:
+        tasks = super().change_status_many(task_ids, status)
+        self._log('update_tasks', [task_to_row(task) for task in tasks])
+        return tasks
+
+    @writes
+    def pop_overdue(self, now: datetime = None) -> List[Task]:
+        now = now or datetime.now()
+        self._fault_in_due(NO_TIMESTAMP + 1, datetime_to_micros(now))
+        tasks = super().pop_overdue(now)
+        if tasks:
+            self._log('update_tasks', [task_to_row(task) for task in tasks])
+        return tasks
+
+    # Snapshots
+    @writes
+    def snapshot(self):
+        """وضعیت کامل را در snapshot می‌نویسد و ژورنال نسل بعد را شروع می‌کند"""
+        self._journal.sync()
+        self._fault_in_all()
+        generation = self._generation + 1
+
+        snapshot_path = os.path.join(self.data_dir, SNAPSHOT_FILE)
+        tmp_path = snapshot_path + '.tmp'
+        write_snapshot(tmp_path, generation, self.next_project_id, self.next_task_id,
+                       self._projects.values(), self._project_tasks, self._project_status_counts)
+        os.replace(tmp_path, snapshot_path)
+        self._fsync_data_dir()
+        if self._snapshot is not None:
+            # همه تسک‌ها ساخته شده‌اند، پس mapping قبلی دیگر لازم نیست
+            self._snapshot.close()
+            self._snapshot = None
+
+        old_journal = self._journal
+        self._generation = generation
+        self._journal = Journal(self._journal_path(generation), self._group_size, self._commit_interval)
+        self._journal_records = 0
+        old_journal.close()
+        os.remove(old_journal.path)
+
+    def _fsync_data_dir(self):
+        fd = os.open(self.data_dir, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def sync(self):
+        """رکوردهای در انتظار commit را فوراً روی دیسک می‌نویسد"""
+        with self._lock.write_locked():
+            self._journal.sync()
+
+    def close(self):
+        with self._lock.write_locked():
+            self._journal.close()
+            if self._snapshot is not None:
+                self._snapshot.close()
+                self._snapshot = None
+                self._unloaded_projects.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
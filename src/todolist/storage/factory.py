@@ -0,0 +1,17 @@
+from config.settings import settings
+
+def create_storage():
+    """
+    ذخیره‌ساز انتخاب‌شده در تنظیمات را می‌سازد
+
+    فقط ماژول همان backend import می‌شود؛ CLI پیش‌فرض (MemoryStorage)
+    هزینه import کردن mmap، sqlite3 و ژورنال را نمی‌پردازد.
+    """
+    if settings.STORAGE_DATA_DIR:
+        from storage.durable_storage import DurableMemoryStorage
+        return DurableMemoryStorage(settings.STORAGE_DATA_DIR)
+    if settings.STORAGE_TIERED:
+        from storage.tiered_storage import TieredMemoryStorage
+        return TieredMemoryStorage()
+    from storage.memory_storage import MemoryStorage
+    return MemoryStorage()
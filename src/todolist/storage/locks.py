@@ -0,0 +1,112 @@
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+class ReadWriteLock:
+    """
+    قفل خواندن/نوشتن با اولویت نویسنده
+
+    چند خواننده هم‌زمان وارد می‌شوند و نویسنده به‌تنهایی. قفل برای هر نخ
+    بازگشتی است: نخی که قفل نوشتن را دارد می‌تواند دوباره بخواند یا بنویسد.
+    ارتقای قفل خواندن به نوشتن پشتیبانی نمی‌شود.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._waiting_writers = 0
+        self._writer = None
+        self._write_depth = 0
+        self._local = threading.local()
+
+    def _read_holds(self) -> list:
+        holds = getattr(self._local, 'holds', None)
+        if holds is None:
+            holds = self._local.holds = []
+        return holds
+
+    def acquire_read(self):
+        holds = self._read_holds()
+        if holds or self._writer == threading.get_ident():
+            # خواندن تودرتو: قفل از قبل در اختیار همین نخ است
+            holds.append(False)
+            return
+        with self._cond:
+            while self._writer is not None or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        holds.append(True)
+
+    def release_read(self):
+        if not self._read_holds().pop():
+            return
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return
+        with self._cond:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        self._write_depth -= 1
+        if self._write_depth:
+            return
+        with self._cond:
+            self._writer = None
+            self._cond.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+class NullLock:
+    """قفل بدون اثر برای حالت تک‌نخی"""
+
+    @contextmanager
+    def read_locked(self):
+        yield
+
+    @contextmanager
+    def write_locked(self):
+        yield
+
+def reads(method):
+    """متد را زیر قفل خواندن مخزن اجرا می‌کند"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.read_locked():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def writes(method):
+    """متد را زیر قفل نوشتن مخزن اجرا می‌کند"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.write_locked():
+            return method(self, *args, **kwargs)
+    return wrapper
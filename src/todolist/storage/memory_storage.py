@@ -1,5 +1,9 @@
-from typing import List, Optional
-from datetime import datetime
+import copy
+import heapq
+import threading
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta
 from core.project import Project
 from core.task import Task, TaskStatus
 from core.exceptions import (
@@ -7,109 +11,578 @@ from core.exceptions import (
     LimitExceededError, ValidationError
 )
 from config.settings import settings
+from storage.locks import NullLock, ReadWriteLock, reads, writes
+from storage.sorted_index import SortedIndex
+from storage.text_index import InvertedIndex
+
+if TYPE_CHECKING:
+    # فقط برای annotationها؛ این ماژول‌ها در اولین استفاده import می‌شوند تا شروع CLI سبک بماند
+    from core.validation import ValidationReport
+    from storage.read_view import ReadView
 
 class MemoryStorage:
-    def __init__(self):
-        self.projects: List[Project] = []
-        self.tasks: List[Task] = []
+    def __init__(self, thread_safe: bool = False):
+        # در حالت thread_safe خواندن‌ها هم‌زمان و نوشتن‌ها اتمیک اجرا می‌شوند
+        self.thread_safe = thread_safe
+        self._lock = ReadWriteLock() if thread_safe else NullLock()
+        # ایندکس‌ها: شناسه -> شیء، نام -> پروژه، پروژه -> تسک‌ها
+        # دیکشنری‌ها ترتیب درج (یعنی ترتیب ایجاد) را حفظ می‌کنند
+        self._projects: Dict[int, Project] = {}
+        self._tasks: Dict[int, Task] = {}
+        self._projects_by_name: Dict[str, Project] = {}
+        self._project_tasks: Dict[int, Dict[int, Task]] = {}
+        # شمارنده‌های وضعیت که با هر تغییر به‌روز می‌شوند
+        self._status_counts: Dict[str, int] = self._empty_status_counts()
+        self._project_status_counts: Dict[int, Dict[str, int]] = {}
+        # ایندکس‌های ثانویه برای query: وضعیت -> تسک‌ها و (ددلاین، شناسه) مرتب
+        self._status_index: Dict[str, Dict[int, Task]] = {status.value: {} for status in TaskStatus}
+        self._deadline_index = SortedIndex()
+        # ددلاین تسک‌های باز (غیر done) برای pop_overdue و upcoming
+        self._open_deadlines = SortedIndex()
+        # ایندکس متنی روی عنوان/توضیحات تسک‌ها و نام/توضیحات پروژه‌ها
+        self._task_text = InvertedIndex()
+        self._project_text = InvertedIndex()
+        # نماهای فقط‌خواندنی: نسخه فعلی، تعداد نماهای باز و نسخه‌های قبلی اشیا
+        self._version = 0
+        self._open_views = 0
+        self._view_lock = threading.Lock()
+        self._reset_history()
         self.next_project_id = 1
         self.next_task_id = 1
     
+    def close(self):
+        """منابع مخزن را آزاد می‌کند؛ مخزن حافظه‌ای منبعی ندارد"""
+        pass
+    
+    @staticmethod
+    def _empty_status_counts() -> Dict[str, int]:
+        return {status.value: 0 for status in TaskStatus}
+    
+    def _count_status(self, project_id: int, status_value: str, delta: int):
+        self._status_counts[status_value] += delta
+        self._project_status_counts[project_id][status_value] += delta
+    
+    def _count_tasks(self, project_id: int, delta: int):
+        """شمارنده زنده Project.task_count؛ با نمای باز روی کپی پروژه اعمال می‌شود"""
+        project = self._writable_project(self._projects[project_id])
+        project.task_count += delta
+    
+    # Read views (copy-on-write)
+    @reads
+    def read_view(self) -> 'ReadView':
+        """
+        نمای ثابت و سازگار از وضعیت فعلی مخزن، بدون کپی کردن داده‌ها
+
+        تا بسته شدن نما، تغییرات بعدی روی کپی اشیا انجام می‌شود و نما
+        همچنان نسخه لحظه ساخت را می‌بیند.
+        """
+        from storage.read_view import ReadView
+        with self._view_lock:
+            view = ReadView(self, self._version)
+            self._version += 1
+            self._open_views += 1
+        return view
+    
+    def _close_view(self):
+        with self._view_lock:
+            self._open_views -= 1
+            if not self._open_views:
+                self._reset_history()
+    
+    def _reset_history(self):
+        # شناسه -> [(نسخه‌ای که در آن جایگزین شد، شیء قبلی)]
+        self._task_history: Dict[int, list] = {}
+        self._project_history: Dict[int, list] = {}
+        # شناسه اشیای حذف‌شده تا نماهای باز هنوز آن‌ها را پیدا کنند
+        self._deleted_tasks: Dict[int, List[int]] = {}
+        self._deleted_projects: List[int] = []
+    
+    def _record_history(self, history: Dict[int, list], key: int, obj) -> bool:
+        """نسخه فعلی obj را برای نماهای باز نگه می‌دارد؛ اگر لازم نباشد False"""
+        if not self._open_views:
+            return False
+        versions = history.setdefault(key, [])
+        if versions and versions[-1][0] == self._version:
+            # در این نسخه قبلاً کپی شده و نمایی شیء فعلی را نمی‌بیند
+            return False
+        versions.append((self._version, obj))
+        return True
+    
+    def _writable_task(self, task: Task) -> Task:
+        """تسکی که می‌توان درجا تغییر داد؛ اگر نمایی آن را می‌بیند، کپی جایگزین آن می‌شود"""
+        if not self._record_history(self._task_history, task.id, task):
+            return task
+        task = copy.copy(task)
+        self._tasks[task.id] = task
+        self._project_tasks[task.project_id][task.id] = task
+        self._status_index[task.status.value][task.id] = task
+        return task
+    
+    def _writable_project(self, project: Project) -> Project:
+        if not self._record_history(self._project_history, project.id, project):
+            return project
+        project = copy.copy(project)
+        self._projects[project.id] = project
+        self._projects_by_name[project.name] = project
+        return project
+    
+    def _live_project_task_ids(self, project_id: int) -> List[int]:
+        return list(self._project_tasks.get(project_id, ()))
+    
+    @property
+    @reads
+    def projects(self) -> List[Project]:
+        return list(self._projects.values())
+    
+    @property
+    @reads
+    def tasks(self) -> List[Task]:
+        return list(self._tasks.values())
+    
     # Project Methods
+    @writes
     def create_project(self, project: Project) -> Project:
-        if len(self.projects) >= settings.MAX_NUMBER_OF_PROJECTS:
+        if len(self._projects) >= settings.MAX_NUMBER_OF_PROJECTS:
             raise LimitExceededError(f"تعداد پروژه‌ها نمی‌تواند بیشتر از {settings.MAX_NUMBER_OF_PROJECTS} باشد")
         
-        if any(p.name == project.name for p in self.projects):
+        if project.name in self._projects_by_name:
             raise DuplicateProjectError(f"پروژه با نام '{project.name}' از قبل وجود دارد")
         
         project.id = self.next_project_id
         self.next_project_id += 1
-        self.projects.append(project)
+        self._index_project(project)
         return project
     
+    def _index_project(self, project: Project):
+        self._projects[project.id] = project
+        self._projects_by_name[project.name] = project
+        self._project_tasks[project.id] = {}
+        self._project_status_counts[project.id] = self._empty_status_counts()
+        self._project_text.index(project.id, project.name, project.description)
+    
+    @reads
     def get_project(self, project_id: int) -> Project:
-        project = next((p for p in self.projects if p.id == project_id), None)
+        project = self._projects.get(project_id)
         if not project:
             raise ProjectNotFoundError(f"پروژه با شناسه {project_id} یافت نشد")
         return project
     
+    @reads
+    def get_project_by_name(self, name: str) -> Project:
+        project = self._projects_by_name.get(name)
+        if not project:
+            raise ProjectNotFoundError(f"پروژه با نام '{name}' یافت نشد")
+        return project
+    
+    @reads
     def get_all_projects(self) -> List[Project]:
-        return sorted(self.projects, key=lambda p: p.created_at)
+        return list(self._projects.values())
     
+    @writes
     def update_project(self, project_id: int, name: str = None, description: str = None) -> Project:
-        project = self.get_project(project_id)
+        project = self._writable_project(self.get_project(project_id))
         
-        if name and any(p.name == name and p.id != project_id for p in self.projects):
+        existing = self._projects_by_name.get(name) if name else None
+        if existing is not None and existing.id != project_id:
             raise DuplicateProjectError(f"پروژه با نام '{name}' از قبل وجود دارد")
         
-        project.update(name, description)
+        old_name = project.name
+        try:
+            project.update(name, description)
+        finally:
+            # نام ممکن است قبل از خطای اعتبارسنجی توضیحات تغییر کرده باشد
+            self._reindex_project(project, old_name)
         return project
     
+    def _reindex_project(self, project: Project, old_name: str):
+        if project.name != old_name:
+            del self._projects_by_name[old_name]
+            self._projects_by_name[project.name] = project
+        self._project_text.index(project.id, project.name, project.description)
+    
+    @writes
     def delete_project(self, project_id: int) -> bool:
-        project = self.get_project(project_id)
-        
+        self._unindex_project(self.get_project(project_id))
+        return True
+    
+    def _unindex_project(self, project: Project):
+        project_id = project.id
+        if self._open_views:
+            self._record_history(self._project_history, project_id, project)
+            self._deleted_projects.append(project_id)
         # Cascade delete tasks
-        project_tasks = [t for t in self.tasks if t.project_id == project_id]
-        for task in project_tasks:
-            self.tasks.remove(task)
+        for task_id, task in self._project_tasks.pop(project_id).items():
+            del self._tasks[task_id]
+            self._unindex_secondary(task)
+            self._retire_task(task)
+        for status_value, count in self._project_status_counts.pop(project_id).items():
+            self._status_counts[status_value] -= count
         
-        self.projects.remove(project)
-        return True
+        del self._projects[project_id]
+        del self._projects_by_name[project.name]
+        self._project_text.remove(project_id)
     
     # Task Methods
+    @writes
     def create_task(self, task: Task, project_id: int) -> Task:
-        project = self.get_project(project_id)
-        
-        project_tasks = [t for t in self.tasks if t.project_id == project_id]
-        if len(project_tasks) >= settings.MAX_NUMBER_OF_TASKS_PER_PROJECT:
+        if self.get_project(project_id).task_count >= settings.MAX_NUMBER_OF_TASKS_PER_PROJECT:
             raise LimitExceededError(f"تعداد تسک‌های هر پروژه نمی‌تواند بیشتر از {settings.MAX_NUMBER_OF_TASKS_PER_PROJECT} باشد")
         
         task.id = self.next_task_id
         task.project_id = project_id
         self.next_task_id += 1
-        self.tasks.append(task)
+        self._index_task(task)
+        self._count_tasks(project_id, 1)
         return task
     
+    def _index_task(self, task: Task):
+        self._tasks[task.id] = task
+        self._project_tasks[task.project_id][task.id] = task
+        self._count_status(task.project_id, task.status.value, 1)
+        self._index_secondary(task)
+    
+    def _index_secondary(self, task: Task):
+        self._status_index[task.status.value][task.id] = task
+        self._task_text.index(task.id, task.title, task.description)
+        if task.deadline:
+            self._deadline_index.add((task.deadline, task.id))
+            if task.status.value != TaskStatus.DONE.value:
+                self._open_deadlines.add((task.deadline, task.id))
+    
+    def _unindex_secondary(self, task: Task):
+        del self._status_index[task.status.value][task.id]
+        self._task_text.remove(task.id)
+        if task.deadline:
+            self._deadline_index.remove((task.deadline, task.id))
+            if task.status.value != TaskStatus.DONE.value:
+                self._open_deadlines.remove((task.deadline, task.id))
+    
+    @reads
     def get_task(self, task_id: int) -> Task:
-        task = next((t for t in self.tasks if t.id == task_id), None)
+        task = self._tasks.get(task_id)
         if not task:
             raise TaskNotFoundError(f"تسک با شناسه {task_id} یافت نشد")
         return task
     
+    @reads
     def get_project_tasks(self, project_id: int) -> List[Task]:
         self.get_project(project_id)  # Validate project exists
-        project_tasks = [t for t in self.tasks if t.project_id == project_id]
-        return sorted(project_tasks, key=lambda t: t.created_at)
+        return list(self._project_tasks[project_id].values())
     
+    @reads
+    def iter_project_tasks(self, project_id: int) -> Iterator[Task]:
+        """تسک‌های پروژه را به ترتیب ایجاد و بدون کپی برمی‌گرداند"""
+        if self.thread_safe:
+            # پیمایش بیرون از قفل انجام می‌شود، پس کپی لازم است
+            return iter(self.get_project_tasks(project_id))
+        self.get_project(project_id)  # Validate project exists
+        return iter(self._project_tasks[project_id].values())
+    
+    @writes
     def update_task(self, task_id: int, **kwargs) -> Task:
-        task = self.get_task(task_id)
-        task.update(**kwargs)
+        task = self._writable_task(self.get_task(task_id))
+        old_status, old_deadline = task.status.value, task.deadline
+        try:
+            task.update(**kwargs)
+        finally:
+            # وضعیت ممکن است قبل از خطای اعتبارسنجی ددلاین تغییر کرده باشد
+            self._reindex_task(task, old_status, old_deadline)
         return task
     
+    @writes
     def delete_task(self, task_id: int) -> bool:
-        task = self.get_task(task_id)
-        self.tasks.remove(task)
+        self._unindex_task(self.get_task(task_id))
         return True
     
+    def _unindex_task(self, task: Task):
+        del self._tasks[task.id]
+        del self._project_tasks[task.project_id][task.id]
+        self._count_status(task.project_id, task.status.value, -1)
+        self._count_tasks(task.project_id, -1)
+        self._unindex_secondary(task)
+        self._retire_task(task)
+    
+    def _retire_task(self, task: Task):
+        if self._open_views:
+            self._record_history(self._task_history, task.id, task)
+            self._deleted_tasks.setdefault(task.project_id, []).append(task.id)
+    
+    @writes
     def change_task_status(self, task_id: int, status: str) -> Task:
-        task = self.get_task(task_id)
+        task = self._writable_task(self.get_task(task_id))
+        old_status = task.status.value
         task.set_status(status)
         task.updated_at = datetime.now()
+        self._reindex_task(task, old_status, task.deadline)
         return task
     
+    def _reindex_task(self, task: Task, old_status: str, old_deadline: Optional[datetime]):
+        """شمارنده‌ها و ایندکس‌های ثانویه را پس از تغییر تسک هماهنگ می‌کند"""
+        new_status = task.status.value
+        self._task_text.index(task.id, task.title, task.description)
+        if new_status != old_status:
+            self._count_status(task.project_id, old_status, -1)
+            self._count_status(task.project_id, new_status, 1)
+            del self._status_index[old_status][task.id]
+            self._status_index[new_status][task.id] = task
+        if task.deadline != old_deadline:
+            if old_deadline:
+                self._deadline_index.remove((old_deadline, task.id))
+            if task.deadline:
+                self._deadline_index.add((task.deadline, task.id))
+        
+        done = TaskStatus.DONE.value
+        was_open = old_deadline is not None and old_status != done
+        is_open = task.deadline is not None and new_status != done
+        if (was_open, old_deadline) != (is_open, task.deadline):
+            if was_open:
+                self._open_deadlines.remove((old_deadline, task.id))
+            if is_open:
+                self._open_deadlines.add((task.deadline, task.id))
+    
+    # Bulk Task Methods - همه یا هیچ: یا کل دسته اعمال می‌شود یا هیچ تغییری نمی‌ماند
+    @writes
+    def create_tasks(self, project_id: int, tasks: Iterable[Task]) -> List[Task]:
+        project = self.get_project(project_id)
+        tasks = list(tasks)
+        
+        if project.task_count + len(tasks) > settings.MAX_NUMBER_OF_TASKS_PER_PROJECT:
+            raise LimitExceededError(f"تعداد تسک‌های هر پروژه نمی‌تواند بیشتر از {settings.MAX_NUMBER_OF_TASKS_PER_PROJECT} باشد")
+        
+        first_id = self.next_task_id
+        self.next_task_id += len(tasks)
+        for task_id, task in enumerate(tasks, first_id):
+            task.id = task_id
+            task.project_id = project_id
+            self._index_task(task)
+        self._count_tasks(project_id, len(tasks))
+        return tasks
+    
+    def import_tasks(self, project_id: int, titles: Iterable[str],
+                     descriptions: Iterable[str]) -> Tuple[List[Task], 'ValidationReport']:
+        """
+        ورود دسته‌ای تسک از ستون‌های عنوان و توضیحات
+
+        ردیف‌های نامعتبر بدون raise در گزارش می‌آیند و ردیف‌های معتبر بدون
+        اعتبارسنجی دوباره یکجا به create_tasks داده می‌شوند.
+        """
+        from core.validation import prepare_tasks
+        tasks, report = prepare_tasks(titles, descriptions)
+        return self.create_tasks(project_id, tasks), report
+    
+    def import_projects(self, names: Iterable[str],
+                        descriptions: Iterable[str]) -> Tuple[List[Project], 'ValidationReport']:
+        """ورود دسته‌ای پروژه؛ نام تکراری هم به جای raise در گزارش همان ردیف می‌آید"""
+        from core.validation import prepare_projects
+        projects, report = prepare_projects(names, descriptions)
+        return self._create_imported_projects(projects, report), report
+    
+    @writes
+    def _create_imported_projects(self, projects: List[Project], report: 'ValidationReport') -> List[Project]:
+        # بررسی سقف و درج‌ها زیر یک قفل نوشتن، تا نویسنده دیگری بین آن‌ها پروژه نسازد
+        if len(self._projects) + len(projects) > settings.MAX_NUMBER_OF_PROJECTS:
+            raise LimitExceededError(f"تعداد پروژه‌ها نمی‌تواند بیشتر از {settings.MAX_NUMBER_OF_PROJECTS} باشد")
+        
+        created = []
+        for row, project in zip(list(report.valid), projects):
+            try:
+                created.append(self.create_project(project))
+            except DuplicateProjectError as error:
+                report.add_error(row, str(error))
+        return created
+    
+    @writes
+    def update_tasks(self, updates: Dict[int, dict]) -> List[Task]:
+        """updates: task_id -> آرگومان‌های update_task"""
+        tasks = [self._writable_task(self.get_task(task_id)) for task_id in updates]
+        saved = [(task.title, task.description, task.status, task.deadline, task.updated_at) for task in tasks]
+        
+        try:
+            for task in tasks:
+                task.update(**updates[task.id])
+        except Exception:
+            # بازگرداندن همه تسک‌ها به حالت قبل از دسته
+            for task, state in zip(tasks, saved):
+                task.title, task.description, task.status, task.deadline, task.updated_at = state
+            raise
+        
+        for task, state in zip(tasks, saved):
+            self._reindex_task(task, state[2].value, state[3])
+        return tasks
+    
+    @writes
+    def delete_tasks(self, task_ids: Iterable[int]) -> int:
+        tasks = {task_id: self.get_task(task_id) for task_id in task_ids}
+        for task in tasks.values():
+            self._unindex_task(task)
+        return len(tasks)
+    
+    @writes
+    def change_status_many(self, task_ids: Iterable[int], status: str) -> List[Task]:
+        tasks = [self._writable_task(task) for task in {task_id: self.get_task(task_id) for task_id in task_ids}.values()]
+        if not tasks:
+            return tasks
+        
+        # وضعیت یک بار روی اولین تسک اعتبارسنجی می‌شود
+        old_statuses = [task.status.value for task in tasks]
+        tasks[0].set_status(status)
+        new_status = tasks[0].status
+        now = datetime.now()
+        for task, old_status in zip(tasks, old_statuses):
+            task.status = new_status
+            task.updated_at = now
+            self._reindex_task(task, old_status, task.deadline)
+        return tasks
+    
+    # Deadlines
+    @writes
+    def pop_overdue(self, now: datetime = None) -> List[Task]:
+        """
+        تسک‌های بازی که ددلاینشان گذشته را done می‌کند و برمی‌گرداند
+
+        تسک‌ها از ابتدای ایندکس مرتب ددلاین‌های باز برداشته می‌شوند، پس هزینه
+        فقط به تعداد تسک‌های سررسیده بستگی دارد و کل تسک‌ها پیمایش نمی‌شوند.
+        """
+        now = now or datetime.now()
+        overdue = [self._writable_task(self._tasks[task_id]) for _, task_id in self._open_deadlines.irange(high=(now,))]
+        for task in overdue:
+            old_status = task.status.value
+            task.set_status(TaskStatus.DONE.value)
+            task.updated_at = now
+            self._reindex_task(task, old_status, task.deadline)
+        return overdue
+    
+    @reads
+    def upcoming(self, window: timedelta, now: datetime = None) -> List[Task]:
+        """تسک‌های بازی که ددلاینشان در window آینده است، به ترتیب ددلاین"""
+        now = now or datetime.now()
+        return [self._tasks[task_id] for _, task_id in self._open_deadlines.irange((now,), (now + window,))]
+    
+    def tick(self) -> List[Task]:
+        """بستن تسک‌های سررسیده؛ برای فراخوانی دوره‌ای (مثلاً هر بار نمایش منو)"""
+        return self.pop_overdue(datetime.now())
+    
+    # Search
+    @reads
+    def search_tasks(self, text: str, prefix: bool = False, limit: int = None) -> List[Task]:
+        """
+        جستجوی متنی در عنوان و توضیحات تسک‌ها، به ترتیب ارتباط
+
+        حروف عربی/فارسی (ي/ی و ك/ک) یکسان و نیم‌فاصله حذف می‌شود؛ با
+        prefix=True آخرین کلمه به‌عنوان پیشوند تطبیق داده می‌شود.
+        """
+        return [self.get_task(task_id) for task_id in self._task_text.search(text, prefix, limit)]
+    
+    @reads
+    def search_projects(self, text: str, prefix: bool = True, limit: int = None) -> List[Project]:
+        """جستجوی متنی در نام و توضیحات پروژه‌ها؛ به‌طور پیش‌فرض پیشوندی برای تکمیل خودکار"""
+        return [self._projects[project_id] for project_id in self._project_text.search(text, prefix, limit)]
+    
+    # Query
+    @reads
+    def query(self, status: str = None, project_id: int = None, due_before: datetime = None,
+              order_by: str = 'created_at', limit: int = None, offset: int = 0) -> List[Task]:
+        """
+        جستجوی تسک‌ها با فیلترهای اختیاری
+
+        از بین ایندکس‌های پروژه، وضعیت و ددلاین، کوچک‌ترین مجموعه کاندید
+        (بر اساس شمارنده‌ها و rank ایندکس ددلاین) پیمایش و بقیه فیلترها روی آن
+        اعمال می‌شود. order_by یکی از created_at یا deadline است. offset و limit
+        یک صفحه از نتایج مرتب‌شده را برمی‌گردانند.
+        """
+        stop = self._page_stop(limit, offset)
+        matches, key = self._query_plan(status, project_id, due_before, order_by)
+        # اگر ترتیب ایندکس با ترتیب خواسته‌شده یکی باشد، با رسیدن به انتهای صفحه متوقف می‌شویم
+        if key is None:
+            return list(islice(matches, offset, stop))
+        if stop is not None:
+            return heapq.nsmallest(stop, matches, key=key)[offset:]
+        return sorted(matches, key=key)[offset:]
+    
+    @staticmethod
+    def _page_stop(limit: Optional[int], offset: int) -> Optional[int]:
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValidationError("limit و offset نمی‌توانند منفی باشند")
+        return None if limit is None else offset + limit
+    
+    def _query_plan(self, status: Optional[str], project_id: Optional[int], due_before: Optional[datetime],
+                    order_by: str) -> Tuple[Iterator[Task], Optional[Callable]]:
+        """
+        تسک‌های منطبق (به‌صورت lazy) و کلید مرتب‌سازی را برمی‌گرداند
+
+        کلید None یعنی تسک‌ها از قبل به ترتیب خواسته‌شده تولید می‌شوند.
+        """
+        if order_by not in ('created_at', 'deadline'):
+            raise ValidationError("مرتب‌سازی باید بر اساس created_at یا deadline باشد")
+        if status is not None:
+            status = self._validate_status(status)
+        if project_id is not None:
+            self.get_project(project_id)  # Validate project exists
+        
+        # (اندازه مجموعه کاندید، نام ایندکس)
+        plans = []
+        if project_id is not None:
+            plans.append((self._projects[project_id].task_count, 'project'))
+        if status is not None:
+            plans.append((self._status_counts[status], 'status'))
+        if due_before is not None:
+            plans.append((self._deadline_index.rank((due_before,)), 'deadline'))
+        driver = min(plans)[1] if plans else 'all'
+        
+        if driver == 'project':
+            candidates = self._project_tasks[project_id].values()
+        elif driver == 'status':
+            candidates = self._status_index[status].values()
+        elif driver == 'deadline':
+            candidates = (self._tasks[task_id] for _, task_id in self._deadline_index.irange(high=(due_before,)))
+        else:
+            candidates = self._tasks.values()
+        
+        matches = (
+            task for task in candidates
+            if (status is None or task.status.value == status)
+            and (project_id is None or task.project_id == project_id)
+            and (due_before is None or (task.deadline and task.deadline < due_before))
+        )
+        
+        if (order_by == 'created_at' and driver in ('project', 'all')) or (order_by == 'deadline' and driver == 'deadline'):
+            return matches, None
+        if order_by == 'created_at':
+            return matches, lambda task: task.id
+        return matches, lambda task: (task.deadline is None, task.deadline or datetime.min, task.id)
+    
+    @staticmethod
+    def _validate_status(status: str) -> str:
+        try:
+            return TaskStatus(status).value
+        except ValueError:
+            raise ValidationError(f"وضعیت باید یکی از موارد باشد: {', '.join([s.value for s in TaskStatus])}")
+    
     # Statistics - این متد رو اضافه کردم
+    @reads
     def get_statistics(self) -> dict:
         """آمار کلی سیستم رو برمی‌گرداند"""
-        total_tasks = len(self.tasks)
-        todo_tasks = len([t for t in self.tasks if t.status.value == "todo"])
-        doing_tasks = len([t for t in self.tasks if t.status.value == "doing"])
-        done_tasks = len([t for t in self.tasks if t.status.value == "done"])
+        return {
+            'total_projects': len(self._projects),
+            **self._build_statistics(self._status_counts)
+        }
+    
+    @reads
+    def get_project_statistics(self, project_id: int) -> dict:
+        """آمار تسک‌های یک پروژه رو برمی‌گرداند"""
+        self.get_project(project_id)  # Validate project exists
+        return self._build_statistics(self._project_status_counts[project_id])
+    
+    @staticmethod
+    def _build_statistics(counts: Dict[str, int]) -> dict:
+        todo_tasks = counts[TaskStatus.TODO.value]
+        doing_tasks = counts[TaskStatus.DOING.value]
+        done_tasks = counts[TaskStatus.DONE.value]
+        total_tasks = todo_tasks + doing_tasks + done_tasks
         
         completion_rate = (done_tasks / total_tasks * 100) if total_tasks > 0 else 0
         
         return {
-            'total_projects': len(self.projects),
             'total_tasks': total_tasks,
             'todo_tasks': todo_tasks,
             'doing_tasks': doing_tasks,
@@ -0,0 +1,116 @@
+import heapq
+from typing import Dict, Iterator, List, Optional
+from core.project import Project
+from core.task import Task
+from core.exceptions import ProjectNotFoundError, TaskNotFoundError
+from storage.locks import reads
+
+class ReadView:
+    """
+    نمای فقط‌خواندنی و ثابت از MemoryStorage در لحظه ساخت
+
+    نما چیزی کپی نمی‌کند: اشیای زنده را می‌خواند و برای اشیایی که بعد از
+    ساخت نما تغییر کرده یا حذف شده‌اند، نسخه قبلی را از تاریخچه مخزن برمی‌دارد.
+    تا وقتی نمایی باز است، نویسنده‌ها به‌جای تغییر درجا از شیء کپی می‌گیرند
+    (copy-on-write). دیکشنری‌های زنده و تاریخچه را نویسنده‌ها تغییر می‌دهند،
+    پس هر متد نما فقط در مدت همان فراخوانی قفل خواندن مخزن را می‌گیرد؛ نمای
+    باز نویسنده‌ها را متوقف نمی‌کند و نتیجه همچنان نسخه لحظه ساخت است.
+    نما باید با close یا with بسته شود.
+    """
+
+    def __init__(self, storage, version: int):
+        self._storage = storage
+        self._lock = storage._lock
+        self.version = version
+        self.next_project_id = storage.next_project_id
+        self.next_task_id = storage.next_task_id
+        # شمارنده‌ها کوچک‌اند و در لحظه ساخت کپی می‌شوند
+        self._status_counts = dict(storage._status_counts)
+        self._project_status_counts = {
+            project_id: dict(counts) for project_id, counts in storage._project_status_counts.items()
+        }
+        self.closed = False
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._storage._close_view()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _resolve(self, history: Dict[int, list], live, key: int):
+        # اولین نسخه‌ای که بعد از ساخت نما جایگزین شده، همان نسخه دیده‌شده توسط نماست
+        for version, obj in history.get(key, ()):
+            if version > self.version:
+                return obj
+        return live.get(key)
+
+    def _project(self, project_id: int) -> Optional[Project]:
+        if project_id >= self.next_project_id:
+            return None
+        return self._resolve(self._storage._project_history, self._storage._projects, project_id)
+
+    def _task(self, task_id: int) -> Optional[Task]:
+        if task_id >= self.next_task_id:
+            return None
+        return self._resolve(self._storage._task_history, self._storage._tasks, task_id)
+
+    @reads
+    def get_project(self, project_id: int) -> Project:
+        project = self._project(project_id)
+        if not project:
+            raise ProjectNotFoundError(f"پروژه با شناسه {project_id} یافت نشد")
+        return project
+
+    @reads
+    def get_all_projects(self) -> List[Project]:
+        storage = self._storage
+        project_ids = [project_id for project_id in list(storage._projects) if project_id < self.next_project_id]
+        if storage._deleted_projects:
+            project_ids = sorted(set(project_ids).union(storage._deleted_projects))
+        return [project for project in map(self._project, project_ids) if project]
+
+    @reads
+    def get_task(self, task_id: int) -> Task:
+        task = self._task(task_id)
+        if not task:
+            raise TaskNotFoundError(f"تسک با شناسه {task_id} یافت نشد")
+        return task
+
+    @reads
+    def get_project_tasks(self, project_id: int) -> List[Task]:
+        self.get_project(project_id)  # Validate project exists
+        storage = self._storage
+        task_ids = [task_id for task_id in storage._live_project_task_ids(project_id) if task_id < self.next_task_id]
+        deleted = storage._deleted_tasks.get(project_id)
+        if deleted:
+            task_ids = sorted(set(task_ids).union(deleted))
+        return [task for task in map(self._task, task_ids) if task]
+
+    def iter_project_tasks(self, project_id: int) -> Iterator[Task]:
+        return iter(self.get_project_tasks(project_id))
+
+    @property
+    @reads
+    def tasks(self) -> List[Task]:
+        # شناسه‌ها صعودی‌اند، پس ادغام لیست‌های پروژه‌ها ترتیب ایجاد را حفظ می‌کند
+        per_project = [self.get_project_tasks(project.id) for project in self.get_all_projects()]
+        return list(heapq.merge(*per_project, key=lambda task: task.id))
+
+    @reads
+    def get_statistics(self) -> dict:
+        return {
+            'total_projects': len(self._project_status_counts),
+            **self._storage._build_statistics(self._status_counts)
+        }
+
+    @reads
+    def get_project_statistics(self, project_id: int) -> dict:
+        counts = self._project_status_counts.get(project_id)
+        if counts is None:
+            raise ProjectNotFoundError(f"پروژه با شناسه {project_id} یافت نشد")
+        return self._storage._build_statistics(counts)
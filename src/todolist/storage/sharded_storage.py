@@ -0,0 +1,367 @@
+import heapq
+import multiprocessing
+import os
+import threading
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from core.project import Project
+from core.task import Task, TaskStatus
+from core.validation import ValidationReport, prepare_tasks
+from core.exceptions import DuplicateProjectError, LimitExceededError, ProjectNotFoundError, TaskNotFoundError
+from config.settings import settings
+from storage.memory_storage import MemoryStorage
+
+# شناسه shard هر تسک در یک بایت نگه داشته می‌شود؛ این مقدار یعنی «ناشناخته»
+_NO_SHARD = 0xFF
+
+def _shard_main(conn, thread_safe: bool):
+    """
+    حلقه اصلی پروسه shard
+
+    هر درخواست (نام متد، args، kwargs، شناسه‌ها) است. اگر شناسه‌ها داده شده
+    باشند قبل از اجرا next_project_id/next_task_id مخزن با آن‌ها جایگزین
+    می‌شود تا شناسه‌ها در کل کلاستر یکتا بمانند.
+    """
+    storage = MemoryStorage(thread_safe=thread_safe)
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        method, args, kwargs, ids = request
+        try:
+            if ids is not None:
+                storage.next_project_id, storage.next_task_id = ids
+            conn.send((True, getattr(storage, method)(*args, **kwargs)))
+        except Exception as e:
+            conn.send((False, e))
+    storage.close()
+    conn.close()
+
+class _Shard:
+    def __init__(self, context, thread_safe: bool):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_shard_main, args=(child_conn, thread_safe), daemon=True)
+        self.process.start()
+        child_conn.close()
+        # هر pipe در هر لحظه فقط یک درخواست در جریان دارد
+        self.lock = threading.Lock()
+
+    def send(self, method: str, args: tuple = (), kwargs: dict = None, ids: tuple = None):
+        self.conn.send((method, args, kwargs or {}, ids))
+
+    def receive(self):
+        ok, result = self.conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def call(self, method: str, *args, ids: tuple = None, **kwargs):
+        with self.lock:
+            self.send(method, args, kwargs, ids)
+            return self.receive()
+
+    def close(self):
+        with self.lock:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.conn.close()
+        self.process.join()
+
+class ShardedMemoryStorage:
+    """
+    MemoryStorage تقسیم‌شده بین چند پروسه بر اساس شناسه پروژه
+
+    پروژه با شناسه p و همه تسک‌هایش در shard شماره p % shards نگه داشته
+    می‌شوند و router درخواست‌ها را از طریق pipe به آن می‌فرستد. شناسه‌ها،
+    یکتایی نام پروژه و سقف تعداد پروژه‌ها در router و برای کل کلاستر مدیریت
+    می‌شوند. get_statistics، query بدون project_id و سایر عملیات بین‌پروژه‌ای
+    هم‌زمان به همه shardها فرستاده و نتایجشان ادغام می‌شود.
+
+    اشیای برگشتی کپی‌اند؛ تغییر آن‌ها روی داده shard اثری ندارد. عملیات
+    دسته‌ای در هر shard همه یا هیچ است، نه در کل کلاستر.
+    """
+
+    def __init__(self, shards: int = None, thread_safe: bool = False, context=None):
+        shards = shards or os.cpu_count() or 1
+        if not 0 < shards < _NO_SHARD:
+            raise ValueError(f"تعداد shardها باید بین 1 و {_NO_SHARD - 1} باشد")
+        context = context or multiprocessing.get_context()
+        self._shards = [_Shard(context, thread_safe) for _ in range(shards)]
+        self._lock = threading.Lock()
+        self._next_project_id = 1
+        self._next_task_id = 1
+        # نام -> شناسه پروژه (None یعنی نام در حال ثبت است)
+        self._project_names: Dict[str, Optional[int]] = {}
+        # task_id -> شماره shard
+        self._task_shards = bytearray()
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    @property
+    def next_project_id(self) -> int:
+        return self._next_project_id
+
+    @property
+    def next_task_id(self) -> int:
+        return self._next_task_id
+
+    def close(self):
+        for shard in self._shards:
+            shard.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Routing
+    def _project_shard(self, project_id: int) -> int:
+        return project_id % len(self._shards)
+
+    def _task_shard(self, task_id: int) -> int:
+        shard = self._task_shards[task_id] if 0 <= task_id < len(self._task_shards) else _NO_SHARD
+        if shard == _NO_SHARD:
+            raise TaskNotFoundError(f"تسک با شناسه {task_id} یافت نشد")
+        return shard
+
+    def _call_project(self, project_id: int, method: str, *args, **kwargs):
+        return self._shards[self._project_shard(project_id)].call(method, *args, **kwargs)
+
+    def _call_task(self, task_id: int, method: str, *args, **kwargs):
+        return self._shards[self._task_shard(task_id)].call(method, *args, **kwargs)
+
+    def _scatter(self, requests: Dict[int, tuple]) -> Dict[int, object]:
+        """
+        درخواست‌ها (shard -> (method, args, kwargs)) را هم‌زمان می‌فرستد و پاسخ‌ها را جمع می‌کند
+
+        قفل shardها به ترتیب شماره گرفته می‌شود تا دو scatter هم‌زمان بن‌بست نسازند.
+        """
+        shards = sorted(requests)
+        for index in shards:
+            self._shards[index].lock.acquire()
+        try:
+            for index in shards:
+                self._shards[index].send(*requests[index])
+            results, error = {}, None
+            for index in shards:
+                # همه پاسخ‌ها خوانده می‌شوند تا pipe برای درخواست بعدی تمیز بماند
+                try:
+                    results[index] = self._shards[index].receive()
+                except Exception as e:
+                    error = error or e
+            if error is not None:
+                raise error
+            return results
+        finally:
+            for index in shards:
+                self._shards[index].lock.release()
+
+    def _broadcast(self, method: str, *args, **kwargs) -> List:
+        results = self._scatter({index: (method, args, kwargs) for index in range(len(self._shards))})
+        return [results[index] for index in range(len(self._shards))]
+
+    def _allocate_task_ids(self, count: int) -> int:
+        with self._lock:
+            first_id = self._next_task_id
+            self._next_task_id += count
+            return first_id
+
+    def _record_tasks(self, tasks: List[Task], shard: int):
+        with self._lock:
+            shards = self._task_shards
+            if len(shards) < self._next_task_id:
+                shards.extend(bytes([_NO_SHARD]) * (self._next_task_id - len(shards)))
+            for task in tasks:
+                shards[task.id] = shard
+
+    def _group_by_shard(self, task_ids: Iterable[int]) -> Dict[int, List[int]]:
+        groups: Dict[int, List[int]] = {}
+        for task_id in dict.fromkeys(task_ids):
+            groups.setdefault(self._task_shard(task_id), []).append(task_id)
+        return groups
+
+    # Project Methods
+    def create_project(self, project: Project) -> Project:
+        with self._lock:
+            if len(self._project_names) >= settings.MAX_NUMBER_OF_PROJECTS:
+                raise LimitExceededError(f"تعداد پروژه‌ها نمی‌تواند بیشتر از {settings.MAX_NUMBER_OF_PROJECTS} باشد")
+            if project.name in self._project_names:
+                raise DuplicateProjectError(f"پروژه با نام '{project.name}' از قبل وجود دارد")
+            self._project_names[project.name] = None
+            project_id = self._next_project_id
+            self._next_project_id += 1
+
+        try:
+            created = self._call_project(project_id, 'create_project', project, ids=(project_id, self._next_task_id))
+        except Exception:
+            with self._lock:
+                del self._project_names[project.name]
+            raise
+        with self._lock:
+            self._project_names[created.name] = created.id
+        project.id = created.id
+        return created
+
+    def get_project(self, project_id: int) -> Project:
+        return self._call_project(project_id, 'get_project', project_id)
+
+    def get_project_by_name(self, name: str) -> Project:
+        project_id = self._project_names.get(name)
+        if project_id is None:
+            raise ProjectNotFoundError(f"پروژه با نام '{name}' یافت نشد")
+        return self.get_project(project_id)
+
+    def get_all_projects(self) -> List[Project]:
+        return list(heapq.merge(*self._broadcast('get_all_projects'), key=lambda project: project.id))
+
+    def update_project(self, project_id: int, name: str = None, description: str = None) -> Project:
+        old_name = self.get_project(project_id).name
+        reserved = None
+        if name and name != old_name:
+            with self._lock:
+                if name in self._project_names:
+                    raise DuplicateProjectError(f"پروژه با نام '{name}' از قبل وجود دارد")
+                self._project_names[name] = None
+                reserved = name
+
+        try:
+            return self._call_project(project_id, 'update_project', project_id, name, description)
+        finally:
+            # نام ممکن است قبل از خطای اعتبارسنجی توضیحات در shard تغییر کرده باشد
+            if reserved is not None:
+                renamed = self.get_project(project_id).name == reserved
+                with self._lock:
+                    if renamed:
+                        del self._project_names[old_name]
+                        self._project_names[reserved] = project_id
+                    else:
+                        del self._project_names[reserved]
+
+    def delete_project(self, project_id: int) -> bool:
+        project = self.get_project(project_id)
+        self._call_project(project_id, 'delete_project', project_id)
+        with self._lock:
+            self._project_names.pop(project.name, None)
+        # ورودی‌های task_shards تسک‌های حذف‌شده می‌مانند؛ shard خودش TaskNotFoundError می‌دهد
+        return True
+
+    # Task Methods
+    def create_task(self, task: Task, project_id: int) -> Task:
+        return self.create_tasks(project_id, [task])[0]
+
+    def create_tasks(self, project_id: int, tasks: Iterable[Task]) -> List[Task]:
+        tasks = list(tasks)
+        first_id = self._allocate_task_ids(len(tasks))
+        shard = self._project_shard(project_id)
+        created = self._shards[shard].call('create_tasks', project_id, tasks, ids=(self._next_project_id, first_id))
+        self._record_tasks(created, shard)
+        for task, result in zip(tasks, created):
+            task.id, task.project_id = result.id, result.project_id
+        return created
+
+    def get_task(self, task_id: int) -> Task:
+        return self._call_task(task_id, 'get_task', task_id)
+
+    def get_project_tasks(self, project_id: int) -> List[Task]:
+        return self._call_project(project_id, 'get_project_tasks', project_id)
+
+    def iter_project_tasks(self, project_id: int) -> Iterator[Task]:
+        return iter(self.get_project_tasks(project_id))
+
+    @property
+    def tasks(self) -> List[Task]:
+        return list(heapq.merge(*self._broadcast('query'), key=lambda task: task.id))
+
+    def update_task(self, task_id: int, **kwargs) -> Task:
+        return self._call_task(task_id, 'update_task', task_id, **kwargs)
+
+    def delete_task(self, task_id: int) -> bool:
+        return self._call_task(task_id, 'delete_task', task_id)
+
+    def change_task_status(self, task_id: int, status: str) -> Task:
+        return self._call_task(task_id, 'change_task_status', task_id, status)
+
+    # Bulk Task Methods - هر shard دسته خودش را همه یا هیچ اعمال می‌کند
+    def import_tasks(self, project_id: int, titles: Iterable[str],
+                     descriptions: Iterable[str]) -> Tuple[List[Task], ValidationReport]:
+        # اعتبارسنجی در router انجام می‌شود تا فقط ردیف‌های معتبر به shard ارسال شوند
+        tasks, report = prepare_tasks(titles, descriptions)
+        return self.create_tasks(project_id, tasks), report
+
+    def update_tasks(self, updates: Dict[int, dict]) -> List[Task]:
+        groups = self._group_by_shard(updates)
+        results = self._scatter({
+            shard: ('update_tasks', ({task_id: updates[task_id] for task_id in task_ids},), {})
+            for shard, task_ids in groups.items()
+        })
+        return self._in_request_order(updates, results)
+
+    def delete_tasks(self, task_ids: Iterable[int]) -> int:
+        groups = self._group_by_shard(task_ids)
+        results = self._scatter({shard: ('delete_tasks', (ids,), {}) for shard, ids in groups.items()})
+        return sum(results.values())
+
+    def change_status_many(self, task_ids: Iterable[int], status: str) -> List[Task]:
+        MemoryStorage._validate_status(status)
+        task_ids = list(dict.fromkeys(task_ids))
+        groups = self._group_by_shard(task_ids)
+        results = self._scatter({shard: ('change_status_many', (ids, status), {}) for shard, ids in groups.items()})
+        return self._in_request_order(task_ids, results)
+
+    @staticmethod
+    def _in_request_order(task_ids: Iterable[int], results: Dict[int, List[Task]]) -> List[Task]:
+        by_id = {task.id: task for tasks in results.values() for task in tasks}
+        return [by_id[task_id] for task_id in task_ids]
+
+    # Deadlines
+    def pop_overdue(self, now: datetime = None) -> List[Task]:
+        now = now or datetime.now()
+        return list(heapq.merge(*self._broadcast('pop_overdue', now), key=lambda task: (task.deadline, task.id)))
+
+    def upcoming(self, window: timedelta, now: datetime = None) -> List[Task]:
+        now = now or datetime.now()
+        return list(heapq.merge(*self._broadcast('upcoming', window, now), key=lambda task: (task.deadline, task.id)))
+
+    def tick(self) -> List[Task]:
+        return self.pop_overdue(datetime.now())
+
+    # Query
+    def query(self, status: str = None, project_id: int = None, due_before: datetime = None,
+              order_by: str = 'created_at', limit: int = None, offset: int = 0) -> List[Task]:
+        """
+        MemoryStorage.query روی کل کلاستر؛ هر shard offset + limit تای اول خودش را
+        برمی‌گرداند و صفحه از نتایج ادغام‌شده جدا می‌شود
+        """
+        if project_id is not None:
+            return self._call_project(project_id, 'query', status, project_id, due_before, order_by, limit, offset)
+        stop = MemoryStorage._page_stop(limit, offset)
+        if order_by == 'created_at':
+            key = lambda task: task.id
+        else:
+            key = lambda task: (task.deadline is None, task.deadline or datetime.min, task.id)
+        per_shard = self._broadcast('query', status, None, due_before, order_by, stop)
+        return list(islice(heapq.merge(*per_shard, key=key), offset, stop))
+
+    # Statistics
+    def get_statistics(self) -> dict:
+        shard_stats = self._broadcast('get_statistics')
+        counts = {
+            status.value: sum(stats[f'{status.value}_tasks'] for stats in shard_stats)
+            for status in TaskStatus
+        }
+        return {
+            'total_projects': sum(stats['total_projects'] for stats in shard_stats),
+            **MemoryStorage._build_statistics(counts)
+        }
+
+    def get_project_statistics(self, project_id: int) -> dict:
+        return self._call_project(project_id, 'get_project_statistics', project_id)
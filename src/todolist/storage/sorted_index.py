@@ -0,0 +1,95 @@
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Any, Iterator, List
+
+class SortedIndex:
+    """
+    لیست مرتب تکه‌تکه برای ایندکس‌های ثانویه
+
+    یک لیست مرتب بزرگ با insort در هر درج کل لیست را جابه‌جا می‌کند. اینجا
+    عناصر در تکه‌های حداکثر load*2 عضوی نگه داشته می‌شوند تا درج و حذف فقط
+    یک تکه کوچک را جابه‌جا کنند و جستجو با bisect روی بیشینه تکه‌ها انجام شود.
+    """
+
+    def __init__(self, load: int = 512):
+        self._load = load
+        self._chunks: List[list] = []
+        self._maxes: List[Any] = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        for chunk in self._chunks:
+            yield from chunk
+
+    def add(self, item):
+        if not self._chunks:
+            self._chunks.append([item])
+            self._maxes.append(item)
+        else:
+            position = bisect_left(self._maxes, item)
+            if position == len(self._chunks):
+                position -= 1
+                self._chunks[position].append(item)
+                self._maxes[position] = item
+            else:
+                insort(self._chunks[position], item)
+            self._split(position)
+        self._len += 1
+
+    def _split(self, position: int):
+        chunk = self._chunks[position]
+        if len(chunk) > self._load * 2:
+            half = chunk[self._load:]
+            del chunk[self._load:]
+            self._maxes[position] = chunk[-1]
+            self._chunks.insert(position + 1, half)
+            self._maxes.insert(position + 1, half[-1])
+
+    def remove(self, item):
+        """item را حذف می‌کند؛ اگر نباشد ValueError"""
+        position = bisect_left(self._maxes, item)
+        if position == len(self._chunks):
+            raise ValueError(item)
+        chunk = self._chunks[position]
+        index = bisect_left(chunk, item)
+        if index == len(chunk) or chunk[index] != item:
+            raise ValueError(item)
+        del chunk[index]
+        self._len -= 1
+        if not chunk:
+            del self._chunks[position]
+            del self._maxes[position]
+        else:
+            self._maxes[position] = chunk[-1]
+
+    def discard(self, item):
+        try:
+            self.remove(item)
+        except ValueError:
+            pass
+
+    def rank(self, item) -> int:
+        """تعداد عناصر کوچک‌تر از item"""
+        position = bisect_left(self._maxes, item)
+        if position == len(self._chunks):
+            return self._len
+        return sum(len(chunk) for chunk in self._chunks[:position]) + bisect_left(self._chunks[position], item)
+
+    def irange(self, low=None, high=None) -> Iterator:
+        """عناصر low <= item < high به ترتیب؛ None یعنی بدون حد"""
+        position = 0 if low is None else bisect_left(self._maxes, low)
+        start = 0 if low is None or position == len(self._chunks) else bisect_left(self._chunks[position], low)
+        for chunk in islice(self._chunks, position, None):
+            end = len(chunk) if high is None else bisect_left(chunk, high)
+            yield from islice(chunk, start, end)
+            if end < len(chunk):
+                return
+            start = 0
+
+    def clear(self):
+        self._chunks.clear()
+        self._maxes.clear()
+        self._len = 0
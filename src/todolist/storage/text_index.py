@@ -0,0 +1,185 @@
+import heapq
+import math
+import re
+from bisect import insort
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+from storage.sorted_index import SortedIndex
+
+# یکسان‌سازی حروف عربی به فارسی، حذف نیم‌فاصله و اعراب
+_NORMALIZE = str.maketrans({
+    'ي': 'ی',
+    'ى': 'ی',
+    'ك': 'ک',
+    '\u200c': None,  # ZWNJ
+    **{chr(code): None for code in range(0x064B, 0x0653)},
+})
+_TOKEN = re.compile(r'\w+')
+# بزرگ‌ترین کاراکتر یونیکد؛ همه کلمات با پیشوند p بین p و p + _MAX_CHAR قرار می‌گیرند
+_MAX_CHAR = '\U0010ffff'
+# یک پیشوند حداکثر به این تعداد کلمه گسترش می‌یابد
+_MAX_PREFIX_TERMS = 64
+# طول لیست برتر هر کلمه؛ جستجو با limit بزرگ‌تر امتیازدهی کامل می‌کند
+_TOP_K = 64
+
+def normalize(text: str) -> str:
+    return text.translate(_NORMALIZE).casefold()
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(normalize(text))
+
+class InvertedIndex:
+    """
+    ایندکس معکوس کلمه -> {کلید سند: تعداد تکرار}
+
+    واژگان در یک SortedIndex نگه داشته می‌شود تا جستجوی پیشوندی
+    (برای تکمیل خودکار) با یک بازه روی کلمات مرتب انجام شود. برای کلمات
+    پرتکرار، _TOP_K سند برتر به ترتیب (-تکرار، کلید) هم نگه داشته می‌شود
+    تا جستجوی تک‌کلمه‌ای با limit بدون امتیازدهی به همه اسناد تمام شود.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._documents: Dict[int, Tuple[str, ...]] = {}
+        self._terms = SortedIndex()
+        # کلمه -> [(-تکرار، کلید)] مرتب؛ فقط برای کلماتی با بیش از _TOP_K سند
+        self._top: Dict[str, List[Tuple[int, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def index(self, key: int, *fields: str):
+        """سند key را با متن fields ایندکس می‌کند؛ اگر متن تغییری نکرده باشد کاری نمی‌کند"""
+        if self._documents.get(key) == fields:
+            return
+        self.remove(key)
+        self._documents[key] = fields
+        for term, count in Counter(tokenize(' '.join(fields))).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._terms.add(term)
+            postings[key] = count
+            top = self._top.get(term)
+            if top is not None:
+                entry = (-count, key)
+                if entry < top[-1]:
+                    insort(top, entry)
+                    del top[-1]
+            elif len(postings) == _TOP_K + 1:
+                self._top_postings(term)
+
+    def remove(self, key: int):
+        fields = self._documents.pop(key, None)
+        if fields is None:
+            return
+        for term in set(tokenize(' '.join(fields))):
+            postings = self._postings[term]
+            count = postings.pop(key)
+            top = self._top.get(term)
+            if top is not None and (-count, key) <= top[-1]:
+                # لیست برتر یک عضو کم دارد؛ هنگام جستجو دوباره ساخته می‌شود
+                del self._top[term]
+            if not postings:
+                del self._postings[term]
+                self._terms.remove(term)
+
+    def clear(self):
+        self._postings.clear()
+        self._documents.clear()
+        self._terms.clear()
+        self._top.clear()
+
+    def _terms_for(self, token: str, prefix: bool) -> List[str]:
+        if not prefix:
+            return [token] if token in self._postings else []
+        # نزدیک‌ترین تکمیل‌ها (به ترتیب الفبا) اول می‌آیند
+        return list(islice(self._terms.irange(token, token + _MAX_CHAR), _MAX_PREFIX_TERMS))
+
+    def _top_postings(self, term: str) -> List[Tuple[int, int]]:
+        top = self._top.get(term)
+        if top is None:
+            postings = self._postings[term]
+            top = heapq.nsmallest(_TOP_K, [(-count, key) for key, count in postings.items()])
+            if len(postings) > _TOP_K:
+                self._top[term] = top
+        return top
+
+    def _ranked(self, term: str, weight: float) -> Iterator[Tuple[float, int]]:
+        """(-امتیاز، کلید) به ترتیب؛ اگر لیست برتر کامل نباشد در پایان inf می‌دهد"""
+        top = self._top_postings(term)
+        for count, key in top:
+            yield count * weight, key
+        if len(self._postings[term]) > len(top):
+            yield math.inf, 0
+
+    def _search_top(self, group: List[Tuple[str, Dict[int, int], float]], limit: int) -> Optional[List[int]]:
+        """
+        limit سند برتر یک کلمه (یا پیشوند) با ادغام لیست‌های برتر کلمات
+
+        اولین بار که سندی در جریان ادغام‌شده دیده می‌شود بیشترین امتیازش
+        است. اگر قبل از رسیدن به limit لیست برتر یک کلمه تمام شود None
+        برمی‌گردد تا امتیازدهی کامل انجام شود.
+        """
+        seen = set()
+        result = []
+        for score, key in heapq.merge(*(self._ranked(term, weight) for term, _, weight in group)):
+            if score == math.inf:
+                return None
+            if key not in seen:
+                seen.add(key)
+                result.append(key)
+                if len(result) == limit:
+                    break
+        return result
+
+    def search(self, query: str, prefix: bool = False, limit: int = None) -> List[int]:
+        """
+        کلید اسنادی که همه کلمات query را دارند، به ترتیب امتیاز tf-idf
+
+        با prefix=True آخرین کلمه به حداکثر _MAX_PREFIX_TERMS کلمه گسترش
+        می‌یابد و امتیاز آن بیشترین امتیاز بین این کلمات است. اشتراک لیست‌ها
+        روی کلیدها در C گرفته می‌شود و فقط اسناد مشترک امتیاز می‌گیرند.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        total = len(self._documents)
+        groups = []
+        for i, token in enumerate(tokens):
+            terms = self._terms_for(token, prefix and i == len(tokens) - 1)
+            if not terms:
+                return []
+            groups.append([(term, self._postings[term], math.log(1 + total / len(self._postings[term])))
+                           for term in terms])
+
+        if len(groups) == 1 and limit is not None and limit <= _TOP_K:
+            top = self._search_top(groups[0], limit)
+            if top is not None:
+                return top
+
+        groups.sort(key=lambda group: sum(len(postings) for _, postings, _ in group))
+        candidates = None
+        if len(groups) > 1:
+            candidates = set().union(*(postings.keys() for _, postings, _ in groups[0]))
+            for group in groups[1:]:
+                candidates = set().union(*(candidates & postings.keys() for _, postings, _ in group))
+                if not candidates:
+                    return []
+
+        scores: Dict[int, float] = {}
+        for group in groups:
+            best: Dict[int, float] = {}
+            for _, postings, weight in group:
+                for key in postings.keys() if candidates is None else candidates & postings.keys():
+                    score = postings[key] * weight
+                    if score > best.get(key, 0):
+                        best[key] = score
+            for key, score in best.items():
+                scores[key] = scores.get(key, 0) + score
+
+        rank = lambda key: (-scores[key], key)
+        if limit is not None:
+            return heapq.nsmallest(limit, scores, key=rank)
+        return sorted(scores, key=rank)
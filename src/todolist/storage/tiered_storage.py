@@ -0,0 +1,397 @@
+import heapq
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional
+from core.task import Task, TaskStatus
+from core.timestamps import NO_TIMESTAMP, datetime_to_micros
+from config.settings import settings
+from storage.locks import reads, writes
+from storage.memory_storage import MemoryStorage
+from storage.text_index import tokenize
+
+if TYPE_CHECKING:
+    from storage.read_view import ReadView
+
+DONE = TaskStatus.DONE.value
+
+def _task_id(task: Task) -> int:
+    return task.id
+
+def _deadline_key(task: Task) -> tuple:
+    return (task.deadline is None, task.deadline or datetime.min, task.id)
+
+# ردیف سرد همان slotهای Task است (وضعیت به صورت کد و زمان‌ها به میکروثانیه)،
+# پس انتقال بین حافظه و دیسک تبدیل datetime یا JSON ندارد
+_COLUMNS = "id, project_id, title, description, status, deadline, created_at, updated_at"
+
+def _task_row(task: Task) -> tuple:
+    return (task.id, task.project_id, task.title, task.description,
+            task._status, task._deadline, task._created, task._updated)
+
+def _text_row(task: Task) -> tuple:
+    # کلمات همان tokenize ایندکس حافظه‌اند، پس نرمال‌سازی فارسی در FTS هم یکسان است
+    return task.id, ' '.join(tokenize(f"{task.title} {task.description}"))
+
+def _row_task(row: tuple) -> Task:
+    task = Task.__new__(Task)
+    (task.id, task.project_id, task.title, task.description,
+     task._status, task._deadline, task._created, task._updated) = row
+    return task
+
+class _TieredTasks(dict):
+    """task_id -> تسک؛ تسک سردی که پیدا نشود از فایل سرد به حافظه برگردانده می‌شود"""
+
+    def __init__(self, storage: 'TieredMemoryStorage'):
+        super().__init__()
+        self._storage = storage
+
+    def get(self, task_id: int, default=None):
+        task = dict.get(self, task_id)
+        if task is None:
+            task = self._storage._fault_in(task_id)
+        return default if task is None else task
+
+    def __missing__(self, task_id: int) -> Task:
+        task = self._storage._fault_in(task_id)
+        if task is None:
+            raise KeyError(task_id)
+        return task
+
+class TieredMemoryStorage(MemoryStorage):
+    """
+    MemoryStorage با لایه سرد روی دیسک برای تسک‌های done
+
+    تسک done که cold_after ثانیه تغییر نکرده، در tick (یا spill) به یک فایل
+    SQLite منتقل و از ایندکس‌های حافظه حذف می‌شود. تعداد تسک‌های done مقیم
+    حافظه حداکثر resident_budget است و در پایان هر عملیات نوشتن، کم‌استفاده‌ترین
+    آن‌ها (LRU) به دیسک می‌روند. شمارنده‌ها دست نمی‌خورند، پس آمار دقیق می‌ماند.
+
+    get_task تسک سرد را زیر قفل نوشتن به حافظه برمی‌گرداند و get_project_tasks،
+    tasks، query و search_tasks تسک‌های سرد را بدون مقیم کردن از دیسک می‌خوانند.
+    ایندکس متنی حافظه فقط تسک‌های مقیم را دارد و متن تسک‌های سرد در یک جدول
+    FTS5 کنار cold_tasks است. read_view همه تسک‌های سرد را برمی‌گرداند و تا
+    بسته شدن آخرین نما انتقال به دیسک متوقف می‌شود. فایل سرد فقط فضای جابه‌جایی همین پروسه است و در شروع پاک می‌شود؛
+    برای ماندگاری DurableMemoryStorage را ببینید.
+    """
+
+    def __init__(self, path: str = None, cold_after: float = None, resident_budget: int = None,
+                 thread_safe: bool = False):
+        super().__init__(thread_safe)
+        self.cold_after = settings.STORAGE_COLD_AFTER_SECONDS if cold_after is None else cold_after
+        self.resident_budget = max(1, settings.STORAGE_RESIDENT_DONE_TASKS if resident_budget is None
+                                   else resident_budget)
+        self._tasks = _TieredTasks(self)
+        # شناسه تسک‌های done مقیم حافظه، از کم‌استفاده‌ترین به پراستفاده‌ترین
+        self._done_lru: Dict[int, None] = OrderedDict()
+        # بازگرداندن تسک سرد در خواندن‌های هم‌زمان انجام می‌شود؛ دسترسی به فایل سرد سریال است
+        self._tier_lock = threading.Lock()
+        # تعداد تسک‌های منتقل‌شده از آخرین فشرده‌سازی دیکشنری‌ها
+        self._evicted = 0
+        # مسیر خالی یعنی فایل موقتی SQLite که با بستن اتصال حذف می‌شود
+        self._cold = sqlite3.connect(settings.STORAGE_COLD_PATH if path is None else path,
+                                     check_same_thread=False)
+        self._cold.executescript("""
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            DROP TABLE IF EXISTS cold_tasks;
+            DROP TABLE IF EXISTS cold_text;
+            CREATE TABLE cold_tasks (
+                id INTEGER PRIMARY KEY,
+                project_id INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                deadline INTEGER NOT NULL,
+                created_at INTEGER NOT NULL,
+                updated_at INTEGER NOT NULL
+            );
+            CREATE INDEX cold_tasks_project ON cold_tasks (project_id, id);
+            CREATE VIRTUAL TABLE cold_text USING fts5(
+                body, tokenize = "unicode61 remove_diacritics 0 tokenchars '_'"
+            );
+        """)
+
+    def close(self):
+        self._cold.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @writes
+    def read_view(self) -> 'ReadView':
+        # نما فقط اشیای حافظه و تاریخچه آن‌ها را می‌بیند (مثل DurableMemoryStorage)،
+        # پس تسک‌های سرد برگردانده می‌شوند و تا بسته شدن نما دوباره به دیسک نمی‌روند
+        self._fault_in_all()
+        return super().read_view()
+
+    def _live_project_task_ids(self, project_id: int) -> List[int]:
+        # تسک‌های برگشته از دیسک در انتهای دیکشنری پروژه درج شده‌اند
+        return sorted(self._project_tasks.get(project_id, ()))
+
+    # Cold tier
+    @property
+    def cold_count(self) -> int:
+        with self._tier_lock:
+            return self._cold.execute("SELECT COUNT(*) FROM cold_tasks").fetchone()[0]
+
+    @property
+    def resident_done_count(self) -> int:
+        return len(self._done_lru)
+
+    def _load_cold(self, where: str = "1", params: tuple = ()) -> List[Task]:
+        """تسک‌های سرد منطبق به ترتیب شناسه، بدون مقیم کردن آن‌ها"""
+        with self._tier_lock:
+            rows = self._cold.execute(f"SELECT {_COLUMNS} FROM cold_tasks WHERE {where} ORDER BY id", params).fetchall()
+        return [_row_task(row) for row in rows]
+
+    def _fault_in(self, task_id: int) -> Optional[Task]:
+        """تسک سرد را مقیم می‌کند؛ ایندکس‌ها تغییر می‌کنند، پس فراخواننده قفل نوشتن را دارد"""
+        with self._tier_lock:
+            if dict.__contains__(self._tasks, task_id):
+                return dict.__getitem__(self._tasks, task_id)
+            found = self._cold.execute(f"SELECT {_COLUMNS} FROM cold_tasks WHERE id = ?", (task_id,)).fetchone()
+            if found is None:
+                return None
+            self._cold.execute("DELETE FROM cold_tasks WHERE id = ?", (task_id,))
+            self._cold.execute("DELETE FROM cold_text WHERE rowid = ?", (task_id,))
+            self._cold.commit()
+            return self._restore(_row_task(found))
+
+    def _fault_in_all(self):
+        with self._tier_lock:
+            rows = self._cold.execute(f"SELECT {_COLUMNS} FROM cold_tasks ORDER BY id").fetchall()
+            self._cold.execute("DELETE FROM cold_tasks")
+            self._cold.execute("DELETE FROM cold_text")
+            self._cold.commit()
+        for row in rows:
+            self._restore(_row_task(row))
+
+    def _restore(self, task: Task) -> Task:
+        dict.__setitem__(self._tasks, task.id, task)
+        self._project_tasks[task.project_id][task.id] = task
+        # شمارنده‌ها هنگام انتقال به دیسک کم نشده‌اند، پس فقط ایندکس‌ها (و ایندکس متنی) بازسازی می‌شوند
+        self._index_secondary(task)
+        return task
+
+    def _evict(self, tasks: List[Task]):
+        if not tasks:
+            return
+        with self._tier_lock:
+            self._cold.executemany(f"INSERT OR REPLACE INTO cold_tasks ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                   map(_task_row, tasks))
+            self._cold.executemany("INSERT OR REPLACE INTO cold_text (rowid, body) VALUES (?, ?)",
+                                   map(_text_row, tasks))
+            self._cold.commit()
+            for task in tasks:
+                dict.__delitem__(self._tasks, task.id)
+                del self._project_tasks[task.project_id][task.id]
+                del self._status_index[DONE][task.id]
+                self._task_text.remove(task.id)
+                if task._deadline != NO_TIMESTAMP:
+                    self._deadline_index.remove((task.deadline, task.id))
+                del self._done_lru[task.id]
+        self._evicted += len(tasks)
+        if self._evicted > len(self._tasks):
+            self._shrink_indexes()
+
+    def _shrink_indexes(self):
+        """
+        دیکشنری‌های شناسه‌محور را دوباره می‌سازد
+
+        دیکشنری پایتون با حذف کوچک نمی‌شود، پس بعد از انتقال انبوه به دیسک
+        جدول‌ها هنوز اندازه همه تسک‌ها را دارند. این کار فقط وقتی انجام می‌شود
+        که تعداد منتقل‌شده‌ها از تسک‌های مقیم بیشتر شده باشد، پس هزینه‌اش سرشکن است.
+        """
+        tasks = _TieredTasks(self)
+        dict.update(tasks, self._tasks)
+        self._tasks = tasks
+        self._project_tasks = {project_id: dict(project_tasks)
+                               for project_id, project_tasks in self._project_tasks.items()}
+        self._status_index[DONE] = dict(self._status_index[DONE])
+        self._done_lru = OrderedDict(self._done_lru)
+        self._evicted = 0
+
+    def _enforce_budget(self):
+        if self._open_views:
+            return
+        excess = len(self._done_lru) - self.resident_budget
+        if excess > 0:
+            lru = iter(self._done_lru)
+            self._evict([dict.__getitem__(self._tasks, next(lru)) for _ in range(excess)])
+
+    @writes
+    def spill(self, now: datetime = None) -> int:
+        """تسک‌های done که cold_after ثانیه تغییر نکرده‌اند را به دیسک می‌برد؛ تعداد منتقل‌شده"""
+        if self._open_views:
+            return 0
+        cutoff = datetime_to_micros((now or datetime.now()) - timedelta(seconds=self.cold_after))
+        cold = [task for task in self._status_index[DONE].values() if task._updated < cutoff]
+        self._evict(cold)
+        return len(cold)
+
+    def tick(self) -> List[Task]:
+        overdue = super().tick()
+        self.spill()
+        return overdue
+
+    # Index hooks: عضویت در LRU همراه با ایندکس وضعیت done
+    def _index_secondary(self, task: Task):
+        super()._index_secondary(task)
+        if task.status.value == DONE:
+            self._done_lru[task.id] = None
+
+    def _unindex_secondary(self, task: Task):
+        super()._unindex_secondary(task)
+        self._done_lru.pop(task.id, None)
+
+    def _reindex_task(self, task: Task, old_status: str, old_deadline: Optional[datetime]):
+        super()._reindex_task(task, old_status, old_deadline)
+        if task.status.value == DONE:
+            self._done_lru[task.id] = None
+            self._done_lru.move_to_end(task.id)
+        else:
+            self._done_lru.pop(task.id, None)
+
+    def _unindex_project(self, project):
+        super()._unindex_project(project)
+        with self._tier_lock:
+            self._cold.execute("DELETE FROM cold_text WHERE rowid IN "
+                               "(SELECT id FROM cold_tasks WHERE project_id = ?)", (project.id,))
+            self._cold.execute("DELETE FROM cold_tasks WHERE project_id = ?", (project.id,))
+            self._cold.commit()
+
+    # Reads
+    def get_task(self, task_id: int) -> Task:
+        # تسک مقیم زیر قفل خواندن؛ بازگرداندن تسک سرد ایندکس‌ها را تغییر می‌دهد و قفل نوشتن می‌خواهد
+        with self._lock.read_locked():
+            task = dict.get(self._tasks, task_id)
+            if task is not None:
+                if task.id in self._done_lru:
+                    with self._tier_lock:
+                        self._done_lru.move_to_end(task.id)
+                return task
+        return self._get_cold_task(task_id)
+
+    @writes
+    def _get_cold_task(self, task_id: int) -> Task:
+        try:
+            return super().get_task(task_id)
+        finally:
+            self._enforce_budget()
+
+    @reads
+    def search_tasks(self, text: str, prefix: bool = False, limit: int = None) -> List[Task]:
+        """
+        تسک‌های مقیم به ترتیب tf-idf و پس از آن‌ها تسک‌های سرد به ترتیب bm25
+
+        تسک‌های سرد از جدول FTS فایل سرد خوانده می‌شوند و مقیم نمی‌شوند.
+        """
+        hot = super().search_tasks(text, prefix, limit)
+        if limit is not None and len(hot) >= limit:
+            return hot
+        return hot + self._search_cold(text, prefix, -1 if limit is None else limit - len(hot))
+
+    def _search_cold(self, text: str, prefix: bool, limit: int) -> List[Task]:
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+        # کلمات فقط حروف و ارقام‌اند، پس داخل "" عبارت FTS امن هستند
+        phrases = [f'"{token}"' for token in tokens]
+        if prefix:
+            phrases[-1] += '*'
+        with self._tier_lock:
+            rows = self._cold.execute(
+                f"SELECT {_COLUMNS} FROM cold_text JOIN cold_tasks ON cold_tasks.id = cold_text.rowid "
+                f"WHERE cold_text MATCH ? ORDER BY bm25(cold_text), id LIMIT ?",
+                (' '.join(phrases), limit)).fetchall()
+        return [_row_task(row) for row in rows]
+
+    @property
+    @reads
+    def tasks(self) -> List[Task]:
+        hot = sorted(self._tasks.values(), key=_task_id)
+        return list(heapq.merge(hot, self._load_cold(), key=_task_id))
+
+    @reads
+    def get_project_tasks(self, project_id: int) -> List[Task]:
+        self.get_project(project_id)  # Validate project exists
+        # تسک‌های برگشته از دیسک در انتهای دیکشنری پروژه درج شده‌اند
+        hot = sorted(self._project_tasks[project_id].values(), key=_task_id)
+        return list(heapq.merge(hot, self._load_cold("project_id = ?", (project_id,)), key=_task_id))
+
+    @reads
+    def iter_project_tasks(self, project_id: int) -> Iterator[Task]:
+        return iter(self.get_project_tasks(project_id))
+
+    def _query_plan(self, status: Optional[str], project_id: Optional[int], due_before: Optional[datetime],
+                    order_by: str):
+        matches, key = super()._query_plan(status, project_id, due_before, order_by)
+        # ترتیب درج دیکشنری‌ها بعد از بازگشت تسک‌های سرد دیگر ترتیب ایجاد نیست
+        if key is None:
+            key = _task_id if order_by == 'created_at' else _deadline_key
+        if status is not None and self._validate_status(status) != DONE:
+            return matches, key
+        conditions, params = ["1"], []
+        if project_id is not None:
+            conditions.append("project_id = ?")
+            params.append(project_id)
+        if due_before is not None:
+            conditions.append("deadline > ? AND deadline < ?")
+            params.extend((NO_TIMESTAMP, datetime_to_micros(due_before)))
+        return chain(matches, self._load_cold(" AND ".join(conditions), tuple(params))), key
+
+    # Writes: بودجه حافظه در پایان هر عملیات نوشتن اعمال می‌شود
+    @writes
+    def create_task(self, task: Task, project_id: int) -> Task:
+        try:
+            return super().create_task(task, project_id)
+        finally:
+            self._enforce_budget()
+
+    @writes
+    def create_tasks(self, project_id: int, tasks: Iterable[Task]) -> List[Task]:
+        try:
+            return super().create_tasks(project_id, tasks)
+        finally:
+            self._enforce_budget()
+
+    @writes
+    def update_task(self, task_id: int, **kwargs) -> Task:
+        try:
+            return super().update_task(task_id, **kwargs)
+        finally:
+            self._enforce_budget()
+
+    @writes
+    def change_task_status(self, task_id: int, status: str) -> Task:
+        try:
+            return super().change_task_status(task_id, status)
+        finally:
+            self._enforce_budget()
+
+    @writes
+    def update_tasks(self, updates: Dict[int, dict]) -> List[Task]:
+        try:
+            return super().update_tasks(updates)
+        finally:
+            self._enforce_budget()
+
+    @writes
+    def change_status_many(self, task_ids: Iterable[int], status: str) -> List[Task]:
+        try:
+            return super().change_status_many(task_ids, status)
+        finally:
+            self._enforce_budget()
+
+    @writes
+    def pop_overdue(self, now: datetime = None) -> List[Task]:
+        try:
+            return super().pop_overdue(now)
+        finally:
+            self._enforce_budget()
@@ -0,0 +1,74 @@
+import asyncio
+import time
+import pytest
+from src.todolist.core.project import Project
+from src.todolist.core.task import Task
+from src.todolist.storage import async_storage
+from src.todolist.storage.async_storage import AsyncMemoryStorage
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+class TestAsyncMemoryStorage:
+    def test_crud_bulk_and_query(self):
+        async def scenario():
+            storage = AsyncMemoryStorage(batch_size=2)
+            project = await storage.create_project(Project("Project", "Description"))
+            tasks = await storage.create_tasks(project.id, [Task(f"Task {i}", "Description") for i in range(5)])
+            await storage.update_task(tasks[0].id, title="Renamed")
+            await storage.change_status_many([tasks[1].id, tasks[2].id], "done")
+            assert await storage.delete_tasks([tasks[3].id]) == 1
+
+            assert (await storage.get_task(tasks[0].id)).title == "Renamed"
+            assert await storage.query(status="done") == [tasks[1], tasks[2]]
+            assert await storage.query(project_id=project.id, limit=3) == [tasks[0], tasks[1], tasks[2]]
+            assert (await storage.get_statistics())['total_tasks'] == 4
+            with pytest.raises(Exception):  # Should raise TaskNotFoundError
+                await storage.delete_tasks([tasks[4].id, 999])
+            assert len(await storage.get_project_tasks(project.id)) == 4
+
+        _run(scenario())
+
+    def test_cascade_delete_does_not_stall_loop(self, monkeypatch):
+        # ذخیره‌ساز تنظیمات را از config.settings می‌خواند
+        monkeypatch.setattr(async_storage.settings, "MAX_NUMBER_OF_TASKS_PER_PROJECT", 20_000)
+        budget = 0.005
+
+        async def scenario():
+            storage = AsyncMemoryStorage(stall_budget=budget)
+            victim = await storage.create_project(Project("Victim", "Description"))
+            other = await storage.create_project(Project("Other", "Description"))
+            await storage.create_tasks(victim.id, [Task(f"Task {i}", "Description") for i in range(20_000)])
+            kept = await storage.create_task(Task("Kept", "Description"), other.id)
+
+            gaps = []
+            observed = []
+            done = asyncio.Event()
+
+            async def heartbeat():
+                last = time.perf_counter()
+                while not done.is_set():
+                    await asyncio.sleep(0)
+                    now = time.perf_counter()
+                    gaps.append(now - last)
+                    last = now
+                    # خواندن‌ها در طول حذف، پروژه را حذف‌شده می‌بینند
+                    observed.append((await storage.get_statistics())['total_tasks'])
+
+            async def delete():
+                try:
+                    await storage.delete_project(victim.id)
+                finally:
+                    done.set()
+
+            start = time.perf_counter()
+            await asyncio.gather(heartbeat(), delete())
+            elapsed = time.perf_counter() - start
+
+            assert len(gaps) > 1
+            assert max(gaps) < max(budget * 10, elapsed / 4)
+            assert set(observed) == {1}
+            assert await storage.get_all_projects() == [other]
+            assert await storage.get_task(kept.id) is kept
+
+        _run(scenario())
@@ -0,0 +1,108 @@
+import io
+import json
+import pytest
+from src.todolist.batch import run_batch
+from src.todolist.storage.memory_storage import MemoryStorage
+
+def run(lines, **kwargs):
+    storage = MemoryStorage()
+    output = io.BytesIO()
+    failures = run_batch(storage, lines, output, **kwargs)
+    return storage, failures, [json.loads(line) for line in output.getvalue().splitlines()]
+
+class TestBatch:
+    def test_json_and_plain_lines(self):
+        storage, failures, results = run([
+            '{"op": "create_project", "name": "Docs", "description": "Description", "id": "a"}',
+            '# comment',
+            '',
+            'create_task 1 "Write guide" "First draft" deadline=2999-01-01',
+            '{"op": "change_status", "task_id": 1, "status": "done"}',
+            'update_task 1 title="Final guide"',
+            'query status=done',
+            'stats',
+        ])
+
+        assert failures == 0
+        assert results[0]['id'] == "a" and results[0]['result']['name'] == "Docs"
+        assert results[1]['result']['deadline'].startswith("2999-01-01")
+        assert results[2]['result']['status'] == "done"
+        assert [t['title'] for t in results[4]['result']] == ["Final guide"]
+        assert results[5]['result']['done_tasks'] == 1
+        assert storage.get_task(1).title == "Final guide"
+
+    def test_list_tasks_pages(self):
+        lines = ['create_project Docs Description']
+        lines += [f'create_task 1 "Task {i}" Description' for i in range(1, 6)]
+        lines += [
+            'change_status 2 done',
+            'list_tasks 1 --limit 2 --offset 1',
+            'list_tasks 1 todo limit=10 offset=3',
+            '{"op": "list_tasks", "project_id": 1, "status": "done", "limit": 1}',
+        ]
+        _, failures, results = run(lines)
+
+        assert failures == 0
+        assert [[t['id'] for t in r['result']] for r in results[-3:]] == [[2, 3], [5], [2]]
+
+    def test_errors_are_reported_per_line(self):
+        lines = [
+            'create_project Docs Description',
+            'create_project Docs Description',
+            'unknown_op',
+            '{"op": "get_task", "task_id": "x"}',
+            'get_task 99',
+            'list_projects',
+        ]
+        storage, failures, results = run(lines)
+
+        assert failures == 4
+        assert [r['ok'] for r in results] == [True, False, False, False, False, True]
+        assert [r.get('error') for r in results[1:5]] == [
+            "DuplicateProjectError", "BatchCommandError", "BatchCommandError", "TaskNotFoundError"]
+        assert results[1]['line'] == 2
+
+        _, failures, results = run(lines, stop_on_error=True)
+        assert failures == 1 and len(results) == 2
+
+    def test_bad_argument_types_do_not_abort_batch(self):
+        _, failures, results = run([
+            '{"op": "create_project", "name": 5, "description": "Description"}',
+            '{"op": "search", "text": 5}',
+            '{"op": "create_project", "name": "Docs", "description": "Description"}',
+        ])
+
+        assert failures == 2
+        assert [r.get('error') for r in results] == ["BatchCommandError", "BatchCommandError", None]
+        assert results[2]['result']['name'] == "Docs"
+
+    def test_quoted_words_stay_positional(self):
+        _, failures, results = run([
+            'create_project Docs Description',
+            'create_task 1 "a=b" "--draft"',
+            "create_task 1 'x = y' Description --deadline 2999-01-01",
+            'create_task 1 -- --title deadline=soon',
+            'update_task 1 description="c=d --e"',
+        ])
+
+        assert failures == 0
+        assert (results[1]['result']['title'], results[1]['result']['description']) == ("a=b", "--draft")
+        assert results[2]['result']['title'] == "x = y"
+        assert results[2]['result']['deadline'].startswith("2999-01-01")
+        assert (results[3]['result']['title'], results[3]['result']['description']) == ("--title", "deadline=soon")
+        assert results[4]['result']['description'] == "c=d --e"
+
+    def test_arguments_are_checked_before_the_call(self):
+        _, failures, results = run([
+            'create_project Docs Description',
+            '{"op": "update_task", "task_id": 1, "priority": "high"}',
+            '{"op": "list_tasks", "project_id": 1, "limit": true}',
+            'get_project',
+        ])
+
+        assert failures == 3
+        assert [r.get('error') for r in results[1:]] == ["BatchCommandError"] * 3
+
+        # خطای خود دستور (باگ) بسته‌بندی نمی‌شود
+        with pytest.raises(AttributeError):
+            run_batch(object(), ['list_projects'], io.BytesIO())
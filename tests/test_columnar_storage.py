@@ -0,0 +1,143 @@
+import pytest
+from datetime import datetime, timedelta
+from src.todolist.core.project import Project
+from src.todolist.core.task import Task
+from src.todolist.storage.columnar_storage import ColumnarMemoryStorage
+
+# ددلاین‌ها نسبت به اکنون ساخته می‌شوند تا تست‌ها با گذشت زمان گذشته نشوند
+_BASE = datetime.now().replace(microsecond=0) + timedelta(days=400)
+
+def _day(offset):
+    return _BASE + timedelta(days=offset)
+
+class TestColumnarMemoryStorage:
+    def _populate(self, storage):
+        project = storage.create_project(Project("Project", "Description"))
+        other = storage.create_project(Project("Other", "Description"))
+        tasks = [storage.create_task(Task(f"Task {i}", "Description"), project.id) for i in range(4)]
+        other_task = storage.create_task(Task("Other task", "Description"), other.id)
+        return project, other, tasks, other_task
+
+    def test_views_expose_task_interface(self):
+        storage = ColumnarMemoryStorage()
+        project, _, tasks, _ = self._populate(storage)
+
+        task = storage.get_task(tasks[2].id)
+        assert task.title == "Task 2"
+        assert task.project_id == project.id
+        assert task.status.value == "todo"
+        assert task.deadline is None
+        assert task.to_dict()['id'] == tasks[2].id
+        assert "Task 2" in str(task)
+        assert storage.get_project_tasks(project.id) == tasks
+
+    def test_mutations_update_columns_and_counters(self):
+        storage = ColumnarMemoryStorage()
+        project, other, tasks, other_task = self._populate(storage)
+
+        storage.change_task_status(tasks[0].id, "done")
+        storage.update_task(tasks[1].id, title="Renamed", status="doing")
+        storage.delete_task(tasks[3].id)
+
+        assert storage.get_task(tasks[1].id).title == "Renamed"
+        assert storage.search_tasks("renamed") == [tasks[1]]
+        assert storage.search_tasks("task 3") == []
+        with pytest.raises(Exception):  # Should raise TaskNotFoundError
+            storage.get_task(tasks[3].id)
+        with pytest.raises(Exception):  # Should raise ValidationError
+            storage.update_task(tasks[2].id, title="", status="done")
+        assert storage.get_task(tasks[2].id).status.value == "todo"
+
+        assert storage.count_tasks() == 4
+        assert storage.count_tasks("done") == 1
+        assert storage.query(status="todo") == [tasks[2], other_task]
+        assert storage.query(status="doing", project_id=project.id) == [tasks[1]]
+
+        storage.update_task(tasks[2].id, deadline=_day(31))
+        storage.update_task(other_task.id, deadline=_day(0))
+        assert storage.query(due_before=_day(14)) == [other_task]
+        assert storage.query(order_by="deadline", limit=3) == [other_task, tasks[2], tasks[0]]
+
+        storage.delete_project(other.id)
+        stats = storage.get_statistics()
+        assert (stats['total_tasks'], stats['todo_tasks'], stats['doing_tasks'], stats['done_tasks']) == (3, 1, 1, 1)
+
+    def test_text_index_is_built_on_first_search(self):
+        storage = ColumnarMemoryStorage()
+        project, other, tasks, other_task = self._populate(storage)
+        assert len(storage._task_text) == 0
+
+        storage.update_task(tasks[0].id, title="Draft")
+        assert storage.search_tasks("draft") == [tasks[0]]
+        assert len(storage._task_text) == 5
+
+        # پس از ساخته شدن، ایندکس همراه ردیف‌ها به‌روز می‌ماند
+        storage.update_task(tasks[0].id, description="Final draft")
+        storage.update_task(tasks[1].id, title="Draft")
+        storage.delete_project(other.id)
+        assert storage.search_tasks("draft") == [tasks[0], tasks[1]]
+        assert storage.search_tasks("other") == []
+        assert len(storage._task_text) == 4
+
+    def test_compact_drops_deleted_rows(self):
+        storage = ColumnarMemoryStorage()
+        project, other, tasks, _ = self._populate(storage)
+        last_id = tasks[3].id
+        storage.delete_task(tasks[0].id)
+        storage.delete_project(other.id)
+
+        storage.compact()
+
+        assert len(storage._ids) == 3
+        assert [t.title for t in storage.get_project_tasks(project.id)] == ["Task 1", "Task 2", "Task 3"]
+        assert storage.get_task(last_id).title == "Task 3"
+
+    def test_bulk_operations(self):
+        storage = ColumnarMemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        tasks = storage.create_tasks(project.id, [Task(f"Task {i}", "Description") for i in range(3)])
+
+        with pytest.raises(Exception):  # Should raise ValidationError
+            storage.update_tasks({tasks[0].id: {"title": "Changed"}, tasks[1].id: {"status": "unknown"}})
+        assert tasks[0].title == "Task 0"
+
+        storage.change_status_many([tasks[0].id, tasks[1].id], "done")
+        storage.delete_tasks([tasks[2].id])
+        assert storage.count_tasks("done") == 2
+        assert storage.get_statistics()['total_tasks'] == 2
+
+    def test_pop_overdue_and_upcoming(self):
+        storage = ColumnarMemoryStorage()
+        project, _, tasks, other_task = self._populate(storage)
+        storage.update_task(tasks[0].id, deadline=_day(31))
+        storage.update_task(tasks[1].id, deadline=_day(0), status="done")
+        storage.update_task(other_task.id, deadline=_day(0))
+
+        assert storage.upcoming(timedelta(days=60), now=_day(-31)) == [other_task]
+        assert storage.pop_overdue(_day(59)) == [other_task, tasks[0]]
+        assert storage.count_tasks("done") == 3
+
+    def test_open_deadline_index_follows_mutations(self):
+        storage = ColumnarMemoryStorage()
+        project, other, tasks, other_task = self._populate(storage)
+        for i, task in enumerate(tasks):
+            storage.update_task(task.id, deadline=_day(9 - i))
+        storage.update_task(other_task.id, deadline=_day(0))
+
+        storage.change_task_status(tasks[0].id, "done")
+        storage.change_task_status(tasks[0].id, "doing")  # دوباره باز
+        storage.change_task_status(tasks[1].id, "done")
+        storage.update_task(tasks[2].id, deadline=_day(151))
+        storage.delete_task(tasks[3].id)
+        storage.delete_project(other.id)
+        storage.compact()
+
+        now = _day(31)
+        assert [t.title for t in storage.upcoming(timedelta(days=200), now)] == ["Task 2"]
+        assert [t.title for t in storage.pop_overdue(now)] == ["Task 0"]
+        assert storage.pop_overdue(now) == []
+
+    def test_read_view_is_unsupported(self):
+        storage = ColumnarMemoryStorage()
+        with pytest.raises(Exception):  # Should raise UnsupportedOperationError
+            storage.read_view()
@@ -0,0 +1,178 @@
+import os
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta
+from src.todolist.core.project import Project
+from src.todolist.core.task import Task
+from src.todolist.storage.durable_storage import DurableMemoryStorage
+from src.todolist.storage.journal import Journal
+
+# ددلاین‌ها نسبت به اکنون ساخته می‌شوند تا تست‌ها با گذشت زمان گذشته نشوند
+_BASE = datetime.now().replace(microsecond=0) + timedelta(days=400)
+
+def _day(offset):
+    return _BASE + timedelta(days=offset)
+
+def _dump(storage):
+    return (
+        [p.to_dict() for p in storage.get_all_projects()],
+        [t.to_dict() for t in storage.tasks],
+        storage.get_statistics(),
+        (storage.next_project_id, storage.next_task_id),
+    )
+
+class TestDurableMemoryStorage:
+    def _populate(self, storage):
+        project = storage.create_project(Project("Project", "Description"))
+        other = storage.create_project(Project("Other", "Description"))
+        first = storage.create_task(Task("First", "Description"), project.id)
+        second = storage.create_task(Task("Second", "Description"), project.id)
+        storage.create_task(Task("Third", "Description"), other.id)
+        storage.change_task_status(first.id, "done")
+        storage.update_task(second.id, title="Second (edited)", status="doing")
+        storage.update_project(project.id, name="Renamed")
+        storage.delete_task(first.id)
+        storage.delete_project(other.id)
+        bulk = storage.create_tasks(project.id, [Task(f"Bulk {i}", "Description") for i in range(3)])
+        storage.change_status_many([bulk[0].id, bulk[1].id], "done")
+        storage.update_tasks({bulk[2].id: {"title": "Bulk edited"}})
+        storage.delete_tasks([bulk[1].id])
+        storage.update_task(bulk[2].id, deadline=_day(0))
+        storage.pop_overdue(_day(151))
+
+    def test_recovers_from_journal(self, tmp_path):
+        with DurableMemoryStorage(str(tmp_path), snapshot_every=0) as storage:
+            self._populate(storage)
+            expected = _dump(storage)
+
+        with DurableMemoryStorage(str(tmp_path)) as recovered:
+            assert _dump(recovered) == expected
+            assert recovered.get_project_by_name("Renamed").id == 1
+
+    def test_recovers_from_snapshot_and_journal_tail(self, tmp_path):
+        with DurableMemoryStorage(str(tmp_path), snapshot_every=4) as storage:
+            self._populate(storage)
+            expected = _dump(storage)
+
+        assert os.path.exists(tmp_path / "snapshot.bin")
+        assert len([n for n in os.listdir(tmp_path) if n.startswith("journal.")]) == 1
+
+        with DurableMemoryStorage(str(tmp_path)) as recovered:
+            assert _dump(recovered) == expected
+            # شناسه‌ها پس از بازیابی تکرار نمی‌شوند
+            task = recovered.create_task(Task("New", "Description"), 1)
+            assert task.id == expected[3][1]
+
+    def test_ignores_torn_journal_tail(self, tmp_path):
+        with DurableMemoryStorage(str(tmp_path), snapshot_every=0) as storage:
+            storage.create_project(Project("Project", "Description"))
+            journal_path = storage._journal.path
+        with open(journal_path, "ab") as f:
+            f.write(b'["create_project",[2,"Bro')
+
+        with DurableMemoryStorage(str(tmp_path)) as recovered:
+            assert [p.name for p in recovered.get_all_projects()] == ["Project"]
+            recovered.create_project(Project("Second", "Description"))
+
+        with DurableMemoryStorage(str(tmp_path)) as recovered:
+            assert [p.name for p in recovered.get_all_projects()] == ["Project", "Second"]
+
+    def test_snapshot_tasks_are_loaded_lazily(self, tmp_path):
+        with DurableMemoryStorage(str(tmp_path), snapshot_every=0) as storage:
+            self._populate(storage)
+            storage.create_task(Task("فارسی", "توضیحات"), 1)
+            storage.snapshot()
+            expected = _dump(storage)
+
+        with DurableMemoryStorage(str(tmp_path)) as recovered:
+            # آمار و پروژه‌ها بدون ساختن هیچ تسکی در دسترس‌اند
+            assert recovered.get_statistics() == expected[2]
+            assert [p.name for p in recovered.get_all_projects()] == ["Renamed"]
+            assert len(dict.keys(recovered._tasks)) == 0
+
+            task = recovered.get_task(expected[3][1] - 1)
+            assert task.title == "فارسی"
+            assert _dump(recovered) == expected
+
+    def test_delete_unloaded_project(self, tmp_path):
+        with DurableMemoryStorage(str(tmp_path), snapshot_every=0) as storage:
+            self._populate(storage)
+            storage.snapshot()
+
+        with DurableMemoryStorage(str(tmp_path)) as recovered:
+            recovered.delete_project(1)
+            assert recovered.get_statistics()['total_tasks'] == 0
+            with pytest.raises(Exception):  # Should raise TaskNotFoundError
+                recovered.get_task(2)
+
+        with DurableMemoryStorage(str(tmp_path)) as recovered:
+            assert recovered.get_all_projects() == []
+            assert recovered.tasks == []
+
+    def test_overdue_faults_in_only_matching_projects(self, tmp_path):
+        with DurableMemoryStorage(str(tmp_path), snapshot_every=0) as storage:
+            due = storage.create_project(Project("Due", "Description"))
+            later = storage.create_project(Project("Later", "Description"))
+            idle = storage.create_project(Project("Idle", "Description"))
+            overdue = storage.create_task(Task("Overdue", "Description"), due.id)
+            closed = storage.create_task(Task("Closed", "Description"), idle.id)
+            soon = storage.create_task(Task("Soon", "Description"), later.id)
+            storage.create_task(Task("Undated", "Description"), idle.id)
+            storage.update_task(overdue.id, deadline=_day(0))
+            storage.update_task(closed.id, deadline=_day(0), status="done")
+            storage.update_task(soon.id, deadline=_day(59))
+            storage.snapshot()
+
+        with DurableMemoryStorage(str(tmp_path)) as recovered:
+            now = _day(31)
+            assert [t.id for t in recovered.upcoming(timedelta(days=30), now)] == [soon.id]
+            assert set(recovered._unloaded_projects) == {due.id, idle.id}
+
+            assert [t.id for t in recovered.pop_overdue(now)] == [overdue.id]
+            assert set(recovered._unloaded_projects) == {idle.id}
+            assert recovered.pop_overdue(now) == []
+
+        with DurableMemoryStorage(str(tmp_path)) as recovered:
+            assert recovered.get_task(overdue.id).status.value == "done"
+
+    def test_reads_fault_in_under_write_lock(self, tmp_path, monkeypatch):
+        with DurableMemoryStorage(str(tmp_path), snapshot_every=0) as storage:
+            projects = [storage.create_project(Project(f"Project {i}", "Description")) for i in range(7)]
+            for project in projects:
+                storage.create_task(Task("Task", "Description"), project.id)
+            storage.update_task(1, deadline=datetime.now() + timedelta(days=1))
+            storage.snapshot()
+
+        with DurableMemoryStorage(str(tmp_path), thread_safe=True) as recovered:
+            fault_in = recovered._fault_in_project
+            holders = []
+
+            def checked(project_id):
+                holders.append(recovered._lock._writer == threading.get_ident())
+                return fault_in(project_id)
+            monkeypatch.setattr(recovered, "_fault_in_project", checked)
+
+            assert recovered.get_task(2).project_id == 2
+            assert len(recovered.get_project_tasks(3)) == 1
+            assert len(list(recovered.iter_project_tasks(4))) == 1
+            assert [t.id for t in recovered.upcoming(timedelta(days=2))] == [1]
+            assert len(recovered.search_tasks("task")) == 7
+            assert holders and all(holders)
+            assert recovered._unloaded_projects == {}
+
+class TestJournal:
+    def test_partial_group_is_synced_after_commit_interval(self, tmp_path):
+        journal = Journal(str(tmp_path / "journal.log"), group_size=1000, commit_interval=0.05)
+        try:
+            journal.append(["create_project", [1, "Project"]])
+            assert journal._pending == 1
+            deadline = time.monotonic() + 5
+            while journal._pending and time.monotonic() < deadline:
+                time.sleep(0.01)
+            # بدون نوشتن بعدی، نخ پس‌زمینه گروه ناقص را روی دیسک نوشته است
+            assert journal._pending == 0
+            assert list(Journal.replay(journal.path)) == [["create_project", [1, "Project"]]]
+        finally:
+            journal.close()
+        assert not journal._flusher.is_alive()
@@ -0,0 +1,536 @@
+import random
+import sys
+import threading
+import pytest
+from datetime import datetime, timedelta
+from src.todolist.config.settings import settings
+from src.todolist.core.project import Project
+from src.todolist.core.task import Task
+from src.todolist.storage import memory_storage
+from src.todolist.storage.memory_storage import MemoryStorage
+
+# ددلاین‌ها نسبت به اکنون ساخته می‌شوند تا تست‌ها با گذشت زمان گذشته نشوند
+_BASE = datetime.now().replace(microsecond=0) + timedelta(days=400)
+
+def _day(offset):
+    return _BASE + timedelta(days=offset)
+
+class TestMemoryStorageIndexes:
+    def test_get_project_and_task_by_id(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        task = storage.create_task(Task("Task", "Description"), project.id)
+
+        assert storage.get_project(project.id) is project
+        assert storage.get_task(task.id) is task
+        assert storage.get_project_by_name("Project") is project
+
+    def test_rename_project_updates_name_index(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Old Name", "Description"))
+        storage.update_project(project.id, name="New Name")
+
+        assert storage.get_project_by_name("New Name") is project
+        with pytest.raises(Exception):  # Should raise ProjectNotFoundError
+            storage.get_project_by_name("Old Name")
+
+        # نام قدیمی دوباره قابل استفاده است
+        storage.create_project(Project("Old Name", "Description"))
+
+    def test_delete_project_removes_its_tasks(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        other = storage.create_project(Project("Other", "Description"))
+        task = storage.create_task(Task("Task", "Description"), project.id)
+        other_task = storage.create_task(Task("Task", "Description"), other.id)
+
+        storage.delete_project(project.id)
+
+        with pytest.raises(Exception):  # Should raise TaskNotFoundError
+            storage.get_task(task.id)
+        assert storage.get_task(other_task.id) is other_task
+        assert storage.tasks == [other_task]
+
+class TestMemoryStorageOrdering:
+    def test_reads_keep_creation_order_after_delete(self):
+        storage = MemoryStorage()
+        first = storage.create_project(Project("First", "Description"))
+        second = storage.create_project(Project("Second", "Description"))
+        tasks = [storage.create_task(Task(f"Task {i}", "Description"), first.id) for i in range(4)]
+
+        storage.delete_task(tasks[1].id)
+
+        assert storage.get_all_projects() == [first, second]
+        assert storage.get_project_tasks(first.id) == [tasks[0], tasks[2], tasks[3]]
+        assert list(storage.iter_project_tasks(second.id)) == []
+
+class TestMemoryStorageStatistics:
+    def test_statistics_follow_mutations(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        other = storage.create_project(Project("Other", "Description"))
+        first = storage.create_task(Task("First", "Description"), project.id)
+        second = storage.create_task(Task("Second", "Description"), project.id)
+        storage.create_task(Task("Third", "Description"), other.id)
+
+        storage.change_task_status(first.id, "done")
+        storage.update_task(second.id, status="doing")
+
+        stats = storage.get_statistics()
+        assert stats['total_projects'] == 2
+        assert stats['total_tasks'] == 3
+        assert (stats['todo_tasks'], stats['doing_tasks'], stats['done_tasks']) == (1, 1, 1)
+
+        project_stats = storage.get_project_statistics(project.id)
+        assert project_stats['total_tasks'] == 2
+        assert project_stats['completion_rate'] == 50
+
+        storage.delete_task(second.id)
+        storage.delete_project(other.id)
+
+        stats = storage.get_statistics()
+        assert stats['total_tasks'] == 1
+        assert (stats['todo_tasks'], stats['doing_tasks'], stats['done_tasks']) == (0, 0, 1)
+
+    def test_project_task_count_is_live(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        first = storage.create_task(Task("First", "Description"), project.id)
+        storage.create_tasks(project.id, [Task("Bulk", "Description"), Task("Bulk", "Description")])
+        assert project.to_dict()['task_count'] == 3
+
+        with storage.read_view() as view:
+            storage.delete_task(first.id)
+            assert storage.get_project(project.id).task_count == 2
+            assert view.get_project(project.id).task_count == 3
+        assert str(storage.get_project(project.id)) == "📁 Project (2 تسک)"
+
+    def test_failed_update_keeps_counters_consistent(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        task = storage.create_task(Task("Task", "Description"), project.id)
+
+        with pytest.raises(Exception):  # Should raise ValidationError
+            storage.update_task(task.id, status="done", deadline=datetime(2000, 1, 1))
+
+        stats = storage.get_statistics()
+        assert stats[f"{task.status.value}_tasks"] == 1
+        assert stats['total_tasks'] == 1
+
+class TestMemoryStorageBulk:
+    def test_create_tasks_assigns_block_of_ids(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        storage.create_task(Task("Single", "Description"), project.id)
+
+        tasks = storage.create_tasks(project.id, (Task(f"Task {i}", "Description") for i in range(3)))
+
+        assert [t.id for t in tasks] == [2, 3, 4]
+        assert storage.get_project_statistics(project.id)['total_tasks'] == 4
+
+    def test_create_tasks_is_all_or_nothing_on_limit(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        too_many = [Task("Task", "Description") for _ in range(settings.MAX_NUMBER_OF_TASKS_PER_PROJECT + 1)]
+
+        with pytest.raises(Exception):  # Should raise LimitExceededError
+            storage.create_tasks(project.id, too_many)
+        assert storage.get_project_tasks(project.id) == []
+        assert storage.next_task_id == 1
+
+    def test_update_tasks_rolls_back_on_error(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        first, second = storage.create_tasks(project.id, [Task("First", "Description"), Task("Second", "Description")])
+
+        with pytest.raises(Exception):  # Should raise ValidationError
+            storage.update_tasks({first.id: {"title": "Changed", "status": "done"}, second.id: {"title": ""}})
+
+        assert (first.title, first.status.value) == ("First", "todo")
+        assert storage.get_statistics()['done_tasks'] == 0
+
+        storage.update_tasks({first.id: {"status": "done"}, second.id: {"title": "Changed"}})
+        assert second.title == "Changed"
+        assert storage.get_statistics()['done_tasks'] == 1
+
+    def test_delete_and_change_status_many(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        tasks = storage.create_tasks(project.id, [Task(f"Task {i}", "Description") for i in range(4)])
+
+        with pytest.raises(Exception):  # Should raise TaskNotFoundError
+            storage.delete_tasks([tasks[0].id, 999])
+        assert len(storage.get_project_tasks(project.id)) == 4
+
+        assert storage.delete_tasks([tasks[0].id, tasks[1].id, tasks[1].id]) == 2
+        storage.change_status_many([tasks[2].id, tasks[3].id, tasks[3].id], "doing")
+
+        stats = storage.get_project_statistics(project.id)
+        assert (stats['total_tasks'], stats['doing_tasks']) == (2, 2)
+        with pytest.raises(Exception):  # Should raise ValidationError
+            storage.change_status_many([tasks[2].id], "unknown")
+
+class TestMemoryStorageImport:
+    def test_import_tasks_reports_invalid_rows(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        titles = ["Valid", "", "T" * 31, "   ", None, "Also valid"]
+        descriptions = ["Description", "Description", "Description", "", "Description", "Description"]
+
+        tasks, report = storage.import_tasks(project.id, titles, descriptions)
+
+        assert [t.title for t in tasks] == ["Valid", "Also valid"]
+        assert [t.id for t in storage.get_project_tasks(project.id)] == [t.id for t in tasks]
+        assert report.valid == [0, 5] and not report.ok
+        assert sorted(report.errors) == [1, 2, 3, 4]
+        assert len(report.errors[3]) == 2
+        assert report.to_dict()['errors'][0] == {'row': 1, 'messages': report.errors[1]}
+        with pytest.raises(Exception):  # Should raise ValidationError
+            storage.import_tasks(project.id, ["Title"], [])
+
+    def test_import_projects_reports_duplicates(self):
+        storage = MemoryStorage()
+        storage.create_project(Project("Existing", "Description"))
+
+        projects, report = storage.import_projects(["New", "Existing", "", "New"], ["Description"] * 4)
+
+        assert [p.name for p in projects] == ["New"]
+        assert report.valid == [0]
+        assert sorted(report.errors) == [1, 2, 3]
+        assert storage.get_project_by_name("New").id == projects[0].id
+
+class TestMemoryStorageQuery:
+    def test_query_filters_and_orders(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        other = storage.create_project(Project("Other", "Description"))
+        tasks = storage.create_tasks(project.id, [Task(f"Task {i}", "Description") for i in range(4)])
+        other_task = storage.create_task(Task("Other", "Description"), other.id)
+        storage.update_task(tasks[0].id, deadline=_day(59))
+        storage.update_task(tasks[1].id, deadline=_day(0), status="doing")
+        storage.update_task(tasks[2].id, deadline=_day(31))
+        storage.update_task(other_task.id, deadline=_day(-365))
+
+        assert storage.query(status="todo", project_id=project.id) == [tasks[0], tasks[2], tasks[3]]
+        assert storage.query(due_before=_day(45)) == [tasks[1], tasks[2], other_task]
+        assert storage.query(project_id=project.id, order_by="deadline") == [tasks[1], tasks[2], tasks[0], tasks[3]]
+        assert storage.query(due_before=_day(365), order_by="deadline", limit=2) == [other_task, tasks[1]]
+        with pytest.raises(Exception):  # Should raise ValidationError
+            storage.query(order_by="title")
+
+    def test_query_pages_with_offset(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        tasks = storage.create_tasks(project.id, [Task(f"Task {i}", "Description") for i in range(5)])
+        storage.update_task(tasks[4].id, deadline=_day(0))
+        storage.update_task(tasks[1].id, deadline=_day(31))
+        storage.change_status_many([tasks[0].id, tasks[2].id, tasks[3].id], "done")
+
+        assert storage.query(project_id=project.id, limit=2, offset=1) == [tasks[1], tasks[2]]
+        assert storage.query(status="done", limit=2, offset=2) == [tasks[3]]
+        assert storage.query(order_by="deadline", limit=2, offset=1) == [tasks[1], tasks[0]]
+        assert storage.query(project_id=project.id, offset=4) == [tasks[4]]
+        with pytest.raises(Exception):  # Should raise ValidationError
+            storage.query(offset=-1)
+
+    def test_query_indexes_follow_mutations(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        tasks = storage.create_tasks(project.id, [Task(f"Task {i}", "Description") for i in range(3)])
+        storage.update_task(tasks[0].id, deadline=_day(0))
+
+        storage.update_task(tasks[0].id, deadline=_day(151))
+        storage.change_task_status(tasks[1].id, "done")
+        storage.delete_task(tasks[2].id)
+
+        assert storage.query(due_before=_day(31)) == []
+        assert storage.query(due_before=_day(181)) == [tasks[0]]
+        assert storage.query(status="todo") == [tasks[0]]
+        assert storage.query(status="done") == [tasks[1]]
+
+        storage.delete_project(project.id)
+        assert storage.query(due_before=_day(181)) == []
+        assert storage.query(status="done") == []
+
+class TestMemoryStorageDeadlines:
+    def test_pop_overdue_closes_only_open_overdue_tasks(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        tasks = storage.create_tasks(project.id, [Task(f"Task {i}", "Description") for i in range(4)])
+        storage.update_task(tasks[0].id, deadline=_day(31))
+        storage.update_task(tasks[1].id, deadline=_day(0), status="doing")
+        storage.update_task(tasks[2].id, deadline=_day(14), status="done")
+        storage.update_task(tasks[3].id, deadline=_day(151))
+
+        assert storage.upcoming(timedelta(days=45), now=_day(-1)) == [tasks[1], tasks[0]]
+
+        closed = storage.pop_overdue(_day(59))
+
+        assert closed == [tasks[1], tasks[0]]
+        assert all(task.status.value == "done" for task in closed)
+        assert storage.get_statistics()['done_tasks'] == 3
+        assert storage.pop_overdue(_day(59)) == []
+        assert storage.upcoming(timedelta(days=365), now=_day(59)) == [tasks[3]]
+
+    def test_reopened_and_deleted_tasks_follow_deadline_index(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        first, second = storage.create_tasks(project.id, [Task("First", "Description"), Task("Second", "Description")])
+        storage.update_task(first.id, deadline=_day(0), status="done")
+        storage.update_task(second.id, deadline=_day(0))
+
+        storage.change_task_status(first.id, "todo")
+        storage.delete_task(second.id)
+
+        assert storage.pop_overdue(_day(31)) == [first]
+
+class TestMemoryStorageSearch:
+    def test_search_normalizes_persian_variants(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        report = storage.create_task(Task("گزارش مالي", "تهيه گزارش براي مديريت"), project.id)
+        review = storage.create_task(Task("بازبینی کد", "بررسی کدهای گزارش‌گیری"), project.id)
+
+        # ي/ی و ك/ک یکسان و نیم‌فاصله حذف می‌شود
+        assert storage.search_tasks("مالی") == [report]
+        assert storage.search_tasks("كد") == [review]
+        assert storage.search_tasks("گزارشگیری") == [review]
+        # تسکی که کلمه را بیشتر تکرار کرده بالاتر می‌آید
+        assert storage.search_tasks("گزارش") == [report]
+        assert storage.search_tasks("گزار", prefix=True) == [report, review]
+        assert storage.search_tasks("گزارش بازبینی") == []
+
+    def test_search_indexes_follow_mutations(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Marketing plan", "Description"))
+        other = storage.create_project(Project("Other", "Description"))
+        task = storage.create_task(Task("Draft", "Description"), project.id)
+        other_task = storage.create_task(Task("Draft", "Description"), other.id)
+
+        storage.update_task(task.id, title="Final")
+        assert storage.search_tasks("draft") == [other_task]
+        assert storage.search_tasks("final") == [task]
+
+        storage.update_project(project.id, name="Sales plan")
+        assert storage.search_projects("mark") == []
+        assert storage.search_projects("sal") == [project]
+
+        storage.delete_project(other.id)
+        storage.delete_task(task.id)
+        assert storage.search_tasks("draft") == []
+        assert storage.search_tasks("final") == []
+        assert storage.search_projects("oth") == []
+
+    def test_limited_search_matches_full_ranking(self, monkeypatch):
+        monkeypatch.setattr(memory_storage.settings, "MAX_NUMBER_OF_TASKS_PER_PROJECT", 1_000)
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        rng = random.Random(7)
+        words = [f"w{i}" for i in range(20)]
+        text = lambda count: " ".join(rng.choice(words) for _ in range(count))
+        tasks = storage.create_tasks(project.id, (Task(text(2), text(rng.randint(1, 5))) for _ in range(600)))
+        # حذف و ویرایش اسناد برتر، لیست برتر کلمات را باطل می‌کند
+        for task in tasks[:150]:
+            if rng.random() < 0.5:
+                storage.delete_task(task.id)
+            else:
+                storage.update_task(task.id, title=text(3))
+
+        for query, prefix in (("w1", False), ("w1", True), ("w", True), ("w2 w3", False), ("w4 w1", True)):
+            ranked = storage.search_tasks(query, prefix=prefix)
+            for limit in (1, 10, 64, 100):
+                assert storage.search_tasks(query, prefix=prefix, limit=limit) == ranked[:limit]
+
+class TestMemoryStorageReadView:
+    def test_view_keeps_state_at_creation(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        other = storage.create_project(Project("Other", "Description"))
+        tasks = storage.create_tasks(project.id, [Task(f"Task {i}", "Description") for i in range(3)])
+        other_task = storage.create_task(Task("Other task", "Description"), other.id)
+
+        with storage.read_view() as view:
+            storage.update_task(tasks[0].id, title="Changed", status="done")
+            storage.update_project(project.id, name="Renamed")
+            storage.delete_task(tasks[1].id)
+            storage.delete_project(other.id)
+            storage.create_task(Task("New", "Description"), project.id)
+
+            assert [t.title for t in view.get_project_tasks(project.id)] == ["Task 0", "Task 1", "Task 2"]
+            assert view.get_task(tasks[0].id).status.value == "todo"
+            assert view.get_project(project.id).name == "Project"
+            assert view.get_all_projects() == [view.get_project(project.id), other]
+            assert view.tasks[-1] is other_task
+            assert view.get_statistics()['total_tasks'] == 4
+            assert view.get_project_statistics(other.id)['total_tasks'] == 1
+
+            # مخزن زنده همه تغییرات را می‌بیند
+            assert [t.title for t in storage.get_project_tasks(project.id)] == ["Changed", "Task 2", "New"]
+            assert storage.get_statistics()['total_tasks'] == 3
+
+        assert storage._task_history == {} and storage._deleted_projects == []
+
+    def test_views_see_their_own_versions(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Project", "Description"))
+        task = storage.create_task(Task("First", "Description"), project.id)
+
+        first = storage.read_view()
+        storage.update_task(task.id, title="Second")
+        second = storage.read_view()
+        storage.update_task(task.id, title="Third")
+        storage.update_task(task.id, title="Fourth")
+
+        assert first.get_task(task.id).title == "First"
+        assert second.get_task(task.id).title == "Second"
+        assert storage.get_task(task.id).title == "Fourth"
+        first.close()
+        assert second.get_task(task.id).title == "Second"
+        second.close()
+
+    def test_view_reads_are_consistent_during_writes(self):
+        storage = MemoryStorage(thread_safe=True)
+        project = storage.create_project(Project("Project", "Description"))
+        tasks = storage.create_tasks(project.id, [Task(f"Task {i}", "Description") for i in range(50)])
+        stop = threading.Event()
+
+        def writer():
+            i = 0
+            while not stop.is_set():
+                storage.update_tasks({task.id: {"title": f"Round {i}"} for task in tasks})
+                i += 1
+
+        with storage.read_view() as view:
+            thread = threading.Thread(target=writer)
+            thread.start()
+            try:
+                for _ in range(50):
+                    assert {t.title for t in view.get_project_tasks(project.id)} == {f"Task {i}" for i in range(50)}
+            finally:
+                stop.set()
+                thread.join()
+
+    def test_view_reads_wait_for_active_writer(self):
+        storage = MemoryStorage(thread_safe=True)
+        project = storage.create_project(Project("Project", "Description"))
+        task = storage.create_task(Task("Task", "Description"), project.id)
+        locked, release = threading.Event(), threading.Event()
+
+        def writer():
+            with storage._lock.write_locked():
+                locked.set()
+                release.wait()
+                storage.delete_task(task.id)
+
+        with storage.read_view() as view:
+            thread = threading.Thread(target=writer)
+            thread.start()
+            locked.wait()
+            reader = threading.Thread(target=lambda: view.get_project_tasks(project.id))
+            reader.start()
+            reader.join(0.1)
+            # نما ساختارهای زنده را تا پایان نوشتن نمی‌خواند
+            assert reader.is_alive()
+            release.set()
+            thread.join()
+            reader.join()
+            assert [t.id for t in view.get_project_tasks(project.id)] == [task.id]
+
+class TestConcurrentMemoryStorage:
+    THREADS = 16
+    OPERATIONS = 300
+
+    def _worker(self, storage, seed, errors):
+        rng = random.Random(seed)
+        try:
+            for _ in range(self.OPERATIONS):
+                action = rng.random()
+                projects = storage.get_all_projects()
+                try:
+                    if action < 0.1 or not projects:
+                        name = f"Project {rng.randrange(settings.MAX_NUMBER_OF_PROJECTS * 2)}"
+                        storage.create_project(Project(name, "Description"))
+                    elif action < 0.6:
+                        storage.create_task(Task("Task", "Description"), rng.choice(projects).id)
+                    elif action < 0.8:
+                        tasks = storage.get_project_tasks(rng.choice(projects).id)
+                        if tasks:
+                            storage.change_task_status(rng.choice(tasks).id, rng.choice(["todo", "doing", "done"]))
+                    elif action < 0.95:
+                        tasks = storage.get_project_tasks(rng.choice(projects).id)
+                        if tasks:
+                            storage.delete_task(rng.choice(tasks).id)
+                    else:
+                        storage.delete_project(rng.choice(projects).id)
+                except Exception as e:
+                    # رقابت روی محدودیت‌ها، نام تکراری یا حذف هم‌زمان مجاز است
+                    if "NotFound" not in type(e).__name__ and "Limit" not in type(e).__name__ \
+                            and "Duplicate" not in type(e).__name__:
+                        raise
+        except Exception as e:
+            errors.append(e)
+
+    def test_concurrent_imports_are_all_or_nothing(self):
+        storage = MemoryStorage(thread_safe=True)
+        start = threading.Barrier(self.THREADS)
+        old_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+        def importer(i):
+            start.wait()
+            try:
+                storage.import_projects([f"Import {i}-{j}" for j in range(3)], ["Description"] * 3)
+            except Exception as e:
+                if "Limit" not in type(e).__name__:
+                    raise
+
+        try:
+            threads = [threading.Thread(target=importer, args=(i,)) for i in range(self.THREADS)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(old_interval)
+
+        # بررسی سقف و درج‌ها اتمیک‌اند، پس هر ورود یا کامل انجام شده یا اصلاً انجام نشده
+        count = len(storage.get_all_projects())
+        assert count % 3 == 0
+        assert settings.MAX_NUMBER_OF_PROJECTS - 3 < count <= settings.MAX_NUMBER_OF_PROJECTS
+
+    def test_stress_keeps_invariants(self):
+        storage = MemoryStorage(thread_safe=True)
+        errors = []
+        old_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=self._worker, args=(storage, seed, errors))
+                       for seed in range(self.THREADS)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(old_interval)
+
+        assert errors == []
+
+        projects = storage.get_all_projects()
+        tasks = storage.tasks
+        assert len(projects) <= settings.MAX_NUMBER_OF_PROJECTS
+        assert len({p.name for p in projects}) == len(projects)
+        assert len({t.id for t in tasks}) == len(tasks)
+        assert all(t.id < storage.next_task_id for t in tasks)
+
+        project_ids = {p.id for p in projects}
+        assert all(t.project_id in project_ids for t in tasks)
+        for project in projects:
+            project_tasks = storage.get_project_tasks(project.id)
+            assert len(project_tasks) <= settings.MAX_NUMBER_OF_TASKS_PER_PROJECT
+            assert storage.get_project_statistics(project.id)['total_tasks'] == len(project_tasks)
+
+        stats = storage.get_statistics()
+        assert stats['total_projects'] == len(projects)
+        assert stats['total_tasks'] == len(tasks)
+        for status in ("todo", "doing", "done"):
+            assert stats[f"{status}_tasks"] == sum(1 for t in tasks if t.status.value == status)
@@ -1,8 +1,13 @@
+import json
 import pytest
+from datetime import datetime, timedelta
 from src.todolist.core.project import Project
+from src.todolist.core.task import Task, TaskStatus
 from src.todolist.core.exceptions import ValidationError
+from src.todolist.core.serialization import encode_json_list
 from src.todolist.storage.memory_storage import MemoryStorage
 
+
 class TestProject:
     def test_create_project_valid(self):
         project = Project("Test Project", "Test Description")
@@ -23,6 +28,7 @@ class TestProject:
         assert project.name == "New Name"
         assert project.description == "New Description"
 
+
 class TestProjectStorage:
     def test_create_project_in_storage(self):
         storage = MemoryStorage()
@@ -39,4 +45,50 @@ class TestProjectStorage:
         
         storage.create_project(project1)
         with pytest.raises(Exception):  # Should raise DuplicateProjectError
-            storage.create_project(project2)
\ No newline at end of file
+            storage.create_project(project2)
+
+
+class TestSerializationCache:
+    def test_to_dict_is_cached_until_field_changes(self):
+        project = Project("Test Project", "Test Description")
+        Project.cache_stats.reset()
+
+        first = project.to_dict()
+        first['name'] = "Mutated"
+        assert project.to_dict()['name'] == "Test Project"
+        assert Project.cache_stats.as_dict() == {'hits': 1, 'misses': 1}
+
+        project.update("New Name", None)
+        assert project.to_dict()['name'] == "New Name"
+        project.task_count = 1
+        assert project.to_dict()['task_count'] == 1
+        assert Project.cache_stats.misses == 3
+
+    def test_task_json_follows_direct_assignment(self):
+        storage = MemoryStorage()
+        project = storage.create_project(Project("Test Project", "Test Description"))
+        tasks = storage.create_tasks(project.id, [Task("پیش‌نویس", "توضیح"), Task("Other", "Description")])
+        payload = tasks[0].to_json()
+        assert tasks[0].to_json() is payload
+
+        storage.change_task_status(tasks[0].id, "done")
+        tasks[1].set_status("doing")
+        decoded = json.loads(encode_json_list(tasks))
+        assert [t['status'] for t in decoded] == ["done", "doing"]
+        assert decoded[0] == tasks[0].to_dict()
+        assert decoded[0]['title'] == "پیش‌نویس"
+
+
+class TestSlots:
+    def test_entities_are_slotted_and_round_trip(self):
+        project = Project("Test Project", "Test Description")
+        task = Task("Test Task", "Test Description")
+        assert not hasattr(project, '__dict__') and not hasattr(task, '__dict__')
+        assert project.to_dict()['task_count'] == 0 and task.created_at == task.updated_at
+
+        deadline = datetime.now().replace(microsecond=123456) + timedelta(days=1)
+        task.update(status="doing", deadline=deadline)
+        assert task.status is TaskStatus.DOING
+        assert task.deadline == deadline and task.updated_at >= task.created_at
+        task.deadline = None
+        assert task.deadline is None and task.to_dict()['deadline'] is None
@@ -0,0 +1,60 @@
+import pytest
+from src.todolist.core.project import Project
+from src.todolist.core.task import Task
+from src.todolist.storage.sharded_storage import ShardedMemoryStorage
+
+class TestShardedMemoryStorage:
+    @pytest.fixture
+    def storage(self):
+        storage = ShardedMemoryStorage(shards=3)
+        yield storage
+        storage.close()
+
+    def test_ids_are_unique_across_shards(self, storage):
+        projects = [storage.create_project(Project(f"Project {i}", "Description")) for i in range(4)]
+        tasks = [storage.create_task(Task(f"Task {i}", "Description"), projects[i % 4].id) for i in range(6)]
+        tasks += storage.create_tasks(projects[1].id, [Task("Bulk", "Description"), Task("Bulk", "Description")])
+
+        assert [p.id for p in storage.get_all_projects()] == [1, 2, 3, 4]
+        assert [t.id for t in storage.tasks] == list(range(1, 9))
+        assert storage.get_task(7).project_id == projects[1].id
+        assert storage.next_task_id == 9
+
+    def test_project_names_are_unique_cluster_wide(self, storage):
+        first = storage.create_project(Project("First", "Description"))
+        second = storage.create_project(Project("Second", "Description"))
+
+        with pytest.raises(Exception):  # Should raise DuplicateProjectError
+            storage.create_project(Project("First", "Description"))
+        with pytest.raises(Exception):  # Should raise DuplicateProjectError
+            storage.update_project(second.id, name="First")
+        with pytest.raises(Exception):  # Should raise ValidationError
+            storage.update_project(second.id, name="Third", description="")
+
+        storage.update_project(first.id, name="Renamed")
+        assert storage.get_project_by_name("Renamed").id == first.id
+        assert storage.get_project_by_name("Third").id == second.id
+        storage.delete_project(second.id)
+        storage.create_project(Project("First", "Description"))
+        with pytest.raises(Exception):  # Should raise ProjectNotFoundError
+            storage.get_project_by_name("Third")
+
+    def test_scatter_gather_statistics_and_query(self, storage):
+        projects = [storage.create_project(Project(f"Project {i}", "Description")) for i in range(3)]
+        tasks = [storage.create_task(Task(f"Task {i}", "Description"), projects[i % 3].id) for i in range(6)]
+        storage.change_status_many([tasks[0].id, tasks[4].id], "done")
+        storage.update_tasks({tasks[1].id: {"status": "doing"}, tasks[5].id: {"title": "Renamed"}})
+
+        stats = storage.get_statistics()
+        assert (stats['total_projects'], stats['total_tasks'], stats['done_tasks'], stats['doing_tasks']) == (3, 6, 2, 1)
+        assert [t.id for t in storage.query(status="todo")] == [tasks[2].id, tasks[3].id, tasks[5].id]
+        assert [t.id for t in storage.query(limit=2)] == [tasks[0].id, tasks[1].id]
+        assert storage.get_task(tasks[5].id).title == "Renamed"
+
+        with pytest.raises(Exception):  # Should raise TaskNotFoundError
+            storage.delete_tasks([tasks[2].id, 999])
+        assert storage.delete_tasks([tasks[2].id, tasks[3].id]) == 2
+        storage.delete_project(projects[0].id)
+        assert storage.get_statistics()['total_tasks'] == 3
+        with pytest.raises(Exception):  # Should raise TaskNotFoundError
+            storage.get_task(tasks[0].id)
@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+
+CLI_DIR = os.path.join(os.path.dirname(__file__), '..', 'src', 'todolist')
+# ماژول‌هایی که CLI پیش‌فرض (MemoryStorage، حالت تعاملی یا batch) نباید در شروع import کند
+DEFERRED = {
+    'argparse', 'sqlite3', 'mmap', 'multiprocessing', 'shlex', 'inspect',
+    'core.validation', 'storage.read_view', 'storage.durable_storage', 'storage.tiered_storage',
+}
+# بودجه import ماژول‌های CLI (بدون ماژول‌های شروع خود مفسر)، میلی‌ثانیه
+BUDGET_MS = float(os.getenv("TODOLIST_STARTUP_BUDGET_MS", "150"))
+
+def write_entry_point(directory: str):
+    """
+    بخش CLI فایل main.py (entry point todolist.main:main) را به‌عنوان ماژول todolist_main می‌نویسد
+
+    main.py هنوز نشانه‌های merge conflict دارد و خودش import نمی‌شود؛ طرف CLI
+    همان کدی است که entry point اجرا می‌کند. طرف FastAPI به
+    app.api.controllers.projects_controller نیاز دارد که در این درخت نیست.
+    """
+    with open(os.path.join(CLI_DIR, 'main.py'), encoding='utf-8') as f:
+        source = f.read()
+    if source.startswith('<<<<<<<'):
+        source = source.split('\n=======\n', 1)[1].rsplit('\n>>>>>>>', 1)[0]
+    with open(os.path.join(directory, 'todolist_main.py'), 'w', encoding='utf-8') as f:
+        f.write(source)
+
+def import_times(code: str, path: str = '', stdin: str = None) -> dict:
+    """(نام ماژول -> زمان self import به میکروثانیه از python -X importtime، خروجی stdout)"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=CLI_DIR, input=stdin,
+                            env={**os.environ, 'PYTHONPATH': path, 'STORAGE_DATA_DIR': '', 'STORAGE_TIERED': '0'},
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and not line.endswith('imported package'):
+            self_us, _, name = line[len('import time:'):].split('|')
+            if self_us.strip().isdigit():
+                times[name.strip()] = int(self_us)
+    return times, result.stdout
+
+def check_budget(times: dict, interpreter: dict, deferred: set):
+    loaded = set(times) - set(interpreter)
+    assert {'todolist_main', 'storage.memory_storage'} <= loaded
+    assert not loaded & deferred
+    cost_ms = sum(times[name] for name in loaded) / 1000
+    assert cost_ms < BUDGET_MS, f"CLI imports took {cost_ms:.1f}ms (budget {BUDGET_MS:.0f}ms)"
+
+class TestStartup:
+    def test_interactive_start_stays_within_budget(self, tmp_path):
+        write_entry_point(str(tmp_path))
+        interpreter, _ = import_times("pass")
+        times, _ = import_times("import todolist_main; todolist_main.ToDoListApp()", str(tmp_path))
+        check_budget(times, interpreter, DEFERRED)
+
+    def test_batch_entry_point_stays_within_budget(self, tmp_path):
+        write_entry_point(str(tmp_path))
+        interpreter, _ = import_times("pass")
+        code = "import sys; sys.argv = ['todolist', '--batch']; import todolist_main; todolist_main.main()"
+        times, output = import_times(code, str(tmp_path), stdin="create_project Docs Description\nstats\n")
+
+        assert [json.loads(line)['ok'] for line in output.splitlines()] == [True, True]
+        # main() خودش argparse را import می‌کند؛ بقیه همچنان به تعویق می‌افتند
+        check_budget(times, interpreter, DEFERRED - {'argparse'})
@@ -0,0 +1,105 @@
+import importlib.util
+import os
+import pytest
+
+pytest.importorskip("sqlalchemy")
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from src.todo_list.infrastructure.database.models import task as task_models
+from src.todo_list.infrastructure.database.models.task import TaskModel, TaskStatus
+
+MIGRATION = os.path.join(os.path.dirname(__file__), "..", "alembic", "versions",
+                         "3f1c2a9d7b45_project_task_counters.py")
+
+COUNTERS_DDL = ("task_count INTEGER NOT NULL DEFAULT 0, todo_count INTEGER NOT NULL DEFAULT 0, "
+                "doing_count INTEGER NOT NULL DEFAULT 0, done_count INTEGER NOT NULL DEFAULT 0")
+TASKS_DDL = ("CREATE TABLE tasks (id INTEGER PRIMARY KEY, title VARCHAR(30) NOT NULL, "
+             "description VARCHAR(150) NOT NULL, status VARCHAR(5), deadline DATETIME, created_at DATETIME, "
+             "closed_at DATETIME, project_id INTEGER REFERENCES projects (id) ON DELETE CASCADE)")
+
+def _create_schema(connection, counters: bool = True):
+    # جدول‌ها مثل migrationها ساخته می‌شوند؛ مدل Project به پایگاه app.db.base وابسته است
+    columns = "id INTEGER PRIMARY KEY, name VARCHAR(30) NOT NULL" + (", " + COUNTERS_DDL if counters else "")
+    connection.execute(text(f"CREATE TABLE projects ({columns})"))
+    connection.execute(text(TASKS_DDL))
+    connection.execute(text("INSERT INTO projects (id, name) VALUES (1, 'First'), (2, 'Second')"))
+
+def _counters(connection, project_id: int) -> tuple:
+    return tuple(connection.execute(
+        text("SELECT task_count, todo_count, doing_count, done_count FROM projects WHERE id = :id"),
+        {"id": project_id},
+    ).one())
+
+class TestTaskCounters:
+    @pytest.fixture
+    def session(self):
+        engine = create_engine("sqlite://")
+        with engine.begin() as connection:
+            _create_schema(connection)
+        with Session(engine) as session:
+            yield session
+        engine.dispose()
+
+    def _task(self, project_id: int, **kwargs) -> TaskModel:
+        return TaskModel(title="Task", description="Description", project_id=project_id, **kwargs)
+
+    def test_insert_status_change_move_and_delete(self, session):
+        task = self._task(1)
+        session.add_all([task, self._task(1, status=TaskStatus.DONE)])
+        session.flush()
+        assert _counters(session, 1) == (2, 1, 0, 1)
+
+        task.status = TaskStatus.DOING
+        session.flush()
+        assert _counters(session, 1) == (2, 0, 1, 1)
+
+        # Enum(TaskStatus) نام عضو را ذخیره می‌کند و رشته نام را هم قبول می‌کند
+        task.status = "DONE"
+        session.flush()
+        assert _counters(session, 1) == (2, 0, 0, 2)
+
+        task.project_id = 2
+        session.flush()
+        assert _counters(session, 1) == (1, 0, 0, 1)
+        assert _counters(session, 2) == (1, 0, 0, 1)
+
+        session.delete(task)
+        session.flush()
+        assert _counters(session, 2) == (0, 0, 0, 0)
+
+        session.commit()
+        stored = session.execute(text("SELECT status FROM tasks")).scalar_one()
+        assert stored == "DONE"
+
+    def test_limit_is_checked_in_the_insert(self, session, monkeypatch):
+        monkeypatch.setattr(task_models, "MAX_NUMBER_OF_TASKS_PER_PROJECT", 1)
+        session.add(self._task(1))
+        session.flush()
+
+        session.add(self._task(1))
+        with pytest.raises(Exception):  # Should raise TaskLimitExceededError
+            session.flush()
+        session.rollback()
+        assert _counters(session, 1) == (0, 0, 0, 0)
+
+    def test_migration_backfills_counters_from_stored_names(self):
+        pytest.importorskip("alembic")
+        from alembic.migration import MigrationContext
+        from alembic.operations import Operations
+
+        spec = importlib.util.spec_from_file_location("project_task_counters", MIGRATION)
+        migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(migration)
+
+        engine = create_engine("sqlite://")
+        with engine.begin() as connection:
+            _create_schema(connection, counters=False)
+            connection.execute(text(
+                "INSERT INTO tasks (title, description, status, project_id) VALUES "
+                "('a', 'd', 'TODO', 1), ('b', 'd', 'DONE', 1), ('c', 'd', 'DONE', 1), ('d', 'd', 'DOING', 2)"))
+            with Operations.context(MigrationContext.configure(connection)):
+                migration.upgrade()
+            assert _counters(connection, 1) == (3, 1, 0, 2)
+            assert _counters(connection, 2) == (1, 0, 1, 0)
+        engine.dispose()
@@ -0,0 +1,117 @@
+import pytest
+from datetime import datetime, timedelta
+from src.todolist.core.project import Project
+from src.todolist.core.task import Task
+from src.todolist.storage.tiered_storage import TieredMemoryStorage
+
+class TestTieredMemoryStorage:
+    @pytest.fixture
+    def storage(self, tmp_path):
+        storage = TieredMemoryStorage(str(tmp_path / "cold.sqlite3"), cold_after=60, resident_budget=2)
+        yield storage
+        storage.close()
+
+    def _populate(self, storage):
+        project = storage.create_project(Project("Project", "Description"))
+        tasks = storage.create_tasks(project.id, [Task(f"Task {i}", "Description") for i in range(6)])
+        storage.change_status_many([t.id for t in tasks[:4]], "done")
+        return project, tasks
+
+    def test_budget_evicts_least_recently_used_done_tasks(self, storage):
+        project, tasks = self._populate(storage)
+
+        assert storage.resident_done_count == 2
+        assert storage.cold_count == 2
+        stats = storage.get_statistics()
+        assert (stats['total_tasks'], stats['done_tasks']) == (6, 4)
+        assert storage.get_project(project.id).task_count == 6
+
+        assert [t.id for t in storage.get_project_tasks(project.id)] == [t.id for t in tasks]
+        assert [t.id for t in storage.tasks] == [t.id for t in tasks]
+        assert [t.id for t in storage.query(status="done")] == [t.id for t in tasks[:4]]
+        assert [t.id for t in storage.query(project_id=project.id, limit=3)] == [t.id for t in tasks[:3]]
+
+        # خواندن تسک سرد آن را به حافظه برمی‌گرداند و بعد از نوشتن بعدی بودجه اعمال می‌شود
+        assert storage.get_task(tasks[0].id).title == "Task 0"
+        storage.update_task(tasks[0].id, title="Renamed")
+        assert storage.resident_done_count == 2
+        assert storage.get_task(tasks[0].id).title == "Renamed"
+        assert [t.title for t in storage.search_tasks("Renamed")] == ["Renamed"]
+
+    def test_spill_and_mutations_of_cold_tasks(self, storage):
+        storage.resident_budget = 10
+        project, tasks = self._populate(storage)
+
+        assert storage.spill(datetime.now() + timedelta(seconds=30)) == 0
+        assert storage.spill(datetime.now() + timedelta(seconds=120)) == 4
+        assert storage.resident_done_count == 0
+
+        storage.change_task_status(tasks[1].id, "doing")
+        assert storage.delete_tasks([tasks[2].id]) == 1
+        stats = storage.get_statistics()
+        assert (stats['total_tasks'], stats['done_tasks'], stats['doing_tasks']) == (5, 2, 1)
+        assert storage.cold_count == 2
+
+        storage.delete_project(project.id)
+        assert storage.cold_count == 0
+        assert storage.get_statistics()['total_tasks'] == 0
+        with pytest.raises(Exception):  # Should raise TaskNotFoundError
+            storage.get_task(tasks[0].id)
+
+    def test_deleted_cold_tasks_leave_search_index(self, storage):
+        storage.resident_budget = 10
+        project, tasks = self._populate(storage)
+        storage.create_task(Task("alpha", "Description"), storage.create_project(Project("Other", "D")).id)
+        storage.update_task(tasks[0].id, title="alpha")
+        assert storage.spill(datetime.now() + timedelta(seconds=120)) == 4
+
+        storage.delete_project(project.id)
+        assert [t.title for t in storage.search_tasks("alpha")] == ["alpha"]
+
+    def test_cold_tasks_are_searched_on_disk(self, storage):
+        storage.resident_budget = 10
+        project = storage.create_project(Project("Project", "Description"))
+        archived = storage.create_task(Task("گزارش مالي", "Description"), project.id)
+        storage.change_task_status(archived.id, "done")
+        active = storage.create_task(Task("گزارش هفتگی", "Description"), project.id)
+        assert storage.spill(datetime.now() + timedelta(seconds=120)) == 1
+
+        # متن تسک سرد از ایندکس حافظه خارج شده و نتایج سرد بعد از مقیم‌ها می‌آیند
+        assert len(storage._task_text) == 1
+        assert [t.id for t in storage.search_tasks("گزارش")] == [active.id, archived.id]
+        assert [t.id for t in storage.search_tasks("مالی")] == [archived.id]
+        assert [t.id for t in storage.search_tasks("گزا", prefix=True, limit=1)] == [active.id]
+        assert [t.id for t in storage.search_tasks("ما", prefix=True)] == [archived.id]
+        assert storage.cold_count == 1
+
+        # بازگشت به حافظه تسک را دوباره در ایندکس متنی می‌گذارد
+        storage.update_task(archived.id, title="گزارش سالانه")
+        assert storage.cold_count == 0
+        assert [t.id for t in storage.search_tasks("سالانه")] == [archived.id]
+        assert storage.search_tasks("مالی") == []
+
+    def test_fault_in_respects_budget(self, storage):
+        project, tasks = self._populate(storage)
+        assert storage.cold_count == 2
+
+        for task in tasks[:4]:
+            storage.get_task(task.id)
+            assert storage.resident_done_count <= storage.resident_budget
+        assert len(storage.search_tasks("Task")) == 6
+        assert storage.resident_done_count == 2
+        assert storage.cold_count == 2
+
+    def test_read_view_sees_cold_tasks_and_pauses_spill(self, storage):
+        project, tasks = self._populate(storage)
+
+        with storage.read_view() as view:
+            assert storage.cold_count == 0
+            storage.change_task_status(tasks[0].id, "todo")
+            storage.delete_task(tasks[1].id)
+            assert storage.spill(datetime.now() + timedelta(seconds=120)) == 0
+            assert [t.id for t in view.get_project_tasks(project.id)] == [t.id for t in tasks]
+            assert view.get_task(tasks[0].id).status.value == "done"
+            assert view.get_statistics()['done_tasks'] == 4
+
+        storage.change_task_status(tasks[5].id, "done")
+        assert storage.resident_done_count == 2